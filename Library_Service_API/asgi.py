@@ -2,6 +2,8 @@
 ASGI config for Library_Service_API project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Server-sent events at /api/v1/events/ are only served here, by
+`EventStreamApplication` in front of Django.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
@@ -13,4 +15,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Library_Service_API.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once Django is set up.
+from Library_Service_API.streaming import EventStreamApplication  # noqa: E402
+
+application = EventStreamApplication(django_application)
@@ -0,0 +1,115 @@
+import inspect
+from abc import ABC, abstractmethod
+
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest, HttpResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+
+from users.authentication import AsyncJWTAuthentication
+
+
+async def _check(result) -> bool:
+    if inspect.isawaitable(result):
+        result = await result
+    return bool(result)
+
+
+class AsyncReadOnlyAPIView(View, ABC):
+    """
+    Read-only JSON endpoint with an async handler.
+
+    Under ASGI a sync DRF view holds the single thread that Django runs
+    sync code on for the whole request. These views stay on the event
+    loop and only leave it for each ORM query (`aget`, `aiterator`), so
+    one process keeps serving other requests while a query or a slow
+    client is pending.
+
+    Handlers return plain data which is rendered with the first default
+    renderer, so bodies match the sync endpoints.
+    Errors go through DRF's exception handler for the same bodies and
+    status codes. Permission classes may answer sync or async; object
+    checks must not touch unloaded relations.
+    """
+
+    http_method_names = ["get", "head"]
+    authentication_class = AsyncJWTAuthentication
+    permission_classes: tuple = ()
+
+    async def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        request = Request(request)
+        self.request = request
+        try:
+            await self.authenticate(request)
+            await self.check_permissions(request)
+            data = await self.get_data(request, *args, **kwargs)
+        except Exception as exc:
+            return self.handle_exception(request, exc)
+        return self.render(data)
+
+    @abstractmethod
+    async def get_data(self, request: Request, *args, **kwargs):
+        """The data to render, loaded with async ORM calls."""
+
+    async def authenticate(self, request: Request) -> None:
+        self.authenticator = self.authentication_class()
+        result = await self.authenticator.aauthenticate(request)
+        if result is None:
+            self.authenticator = None
+            request.user, request.auth = AnonymousUser(), None
+        else:
+            request.user, request.auth = result
+
+    async def check_permissions(self, request: Request) -> None:
+        for permission in self.get_permissions():
+            if not await _check(permission.has_permission(request, self)):
+                self.permission_denied(permission)
+
+    async def check_object_permissions(self, request: Request, obj) -> None:
+        for permission in self.get_permissions():
+            if not await _check(
+                permission.has_object_permission(request, self, obj)
+            ):
+                self.permission_denied(permission)
+
+    def get_permissions(self) -> list:
+        return [permission() for permission in self.permission_classes]
+
+    def permission_denied(self, permission) -> None:
+        if self.authenticator is None:
+            raise exceptions.NotAuthenticated()
+        raise exceptions.PermissionDenied(
+            detail=getattr(permission, "message", None),
+            code=getattr(permission, "code", None),
+        )
+
+    def handle_exception(self, request: Request, exc: Exception):
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            exc.auth_header = self.authentication_class().authenticate_header(
+                request
+            )
+        response = exception_handler(exc, {"view": self, "request": request})
+        if response is None:
+            raise exc
+        return self.render(
+            response.data, response.status_code, response.headers
+        )
+
+    @staticmethod
+    def render(
+        data, status: int = 200, headers: dict | None = None
+    ) -> HttpResponse:
+        renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+        response = HttpResponse(
+            renderer.render(data), status=status, headers=headers
+        )
+        response["Content-Type"] = content_type
+        return response
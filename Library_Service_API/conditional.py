@@ -0,0 +1,131 @@
+import hashlib
+from datetime import datetime
+
+from django.http import HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified support for list and retrieve GETs.
+
+    Lists are validated by the page they serve: the ids and timestamps
+    of its rows and the lookahead row of `KeysetCursorPagination`, read
+    with the page's own index scan. The rows of a keyset page are fixed
+    by its cursor, so changes elsewhere in the table keep its
+    validators. Details are validated by the fetched object's
+    timestamps. A matching `If-None-Match` or
+    `If-Modified-Since` is answered with 304 before any serializer runs.
+    `conditional_related` lists related fields whose `updated_at` also
+    shows up in the representation.
+    """
+
+    updated_field = "updated_at"
+    conditional_related: tuple[str, ...] = ()
+
+    def get_etag_salt(self, request: Request) -> str:
+        """Anything besides the timestamps the representation depends on."""
+        return ""
+
+    def make_etag(self, request: Request, *parts) -> str:
+        user_id = getattr(request.user, "pk", None)
+        renderer = getattr(request.accepted_renderer, "format", "")
+        source = ":".join(str(part) for part in (
+            request.get_full_path(),
+            renderer,
+            user_id,
+            self.get_etag_salt(request),
+            *parts,
+        ))
+        return f'"{hashlib.md5(source.encode()).hexdigest()}"'
+
+    def get_list_validators(
+        self, request: Request
+    ) -> tuple[str, datetime | None]:
+        fields = (self.updated_field,) + tuple(
+            f"{related}__{self.updated_field}"
+            for related in self.conditional_related
+        )
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.paginator is not None:
+            page = self.paginator.get_page_queryset(queryset, request, self)
+            if page is not None:
+                queryset = page
+        rows = list(queryset.values_list("pk", *fields))
+        last_modified = max(
+            (
+                value for row in rows for value in row[1:]
+                if value is not None
+            ),
+            default=None,
+        )
+        etag = self.make_etag(
+            request, *(row[0] for row in rows), last_modified
+        )
+        return etag, last_modified
+
+    def get_object_validators(
+        self, request: Request, instance
+    ) -> tuple[str, datetime | None]:
+        timestamps = [getattr(instance, self.updated_field)] + [
+            getattr(getattr(instance, related), self.updated_field)
+            for related in self.conditional_related
+        ]
+        last_modified = max(
+            (value for value in timestamps if value is not None),
+            default=None,
+        )
+        etag = self.make_etag(request, instance.pk, last_modified)
+        return etag, last_modified
+
+    @staticmethod
+    def evaluate_preconditions(
+        request: Request, etag: str, last_modified: datetime | None
+    ) -> HttpResponseBase | None:
+        response = get_conditional_response(
+            request._request,
+            etag=etag,
+            last_modified=(
+                int(last_modified.timestamp()) if last_modified else None
+            ),
+        )
+        if response is not None:
+            ConditionalGetMixin.set_validators(response, etag, last_modified)
+        return response
+
+    @staticmethod
+    def set_validators(
+        response: HttpResponseBase, etag: str, last_modified: datetime | None
+    ) -> HttpResponseBase:
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        return response
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        etag, last_modified = self.get_list_validators(request)
+        precondition = self.evaluate_preconditions(
+            request, etag, last_modified
+        )
+        if precondition is not None:
+            return precondition
+
+        response = super().list(request, *args, **kwargs)
+        return self.set_validators(response, etag, last_modified)
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        instance = self.get_object()
+        etag, last_modified = self.get_object_validators(request, instance)
+        precondition = self.evaluate_preconditions(
+            request, etag, last_modified
+        )
+        if precondition is not None:
+            return precondition
+
+        serializer = self.get_serializer(instance)
+        return self.set_validators(
+            Response(serializer.data), etag, last_modified
+        )
@@ -0,0 +1,231 @@
+"""
+Change events pushed to clients over server-sent events.
+
+Write paths call `publish`, which hands the events to the configured
+broker once the transaction commits. Every web process subscribes its
+open streams to the broker and fans each event out to the streams
+allowed to see it, so thousands of idle streams cost one broker
+connection, not one each.
+"""
+import asyncio
+import json
+import logging
+import threading
+from contextlib import asynccontextmanager
+from functools import cache
+from typing import AsyncIterator, Iterable, NamedTuple
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class Event(NamedTuple):
+    """
+    `user_id` limits the event to one user and staff; events without
+    it go to every subscriber.
+    """
+
+    type: str
+    data: dict
+    user_id: int | None = None
+
+    def encode(self) -> str:
+        return f"event: {self.type}\ndata: {json.dumps(self.data)}\n\n"
+
+    def dumps(self) -> str:
+        return json.dumps(self)
+
+    @classmethod
+    def loads(cls, raw: str | bytes) -> "Event":
+        return cls(*json.loads(raw))
+
+
+class Subscription:
+    def __init__(
+        self,
+        user_id: int,
+        is_staff: bool,
+        types: Iterable[str] = (),
+        size: int = 100,
+    ) -> None:
+        self.user_id = user_id
+        self.is_staff = is_staff
+        self.types = tuple(types)
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[Event] = asyncio.Queue(size)
+        # Set when the client fell `size` events behind; the stream
+        # then ends so the client reconnects and refetches.
+        self.overflowed = False
+
+    def wants(self, event: Event) -> bool:
+        return not self.types or any(
+            event.type == prefix or event.type.startswith(f"{prefix}.")
+            for prefix in self.types
+        )
+
+    def put(self, event: Event) -> None:
+        """Queue `event`; runs on the subscriber's event loop."""
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class EventBroker:
+    """
+    Fans events out to this process' subscriptions. Subclasses carry
+    events between processes by implementing `send`, and call
+    `dispatch` for every event they receive.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.everyone: set[Subscription] = set()
+        self.staff: set[Subscription] = set()
+        self.by_user: dict[int, set[Subscription]] = {}
+
+    def send(self, events: list[Event]) -> None:
+        raise NotImplementedError
+
+    def dispatch(self, event: Event) -> None:
+        """Deliver `event` to the local subscriptions; thread-safe."""
+        with self.lock:
+            if event.user_id is None:
+                targets = list(self.everyone)
+            else:
+                targets = [
+                    *self.by_user.get(event.user_id, ()),
+                    *(
+                        subscription for subscription in self.staff
+                        if subscription.user_id != event.user_id
+                    ),
+                ]
+        for subscription in targets:
+            if subscription.wants(event):
+                subscription.loop.call_soon_threadsafe(
+                    subscription.put, event
+                )
+
+    async def start(self) -> None:
+        """Called before the first subscription of an event loop."""
+
+    @asynccontextmanager
+    async def subscribe(
+        self, user_id: int, is_staff: bool, types: Iterable[str] = ()
+    ) -> AsyncIterator[Subscription]:
+        await self.start()
+        subscription = Subscription(
+            user_id, is_staff, types, settings.EVENTS_QUEUE_SIZE
+        )
+        with self.lock:
+            self.everyone.add(subscription)
+            self.by_user.setdefault(user_id, set()).add(subscription)
+            if is_staff:
+                self.staff.add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self.lock:
+                self.everyone.discard(subscription)
+                self.staff.discard(subscription)
+                own = self.by_user.get(user_id, set())
+                own.discard(subscription)
+                if not own:
+                    self.by_user.pop(user_id, None)
+
+    @property
+    def subscribers(self) -> int:
+        return len(self.everyone)
+
+
+class InProcessEventBroker(EventBroker):
+    """Only reaches streams of the publishing process; for tests."""
+
+    def send(self, events: list[Event]) -> None:
+        for event in events:
+            self.dispatch(event)
+
+
+class RedisEventBroker(EventBroker):
+    """
+    Publishes to a Redis pub/sub channel. Each process runs a single
+    listener on its event loop, which reconnects with backoff.
+    """
+
+    def __init__(
+        self, url: str = None, channel: str = "library:events"
+    ) -> None:
+        import redis
+
+        super().__init__()
+        self.url = url or settings.EVENTS_REDIS_URL
+        self.channel = channel
+        self.client = redis.Redis.from_url(
+            self.url, socket_connect_timeout=1, socket_timeout=1
+        )
+        self.listener: asyncio.Task | None = None
+
+    def send(self, events: list[Event]) -> None:
+        with self.client.pipeline(transaction=False) as pipeline:
+            for event in events:
+                pipeline.publish(self.channel, event.dumps())
+            pipeline.execute()
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self.listener is None or self.listener.get_loop() is not loop:
+            self.listener = loop.create_task(self.listen())
+
+    async def listen(self) -> None:
+        import redis.asyncio
+
+        delay = 0.1
+        while True:
+            try:
+                client = redis.asyncio.Redis.from_url(self.url)
+                async with client, client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    delay = 0.1
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.dispatch(Event.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Event listener lost Redis, reconnecting")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 5.0)
+
+
+@cache
+def get_broker() -> EventBroker:
+    return import_string(settings.EVENTS_BROKER)()
+
+
+@receiver(setting_changed)
+def _reset_broker(setting: str, **kwargs) -> None:
+    if setting in ("EVENTS_BROKER", "EVENTS_REDIS_URL"):
+        get_broker.cache_clear()
+
+
+def _send(events: list[Event]) -> None:
+    try:
+        get_broker().send(events)
+    except Exception:
+        # Streams are a hint to refetch; losing one must not fail the
+        # write that already committed.
+        logger.exception("Could not publish %d events", len(events))
+
+
+def publish(*events: Event) -> None:
+    """Send `events` once the current transaction commits."""
+    if events:
+        events = list(events)
+        transaction.on_commit(lambda: _send(events))
@@ -0,0 +1,36 @@
+"""
+Reading Postgres query plans, to check that queries use their indexes.
+"""
+
+import json
+
+from django.db.models import QuerySet
+
+
+def explain_scans(queryset: QuerySet, table: str, **options) -> list[dict]:
+    """
+    The nodes of `queryset`'s Postgres plan that scan `table`. Options
+    go to `QuerySet.explain`, e.g. `analyze=True` for row counts.
+    """
+    plan = queryset.explain(format="json", **options)
+    nodes = [json.loads(plan)[0]["Plan"]]
+    scans = []
+    while nodes:
+        node = nodes.pop()
+        nodes.extend(node.get("Plans", ()))
+        if node.get("Relation Name") == table:
+            scans.append(node)
+    return scans
+
+
+def is_unbounded_scan(scan: dict) -> bool:
+    """
+    Whether a plan node reads its table from the start: a sequential
+    scan, or an index scan that only filters rows and has no index
+    condition to start from.
+    """
+    return scan["Node Type"] == "Seq Scan" or (
+        scan["Node Type"] in ("Index Scan", "Index Only Scan")
+        and "Filter" in scan
+        and "Index Cond" not in scan
+    )
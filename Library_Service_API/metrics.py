@@ -0,0 +1,240 @@
+"""
+Prometheus metrics of API requests and Celery tasks.
+
+Every request is labelled with its resolved URL name, e.g.
+`books:book-list`, never with the raw path, to keep the number of
+series bounded. Under several processes (gunicorn workers, prefork
+Celery children) set PROMETHEUS_MULTIPROC_DIR to a fresh shared
+directory so every scrape sees the sum over all of them.
+"""
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1, 2.5, 5, 10
+)
+
+REQUEST_LATENCY = Histogram(
+    "library_http_request_duration_seconds",
+    "Time from the first middleware until the response is rendered.",
+    ("view", "method", "status"),
+    buckets=LATENCY_BUCKETS,
+)
+
+REQUEST_VIEW_TIME = Histogram(
+    "library_http_request_view_duration_seconds",
+    "Time in the view, serializers included, until a DRF response "
+    "is handed over for rendering.",
+    ("view", "method"),
+    buckets=LATENCY_BUCKETS,
+)
+
+REQUEST_RENDER_TIME = Histogram(
+    "library_http_request_render_duration_seconds",
+    "Time DRF renderers take to turn serializer data into the body.",
+    ("view", "method"),
+    buckets=LATENCY_BUCKETS,
+)
+
+REQUEST_DB_TIME = Histogram(
+    "library_http_request_db_duration_seconds",
+    "Time spent executing SQL per request.",
+    ("view", "method"),
+    buckets=LATENCY_BUCKETS,
+)
+
+REQUEST_DB_QUERIES = Histogram(
+    "library_http_request_db_queries",
+    "SQL queries executed per request.",
+    ("view", "method"),
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+
+RESPONSE_SIZE = Histogram(
+    "library_http_response_size_bytes",
+    "Size of non-streaming response bodies.",
+    ("view", "method"),
+    buckets=tuple(2 ** power for power in range(6, 24, 2)),
+)
+
+TASK_DURATION = Histogram(
+    "library_celery_task_duration_seconds",
+    "Run time of Celery tasks by final state.",
+    ("task", "state"),
+    buckets=LATENCY_BUCKETS + (30, 60, 300, 900, 1800),
+)
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_time: float = 0.0
+    view_started: float | None = None
+    view_time: float | None = None
+    render_time: float | None = None
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def count_query(execute, sql, params, many, context):
+    """DB execute wrapper adding to the current request's stats."""
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - started
+
+
+def install_query_counter(connection) -> None:
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_query)
+
+
+def _on_connection_created(sender, connection, **kwargs) -> None:
+    install_query_counter(connection)
+
+
+connection_created.connect(_on_connection_created)
+
+
+def get_view_name(request: HttpRequest) -> str:
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unresolved"
+    return match.view_name
+
+
+class PrometheusMetricsMiddleware:
+    """
+    Record latency, SQL query count and time, view and render time and
+    response size of every request. Put it first in MIDDLEWARE so the
+    latency covers the other middleware too.
+
+    The view time ends and the render time starts when a DRF response
+    reaches `process_template_response`; async views render themselves,
+    so for them it is all view time.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        stats, token, started = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+        self.observe(request, response, stats, started)
+        return response
+
+    async def __acall__(self, request: HttpRequest):
+        stats, token, started = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+        self.observe(request, response, stats, started)
+        return response
+
+    @staticmethod
+    def start():
+        for connection in connections.all(initialized_only=True):
+            install_query_counter(connection)
+        stats = RequestStats()
+        return stats, _request_stats.set(stats), time.perf_counter()
+
+    def process_view(self, request: HttpRequest, *args) -> None:
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.view_started = time.perf_counter()
+
+    def process_template_response(self, request: HttpRequest, response):
+        stats = _request_stats.get()
+        if stats is None or stats.view_started is None:
+            return response
+
+        render_started = time.perf_counter()
+        stats.view_time = render_started - stats.view_started
+
+        def rendered(response) -> None:
+            stats.render_time = time.perf_counter() - render_started
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    @staticmethod
+    def observe(
+        request: HttpRequest,
+        response: HttpResponse,
+        stats: RequestStats,
+        started: float,
+    ) -> None:
+        finished = time.perf_counter()
+        labels = (get_view_name(request), request.method)
+
+        REQUEST_LATENCY.labels(*labels, str(response.status_code)).observe(
+            finished - started
+        )
+        REQUEST_DB_QUERIES.labels(*labels).observe(stats.queries)
+        REQUEST_DB_TIME.labels(*labels).observe(stats.db_time)
+
+        view_time = stats.view_time
+        if view_time is None and stats.view_started is not None:
+            view_time = finished - stats.view_started
+        if view_time is not None:
+            REQUEST_VIEW_TIME.labels(*labels).observe(view_time)
+        if stats.render_time is not None:
+            REQUEST_RENDER_TIME.labels(*labels).observe(stats.render_time)
+
+        if not response.streaming:
+            RESPONSE_SIZE.labels(*labels).observe(len(response.content))
+
+
+def get_registry() -> CollectorRegistry:
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """Prometheus text exposition of every metric of this service."""
+    return HttpResponse(
+        generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST
+    )
+
+
+def observe_task(task_name: str, state: str, duration: float) -> None:
+    TASK_DURATION.labels(task_name, state).observe(duration)
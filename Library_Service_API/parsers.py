@@ -0,0 +1,38 @@
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+
+class FastJSONParser(JSONParser):
+    """
+    `JSONParser` backed by orjson when it is installed.
+
+    orjson only reads UTF-8 and always rejects `NaN` and `Infinity`, so
+    other charsets, non-strict JSON settings and a missing orjson fall
+    back to the stdlib parser.
+    """
+
+    def parse(
+        self,
+        stream,
+        media_type: str = None,
+        parser_context: dict = None
+    ):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if (
+            orjson is None
+            or not self.strict
+            or encoding.lower().replace("_", "-") != "utf-8"
+        ):
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except ValueError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,216 @@
+"""
+Readiness probes of the services the API depends on.
+
+Each probe makes one bounded attempt and raises on failure. Probes run
+in parallel on a small thread pool, so checking everything takes as
+long as the slowest probe, never the sum.
+"""
+import copy
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Iterable, NamedTuple
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.utils import load_backend
+from django.http import HttpRequest, JsonResponse
+
+from borrowings.celery import app
+
+
+class ProbeResult(NamedTuple):
+    ok: bool
+    latency_ms: float
+    error: str | None = None
+
+
+def check_database(timeout: float) -> None:
+    # A connection of its own, outside any pool, that gives up with the
+    # probe: an unreachable host must not hold a pool thread for the
+    # OS connect timeout. libpq waits at least 2 s to connect.
+    settings_dict = copy.deepcopy(
+        connections[DEFAULT_DB_ALIAS].settings_dict
+    )
+    options = settings_dict["OPTIONS"]
+    options.pop("pool", None)
+    options["connect_timeout"] = max(math.ceil(timeout), 2)
+    options["options"] = (
+        f"{options.get('options', '')} "
+        f"-c statement_timeout={math.ceil(timeout * 1000)}"
+    ).strip()
+    backend = load_backend(settings_dict["ENGINE"])
+    connection = backend.DatabaseWrapper(settings_dict, DEFAULT_DB_ALIAS)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    finally:
+        connection.close()
+
+
+def check_broker(timeout: float) -> None:
+    with app.connection_for_write(connect_timeout=timeout) as connection:
+        connection.ensure_connection(max_retries=0)
+
+
+def check_workers(timeout: float) -> None:
+    # `ping` alone retries connecting to the broker for seconds; connect
+    # once within the timeout and ping over that connection.
+    with app.connection_for_write(connect_timeout=timeout) as connection:
+        connection.ensure_connection(max_retries=0)
+        if not app.control.ping(
+            timeout=timeout, limit=1, connection=connection
+        ):
+            raise RuntimeError("No Celery worker answered the ping")
+
+
+PROBES: dict[str, Callable[[float], None]] = {
+    "database": check_database,
+    "broker": check_broker,
+    "workers": check_workers,
+}
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="readiness")
+
+
+def run_probe(name: str, timeout: float) -> ProbeResult:
+    started = time.perf_counter()
+    try:
+        PROBES[name](timeout)
+    except Exception as exc:
+        return ProbeResult(
+            False,
+            (time.perf_counter() - started) * 1000,
+            f"{type(exc).__name__}: {exc}",
+        )
+    return ProbeResult(True, (time.perf_counter() - started) * 1000)
+
+
+def _collect(futures: dict, deadline: float) -> dict[str, ProbeResult]:
+    results = {}
+    for name, future in futures.items():
+        try:
+            results[name] = future.result(
+                timeout=max(deadline - time.monotonic(), 0)
+            )
+        except FutureTimeoutError:
+            results[name] = ProbeResult(False, 0.0, "Timed out")
+    return results
+
+
+def run_probes(
+    names: Iterable[str], timeout: float
+) -> dict[str, ProbeResult]:
+    """One attempt of every probe, all in parallel, within `timeout`."""
+    deadline = time.monotonic() + timeout
+    return _collect(
+        {name: _executor.submit(run_probe, name, timeout) for name in names},
+        deadline,
+    )
+
+
+def wait_until_ready(
+    names: Iterable[str],
+    timeout: float,
+    initial_delay: float = 0.05,
+    max_delay: float = 0.5,
+    on_retry: Callable[[str, ProbeResult, float], None] = None,
+) -> dict[str, ProbeResult]:
+    """
+    Retry every probe in parallel until it succeeds or `timeout` runs
+    out. Failed attempts back off exponentially from `initial_delay`
+    up to `max_delay`, so a dependency that comes up is noticed within
+    half a second. Returns the last result of each probe.
+    """
+    deadline = time.monotonic() + timeout
+
+    def until_ready(name: str) -> ProbeResult:
+        delay = initial_delay
+        while True:
+            remaining = deadline - time.monotonic()
+            result = run_probe(
+                name, min(remaining, settings.READINESS_PROBE_TIMEOUT)
+            )
+            if result.ok or time.monotonic() + delay >= deadline:
+                return result
+            if on_retry is not None:
+                on_retry(name, result, delay)
+            time.sleep(delay)
+            delay = min(delay * 2, max_delay)
+
+    return _collect(
+        {name: _executor.submit(until_ready, name) for name in names},
+        # Let the last attempt finish; it is bounded by the probe timeout.
+        deadline + settings.READINESS_PROBE_TIMEOUT,
+    )
+
+
+class ProbeCache:
+    """
+    Keep the last probe results for a TTL. Requests that arrive while
+    the results are refreshed wait for that one run instead of probing
+    again, so load balancer polling costs at most one probe per TTL.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.expires = 0.0
+        self.results: dict[str, ProbeResult] = {}
+
+    def get(
+        self, ttl: float, probe: Callable[[], dict[str, ProbeResult]]
+    ) -> dict[str, ProbeResult]:
+        with self.lock:
+            if time.monotonic() >= self.expires:
+                self.results = probe()
+                self.expires = time.monotonic() + ttl
+            return self.results
+
+    def clear(self) -> None:
+        with self.lock:
+            self.expires = 0.0
+
+
+probe_cache = ProbeCache()
+
+
+def healthz(request: HttpRequest) -> JsonResponse:
+    """Liveness: the process answers; dependencies are not checked."""
+    return JsonResponse(
+        {"status": "ok"}, headers={"Cache-Control": "no-store"}
+    )
+
+
+def readyz(request: HttpRequest) -> JsonResponse:
+    """
+    Readiness: 503 while a probe listed in READINESS_CRITICAL_PROBES
+    fails. The other probes are reported but do not fail readiness.
+    """
+    results = probe_cache.get(
+        settings.READINESS_CACHE_TTL,
+        lambda: run_probes(
+            settings.READINESS_PROBES, settings.READINESS_PROBE_TIMEOUT
+        ),
+    )
+    critical = set(settings.READINESS_CRITICAL_PROBES)
+    ready = all(
+        result.ok for name, result in results.items() if name in critical
+    )
+    return JsonResponse(
+        {
+            "status": "ready" if ready else "unavailable",
+            "checks": {
+                name: {
+                    "ok": result.ok,
+                    "critical": name in critical,
+                    "latency_ms": round(result.latency_ms, 1),
+                    "error": result.error,
+                }
+                for name, result in results.items()
+            },
+        },
+        status=200 if ready else 503,
+        headers={"Cache-Control": "no-store"},
+    )
@@ -0,0 +1,52 @@
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from rest_framework.renderers import JSONRenderer
+
+# Left for the encoder's `default`, so output matches DRF's renderer.
+ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    if orjson else 0
+)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    `JSONRenderer` backed by orjson when it is installed.
+
+    Types orjson does not know (`Decimal`, lazy strings, querysets) and
+    dates, which it formats differently, go through DRF's own encoder,
+    so the bytes are the same as the stdlib renderer's. Indented, ASCII
+    only or non-compact output and a missing orjson fall back to the
+    stdlib renderer.
+    """
+
+    def render(
+        self,
+        data,
+        accepted_media_type: str = None,
+        renderer_context: dict = None
+    ) -> bytes:
+        renderer_context = renderer_context or {}
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context)
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data, default=self.encoder_class().default, option=ORJSON_OPTIONS
+        )
+        # Same escaping as `JSONRenderer` for JavaScript line separators.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = (
+                ret
+                .replace(b"\xe2\x80\xa8", b"\\u2028")
+                .replace(b"\xe2\x80\xa9", b"\\u2029")
+            )
+        return ret
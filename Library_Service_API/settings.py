@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 import os
 from datetime import timedelta
+from decimal import Decimal
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -27,10 +28,23 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = os.environ["SECRET_KEY"]
 
-# SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# "development", "production" or "test". Production turns DEBUG off,
+# and with it the per-request log of every SQL query, unless DEBUG is
+# set. `manage.py test` defaults to "test", which hashes passwords fast.
+DJANGO_ENV = os.environ.get("DJANGO_ENV", "development")
 
-ALLOWED_HOSTS = []
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = os.environ.get(
+    "DEBUG", "1" if DJANGO_ENV == "development" else "0"
+) == "1"
+
+ALLOWED_HOSTS = [
+    host
+    for host in os.environ.get(
+        "ALLOWED_HOSTS", "" if DEBUG else "localhost,127.0.0.1"
+    ).split(",")
+    if host
+]
 
 
 # Application definition
@@ -42,6 +56,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "django_celery_beat",
     "drf_spectacular",
@@ -51,6 +66,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "Library_Service_API.metrics.PrometheusMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -83,6 +99,20 @@ WSGI_APPLICATION = "Library_Service_API.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# Connections are kept open for DB_CONN_MAX_AGE seconds and checked
+# before reuse (0 closes them after every request or task). DB_POOL=1
+# hands them to psycopg's connection pool instead, sized per process.
+DB_CONN_MAX_AGE = int(os.environ.get("DB_CONN_MAX_AGE", 60))
+
+DB_POOL = os.environ.get("DB_POOL", "0") == "1"
+
+DB_POOL_OPTIONS = {
+    "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+    "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+    "timeout": float(os.environ.get("DB_POOL_TIMEOUT", 10)),
+    "max_idle": float(os.environ.get("DB_POOL_MAX_IDLE", 300)),
+}
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -91,10 +121,33 @@ DATABASES = {
         "PASSWORD": os.environ["POSTGRES_PASSWORD"],
         "HOST": os.environ["POSTGRES_HOST"],
         "PORT": int(os.environ["POSTGRES_PORT"]),
+        "CONN_MAX_AGE": 0 if DB_POOL else DB_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {"pool": DB_POOL_OPTIONS} if DB_POOL else {},
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.redis.RedisCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", "redis://redis:6379/1"),
+    }
+}
+if DJANGO_ENV == "test" and "CACHE_BACKEND" not in os.environ:
+    # Tests run without Redis; each process gets a cache of its own.
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+
+BOOK_CACHE_TIMEOUT = int(os.environ.get("BOOK_CACHE_TIMEOUT", 5 * 60))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -117,6 +170,26 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Django's defaults, with PBKDF2 at PASSWORD_HASH_ITERATIONS rounds.
+PASSWORD_HASHERS = [
+    "users.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+if DJANGO_ENV == "test":
+    # Test hashes only have to round-trip; at full cost hashing would
+    # dominate every setUp that creates users.
+    PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+# Cost of new password hashes. Hashes keep their own count, so changing
+# it keeps passwords valid and rehashes them at the next login; see
+# `manage.py benchmark_password_hashing` for what a cost does to signups.
+PASSWORD_HASH_ITERATIONS = int(
+    os.environ.get("PASSWORD_HASH_ITERATIONS", 1_000_000)
+)
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/6.0/topics/i18n/
@@ -135,15 +208,47 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
 AUTH_USER_MODEL = "users.User"
 
+# "fast" renders and parses API JSON with orjson when it is installed,
+# "stdlib" keeps DRF's json module based renderer and parser.
+API_JSON_BACKEND = os.environ.get("API_JSON_BACKEND", "fast")
+
+API_JSON_CLASSES = {
+    "fast": (
+        "Library_Service_API.renderers.FastJSONRenderer",
+        "Library_Service_API.parsers.FastJSONParser",
+    ),
+    "stdlib": (
+        "rest_framework.renderers.JSONRenderer",
+        "rest_framework.parsers.JSONParser",
+    ),
+}[API_JSON_BACKEND]
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedJWTAuthentication",
+    ),
+    "DEFAULT_RENDERER_CLASSES": (
+        API_JSON_CLASSES[0],
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        API_JSON_CLASSES[1],
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema"
 }
 
+PAGINATION_PAGE_SIZE = int(os.environ.get("PAGINATION_PAGE_SIZE", 20))
+
+PAGINATION_MAX_PAGE_SIZE = int(
+    os.environ.get("PAGINATION_MAX_PAGE_SIZE", 100)
+)
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=20),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=3),
@@ -151,14 +256,105 @@ SIMPLE_JWT = {
     "AUTH_HEADER_NAME": "HTTP_AUTHORIZE",
 }
 
+# Seconds the user principal of a token stays cached; saving or deleting
+# the user drops it sooner.
+AUTH_PRINCIPAL_CACHE_TTL = int(os.environ.get("AUTH_PRINCIPAL_CACHE_TTL", 60))
+
+# Upper bound on books or borrowings in one bulk borrow/return request.
+BULK_BORROWING_MAX_ITEMS = int(
+    os.environ.get("BULK_BORROWING_MAX_ITEMS", 50)
+)
+
+# Overdue days cost the book's daily fee times this multiplier.
+BORROWING_FINE_MULTIPLIER = Decimal(
+    os.environ.get("BORROWING_FINE_MULTIPLIER", "2")
+)
+
 CELERY_BROKER_URL = os.environ["CELERY_BROKER_URL"]
 
+CELERY_RESULT_BACKEND = os.environ.get(
+    "CELERY_RESULT_BACKEND", CELERY_BROKER_URL
+)
+
 CELERY_TIMEZONE = "Europe/Warsaw"
 
 CELERY_TASK_TRACK_STARTED = True
 
 CELERY_TASK_TIME_LIMIT = 30 * 60
 
+# Celery closes DB connections around every task unless told to reuse
+# them; borrowings.celery then applies CONN_MAX_AGE and health checks
+# between tasks just like Django does between requests.
+CELERY_DB_REUSE_MAX = int(os.environ.get("CELERY_DB_REUSE_MAX", 1000))
+
+# Dependencies /readyz probes, in parallel, and the ones that must be up
+# for it to answer 200. Results are cached per process for the TTL.
+READINESS_PROBES = os.environ.get(
+    "READINESS_PROBES", "database,broker,workers"
+).split(",")
+
+READINESS_CRITICAL_PROBES = os.environ.get(
+    "READINESS_CRITICAL_PROBES", "database,broker"
+).split(",")
+
+READINESS_PROBE_TIMEOUT = float(
+    os.environ.get("READINESS_PROBE_TIMEOUT", 1.0)
+)
+
+READINESS_CACHE_TTL = float(os.environ.get("READINESS_CACHE_TTL", 5.0))
+
+# Server-sent events: the broker carrying change events between processes
+# and the Redis it publishes to, how many events a slow stream may fall
+# behind before it is closed, and seconds between keepalive comments.
+EVENTS_BROKER = os.environ.get(
+    "EVENTS_BROKER", "Library_Service_API.events.RedisEventBroker"
+)
+
+EVENTS_REDIS_URL = os.environ.get("EVENTS_REDIS_URL", "redis://redis:6379/2")
+
+EVENTS_QUEUE_SIZE = int(os.environ.get("EVENTS_QUEUE_SIZE", 100))
+
+EVENTS_KEEPALIVE = float(os.environ.get("EVENTS_KEEPALIVE", 15))
+
+# Port of the Prometheus exporter the Celery worker starts; 0 disables.
+PROMETHEUS_WORKER_PORT = int(os.environ.get("PROMETHEUS_WORKER_PORT", 0))
+
+OVERDUE_REPORT_DIR = os.environ.get(
+    "OVERDUE_REPORT_DIR", BASE_DIR / "overdue_reports"
+)
+
+# One of "text", "jsonl" or "csv".
+OVERDUE_REPORT_FORMAT = os.environ.get("OVERDUE_REPORT_FORMAT", "text")
+
+OVERDUE_REPORT_CHUNK_SIZE = int(
+    os.environ.get("OVERDUE_REPORT_CHUNK_SIZE", 2000)
+)
+
+# Sharded overdue check: width of a borrowing id range per shard and the
+# maximum number of shard tasks running at once. Part files are written
+# to OVERDUE_REPORT_DIR, so it must be shared between workers.
+OVERDUE_SHARD_SIZE = int(os.environ.get("OVERDUE_SHARD_SIZE", 50_000))
+
+OVERDUE_SHARD_CONCURRENCY = int(
+    os.environ.get("OVERDUE_SHARD_CONCURRENCY", 8)
+)
+
+# Hours a holder has to borrow the copy set aside for them before the
+# hold expires and the copy goes to the next in line.
+HOLD_CLAIM_HOURS = int(os.environ.get("HOLD_CLAIM_HOURS", 48))
+
+# Days, ending yesterday, the nightly stats task recounts. Reruns are
+# idempotent, so a window over a day covers missed runs and borrowings
+# backdated after their day was aggregated.
+LIBRARY_STATS_WINDOW_DAYS = int(
+    os.environ.get("LIBRARY_STATS_WINDOW_DAYS", 3)
+)
+
+# Default date range and book limit of the staff stats endpoints.
+LIBRARY_STATS_DEFAULT_DAYS = 30
+
+LIBRARY_STATS_MAX_BOOKS = 100
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 SPECTACULAR_SETTINGS = {
@@ -0,0 +1,151 @@
+"""
+ASGI endpoint streaming change events to clients as server-sent events.
+
+It sits in front of Django's ASGI handler in `asgi.py` instead of being
+a view: Django gives every request its own executor thread, and with it
+a database connection, until the response ends, which for a stream is
+when the client leaves. Here an idle stream is one coroutine waiting on
+its queue; the one authentication query runs on the shared sync thread.
+"""
+import asyncio
+import io
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections
+from rest_framework import exceptions
+from rest_framework.request import Request
+
+from Library_Service_API.events import Subscription, get_broker
+from users.authentication import AsyncJWTAuthentication
+
+EVENTS_PATH = "/api/v1/events/"
+
+
+class EventStreamApplication:
+    """
+    Serve `GET /api/v1/events/` and pass everything else on to
+    `application`.
+
+    Everyone gets `inventory` events; borrowing and hold events go to
+    their user and to staff. `?types=inventory,hold` narrows the stream
+    to those event types. Events carry ids to refetch, not full
+    objects, and are not replayed: clients refetch what they show after
+    connecting, and after an `overflow` event, which ends a stream that
+    fell too far behind.
+    """
+
+    def __init__(self, application) -> None:
+        self.application = application
+
+    async def __call__(self, scope: dict, receive, send) -> None:
+        if scope["type"] != "http" or scope["path"] != EVENTS_PATH:
+            return await self.application(scope, receive, send)
+
+        if scope["method"] not in ("GET", "HEAD"):
+            return await self.reply(
+                send, exceptions.MethodNotAllowed(scope["method"])
+            )
+        request = Request(ASGIRequest(scope, io.BytesIO()))
+        authenticator = AsyncJWTAuthentication()
+        try:
+            user = await self.authenticate(authenticator, request)
+            if user is None:
+                raise exceptions.NotAuthenticated()
+        except exceptions.APIException as exc:
+            return await self.reply(
+                send, exc, authenticator.authenticate_header(request)
+            )
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/event-stream"),
+                (b"cache-control", b"no-cache"),
+                (b"x-accel-buffering", b"no"),
+            ],
+        })
+        if scope["method"] == "HEAD":
+            return await send({"type": "http.response.body"})
+
+        types = [
+            name for name in request.query_params.get("types", "").split(",")
+            if name
+        ]
+        async with get_broker().subscribe(
+            user.pk, user.is_staff, types
+        ) as subscription:
+            streaming = asyncio.ensure_future(self.stream(subscription, send))
+            disconnected = asyncio.ensure_future(self.disconnected(receive))
+            await asyncio.wait(
+                (streaming, disconnected),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in (streaming, disconnected):
+                task.cancel()
+            if streaming.done() and not streaming.cancelled():
+                streaming.result()
+
+    @staticmethod
+    async def authenticate(authenticator, request: Request):
+        # Outside Django's handler nothing closes connections that are
+        # too old or broken, so do it around the query.
+        await sync_to_async(close_old_connections)()
+        try:
+            result = await authenticator.aauthenticate(request)
+        finally:
+            await sync_to_async(close_old_connections)()
+        return result[0] if result else None
+
+    @staticmethod
+    async def stream(subscription: Subscription, send) -> None:
+        async def write(chunk: str, more: bool = True) -> None:
+            await send({
+                "type": "http.response.body",
+                "body": chunk.encode(),
+                "more_body": more,
+            })
+
+        # Sent once subscribed, so nothing published later is missed.
+        await write(": subscribed\n\n")
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), settings.EVENTS_KEEPALIVE
+                )
+            except TimeoutError:
+                # Keeps proxies from closing an idle stream.
+                await write(": keepalive\n\n")
+                continue
+            await write(event.encode())
+            if subscription.overflowed and subscription.queue.empty():
+                return await write("event: overflow\ndata: {}\n\n", False)
+
+    @staticmethod
+    async def disconnected(receive) -> None:
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    @staticmethod
+    async def reply(
+        send, exc: exceptions.APIException, authenticate: str = None
+    ) -> None:
+        """Answer with the body DRF's exception handler would give."""
+        data = exc.detail
+        if not isinstance(data, (dict, list)):
+            data = {"detail": data}
+        headers = [(b"content-type", b"application/json")]
+        if authenticate and exc.status_code == 401:
+            headers.append((b"www-authenticate", authenticate.encode()))
+        await send({
+            "type": "http.response.start",
+            "status": exc.status_code,
+            "headers": headers,
+        })
+        await send({
+            "type": "http.response.body",
+            "body": json.dumps(data).encode(),
+        })
@@ -0,0 +1,77 @@
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpResponse
+from django.test.utils import CaptureQueriesContext
+
+
+def format_queries(context: CaptureQueriesContext) -> str:
+    return "\n".join(
+        f"{number}. {query['sql']}"
+        for number, query in enumerate(context.captured_queries, start=1)
+    )
+
+
+@contextmanager
+def query_budget(
+    limit: int, using: str = DEFAULT_DB_ALIAS
+) -> Iterator[CaptureQueriesContext]:
+    """
+    Fail when the block runs more than `limit` queries, listing them.
+
+        with query_budget(2):
+            self.client.get(url)
+
+    Unlike `assertNumQueries` a budget is an upper bound, so an
+    optimization does not break the test.
+    """
+    with CaptureQueriesContext(connections[using]) as context:
+        yield context
+    if len(context) > limit:
+        raise AssertionError(
+            f"{len(context)} queries executed, the budget is {limit}:\n"
+            f"{format_queries(context)}"
+        )
+
+
+class ConstantQueriesMixin:
+    """
+    TestCase mixin asserting that an endpoint's query count does not
+    grow with the number of rows it returns.
+    """
+
+    rows = 3
+
+    def assertConstantQueries(
+        self,
+        seed: Callable[[int], object],
+        request: Callable[[], HttpResponse],
+        rows: int = None,
+        status: int = 200,
+    ) -> int:
+        """
+        Seed `rows` rows and request, then seed up to ten times as many
+        and request again; both requests must run the same queries. The
+        cache is cleared first so cached responses do not hide them.
+        Returns the query count.
+        """
+        rows = rows or self.rows
+        contexts = []
+        for count in (rows, rows * 9):
+            seed(count)
+            cache.clear()
+            with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as ctx:
+                response = request()
+            self.assertEqual(response.status_code, status, response.content)
+            contexts.append(ctx)
+
+        few, many = contexts
+        self.assertEqual(
+            len(few),
+            len(many),
+            f"\n{rows} rows:\n{format_queries(few)}\n\n"
+            f"{rows * 10} rows:\n{format_queries(many)}",
+        )
+        return len(many)
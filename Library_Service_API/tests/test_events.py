@@ -0,0 +1,306 @@
+import asyncio
+from datetime import timedelta
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from Library_Service_API.events import (
+    Event,
+    InProcessEventBroker,
+    RedisEventBroker,
+    get_broker,
+)
+from Library_Service_API.streaming import EVENTS_PATH, EventStreamApplication
+from books.models import Book
+from borrowings.models import Borrowing
+from users.models import User
+
+IN_PROCESS = "Library_Service_API.events.InProcessEventBroker"
+
+
+async def drain(queue: asyncio.Queue) -> list[Event]:
+    # Deliveries are scheduled on the loop; let them run first.
+    await asyncio.sleep(0)
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+
+class EventBrokerTest(SimpleTestCase):
+    async def test_events_are_filtered_per_user(self):
+        broker = InProcessEventBroker()
+        inventory = Event("inventory", {"book": 1, "change": -1})
+        own = Event("borrowing.returned", {"id": 1, "book": 1}, 1)
+        foreign = Event("borrowing.returned", {"id": 2, "book": 1}, 2)
+
+        async with (
+            broker.subscribe(1, False) as reader,
+            broker.subscribe(3, True) as staff,
+            broker.subscribe(4, False, ["borrowing"]) as narrowed,
+        ):
+            broker.send([inventory, own, foreign])
+
+            self.assertEqual(await drain(reader.queue), [inventory, own])
+            self.assertEqual(
+                await drain(staff.queue), [inventory, own, foreign]
+            )
+            self.assertEqual(await drain(narrowed.queue), [])
+
+        self.assertEqual(broker.subscribers, 0)
+
+    async def test_type_prefixes(self):
+        broker = InProcessEventBroker()
+        returned = Event("borrowing.returned", {}, None)
+
+        async with (
+            broker.subscribe(1, False, ["borrowing"]) as prefix,
+            broker.subscribe(2, False, ["borrowing.created"]) as exact,
+            broker.subscribe(3, False, ["borrow"]) as partial,
+        ):
+            broker.send([returned])
+
+            self.assertEqual(await drain(prefix.queue), [returned])
+            self.assertEqual(await drain(exact.queue), [])
+            self.assertEqual(await drain(partial.queue), [])
+
+    @override_settings(EVENTS_QUEUE_SIZE=2)
+    async def test_slow_subscriber_overflows(self):
+        broker = InProcessEventBroker()
+
+        async with broker.subscribe(1, False) as subscription:
+            broker.send([Event("inventory", {"book": n}) for n in range(3)])
+            await asyncio.sleep(0)
+
+            self.assertTrue(subscription.overflowed)
+            self.assertEqual(subscription.queue.qsize(), 2)
+
+    async def test_delivery_from_another_thread(self):
+        broker = InProcessEventBroker()
+        event = Event("inventory", {"book": 1, "change": 1})
+
+        async with broker.subscribe(1, False) as subscription:
+            await asyncio.to_thread(broker.send, [event])
+
+            self.assertEqual(
+                await asyncio.wait_for(subscription.queue.get(), 1), event
+            )
+
+    def test_redis_broker_publishes_serialized_events(self):
+        broker = RedisEventBroker("redis://localhost:6379/0", "test")
+        broker.client = mock.MagicMock()
+        event = Event("hold.ready", {"id": 1}, 7)
+
+        broker.send([event])
+
+        pipeline = broker.client.pipeline.return_value.__enter__.return_value
+        pipeline.publish.assert_called_once_with("test", event.dumps())
+        self.assertEqual(Event.loads(event.dumps()), event)
+
+    @override_settings(EVENTS_BROKER=IN_PROCESS)
+    def test_broker_follows_settings(self):
+        self.assertIsInstance(get_broker(), InProcessEventBroker)
+
+
+@override_settings(EVENTS_BROKER=IN_PROCESS)
+class PublishTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="user@test.com", password="pass123"
+        )
+        self.book = Book.objects.create(
+            title="Evented Book",
+            author="Author",
+            cover=Book.CoverChoices.SOFT,
+            inventory=1,
+            daily_fee="1.00"
+        )
+        self.client.force_authenticate(self.user)
+        patcher = mock.patch.object(InProcessEventBroker, "send")
+        self.send = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def published(self) -> list[Event]:
+        return [
+            event for call in self.send.call_args_list for event in call.args[0]
+        ]
+
+    def test_borrow_and_return_publish_after_commit(self):
+        today = timezone.now().date()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("borrowings:borrowing-list-create"),
+                {
+                    "borrow_date": str(today),
+                    "expected_return_date": str(today + timedelta(days=7)),
+                    "book": self.book.title,
+                },
+                format="json",
+            )
+        borrowing = Borrowing.objects.get()
+        self.assertEqual(self.published(), [
+            Event("inventory", {"book": self.book.pk, "change": -1}),
+            Event(
+                "borrowing.created",
+                {"id": borrowing.pk, "book": self.book.pk},
+                self.user.pk,
+            ),
+        ])
+
+        self.send.reset_mock()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("borrowings:borrowing-return", args=[borrowing.pk])
+            )
+        self.assertEqual(self.published(), [
+            Event("inventory", {"book": self.book.pk, "change": 1}),
+            Event(
+                "borrowing.returned",
+                {"id": borrowing.pk, "book": self.book.pk},
+                self.user.pk,
+            ),
+        ])
+
+    def test_failed_borrow_publishes_nothing(self):
+        Book.objects.filter(pk=self.book.pk).update(inventory=0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("borrowings:borrowing-list-create"),
+                {
+                    "borrow_date": "2024-01-01",
+                    "expected_return_date": "2024-01-02",
+                    "book": self.book.title,
+                },
+                format="json",
+            )
+
+        self.send.assert_not_called()
+
+    def test_broker_errors_do_not_fail_the_request(self):
+        self.send.side_effect = ConnectionError
+
+        with (
+            self.assertLogs("Library_Service_API.events", "ERROR"),
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            response = self.client.post(
+                reverse("borrowings:borrowing-bulk-create"),
+                {
+                    "borrow_date": "2024-01-01",
+                    "expected_return_date": "2024-01-02",
+                    "books": [self.book.title],
+                },
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 201)
+
+
+class StreamClient:
+    """Drives one ASGI request against the application."""
+
+    def __init__(self, application, path: str, method="GET", headers=()):
+        self.inbound = asyncio.Queue()
+        self.outbound = asyncio.Queue()
+        self.task = asyncio.ensure_future(application(
+            {
+                "type": "http",
+                "method": method,
+                "path": path,
+                "query_string": b"",
+                "headers": [
+                    (name.encode(), value.encode()) for name, value in headers
+                ],
+            },
+            self.inbound.get,
+            self.outbound.put,
+        ))
+
+    async def receive(self) -> dict:
+        return await asyncio.wait_for(self.outbound.get(), 1)
+
+    async def chunk(self) -> str:
+        return (await self.receive())["body"].decode()
+
+    async def disconnect(self) -> None:
+        await self.inbound.put({"type": "http.disconnect"})
+        await asyncio.wait_for(self.task, 1)
+
+
+@override_settings(EVENTS_BROKER=IN_PROCESS)
+class EventStreamApplicationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@test.com", password="pass123"
+        )
+        self.inner = mock.AsyncMock()
+        self.application = EventStreamApplication(self.inner)
+        # Closing the connection would end the test transaction.
+        patcher = mock.patch(
+            "Library_Service_API.streaming.close_old_connections"
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def auth(self, user: User) -> list:
+        return [("authorize", f"Bearer {AccessToken.for_user(user)}")]
+
+    async def test_other_paths_go_to_django(self):
+        client = StreamClient(self.application, "/api/v1/books/")
+        await asyncio.wait_for(client.task, 1)
+
+        self.inner.assert_awaited_once()
+
+    async def test_anonymous_is_rejected(self):
+        client = StreamClient(self.application, EVENTS_PATH)
+
+        start = await client.receive()
+        self.assertEqual(start["status"], 401)
+        self.assertIn(
+            (b"www-authenticate", b'Bearer realm="api"'), start["headers"]
+        )
+
+    async def test_only_get(self):
+        client = StreamClient(
+            self.application, EVENTS_PATH, "POST", self.auth(self.user)
+        )
+
+        self.assertEqual((await client.receive())["status"], 405)
+
+    async def test_stream_delivers_visible_events(self):
+        client = StreamClient(
+            self.application, EVENTS_PATH, headers=self.auth(self.user)
+        )
+        start = await client.receive()
+        self.assertEqual(start["status"], 200)
+        self.assertIn((b"content-type", b"text/event-stream"), start["headers"])
+        self.assertEqual(await client.chunk(), ": subscribed\n\n")
+
+        get_broker().send([
+            Event("borrowing.returned", {"id": 9}, self.user.pk + 1),
+            Event("hold.ready", {"id": 1, "book": 2}, self.user.pk),
+        ])
+
+        self.assertEqual(
+            await client.chunk(),
+            'event: hold.ready\ndata: {"id": 1, "book": 2}\n\n',
+        )
+        await client.disconnect()
+        self.assertEqual(get_broker().subscribers, 0)
+
+    @override_settings(EVENTS_KEEPALIVE=0.01)
+    async def test_idle_stream_sends_keepalives(self):
+        client = StreamClient(
+            self.application, EVENTS_PATH, headers=self.auth(self.user)
+        )
+        await client.receive()
+        await client.chunk()
+
+        self.assertEqual(await client.chunk(), ": keepalive\n\n")
+        await client.disconnect()
@@ -0,0 +1,94 @@
+import io
+from datetime import date, datetime, time, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+from uuid import UUID
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from Library_Service_API.parsers import FastJSONParser
+from Library_Service_API.renderers import FastJSONRenderer
+
+DATA = {
+    "results": ReturnList([
+        ReturnDict({
+            "id": 1,
+            "title": "Pan Tadeusz \u2028 ćma",
+            "daily_fee": Decimal("1.25"),
+            "borrow_date": date(2026, 3, 31),
+            "updated_at": datetime(
+                2026, 3, 31, 12, 30, 5, 123456, tzinfo=dt_timezone.utc
+            ),
+            "opens_at": time(9, 30),
+            "detail": gettext_lazy("Not found."),
+            "uuid": UUID("12345678123456781234567812345678"),
+            "tags": ("a", "b"),
+            "rating": 4.5,
+            "active": True,
+            "note": None,
+        }, serializer=None),
+    ], serializer=None),
+    1: "non-string key",
+}
+
+
+class FastJSONRendererTest(SimpleTestCase):
+    def test_renders_same_bytes_as_json_renderer(self):
+        self.assertEqual(
+            FastJSONRenderer().render(DATA), JSONRenderer().render(DATA)
+        )
+
+    def test_indent_falls_back_to_json_renderer(self):
+        media_type = "application/json; indent=4"
+
+        self.assertEqual(
+            FastJSONRenderer().render(DATA, media_type),
+            JSONRenderer().render(DATA, media_type),
+        )
+
+    def test_renders_without_orjson(self):
+        with mock.patch("Library_Service_API.renderers.orjson", None):
+            self.assertEqual(
+                FastJSONRenderer().render(DATA), JSONRenderer().render(DATA)
+            )
+
+    def test_renders_none_as_empty_body(self):
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+
+class FastJSONParserTest(SimpleTestCase):
+    body = '{"books": ["Dune", "Ćma"], "count": 2, "fee": 1.25}'
+
+    def parse(self, body: bytes, encoding: str = "utf-8"):
+        return FastJSONParser().parse(
+            io.BytesIO(body), parser_context={"encoding": encoding}
+        )
+
+    def test_parses_same_data_as_json_parser(self):
+        self.assertEqual(
+            self.parse(self.body.encode()),
+            JSONParser().parse(io.BytesIO(self.body.encode())),
+        )
+
+    def test_invalid_json_raises_parse_error(self):
+        with self.assertRaises(ParseError):
+            self.parse(b'{"books": [')
+
+    def test_rejects_nan(self):
+        with self.assertRaises(ParseError):
+            self.parse(b'{"fee": NaN}')
+
+    def test_other_encodings_fall_back_to_json_parser(self):
+        self.assertEqual(
+            self.parse(self.body.encode("utf-16"), encoding="utf-16"),
+            {"books": ["Dune", "Ćma"], "count": 2, "fee": 1.25},
+        )
+
+    def test_parses_without_orjson(self):
+        with mock.patch("Library_Service_API.parsers.orjson", None):
+            self.assertEqual(self.parse(self.body.encode())["count"], 2)
@@ -0,0 +1,128 @@
+import tempfile
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.tasks import check_overdue_borrowings
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class PrometheusMetricsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.book = Book.objects.create(
+            title="Metrics Book",
+            author="Author",
+            cover=Book.CoverChoices.SOFT,
+            inventory=1,
+            daily_fee="1.00"
+        )
+
+    def test_request_metrics_are_labelled_by_url_name(self):
+        labels = {"view": "books:book-list", "method": "GET"}
+        before = {
+            name: sample(name, **labels) for name in (
+                "library_http_request_db_queries_count",
+                "library_http_request_db_queries_sum",
+                "library_http_request_view_duration_seconds_count",
+                "library_http_request_render_duration_seconds_count",
+                "library_http_response_size_bytes_sum",
+            )
+        }
+        latency_before = sample(
+            "library_http_request_duration_seconds_count",
+            status="200",
+            **labels,
+        )
+
+        response = self.client.get(reverse("books:book-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sample(
+                "library_http_request_duration_seconds_count",
+                status="200",
+                **labels,
+            ),
+            latency_before + 1,
+        )
+        after = {name: sample(name, **labels) for name in before}
+        for name in (
+            "library_http_request_db_queries_count",
+            "library_http_request_view_duration_seconds_count",
+            "library_http_request_render_duration_seconds_count",
+        ):
+            self.assertEqual(after[name], before[name] + 1, name)
+        self.assertGreater(
+            after["library_http_request_db_queries_sum"],
+            before["library_http_request_db_queries_sum"],
+        )
+        self.assertEqual(
+            after["library_http_response_size_bytes_sum"],
+            before["library_http_response_size_bytes_sum"]
+            + len(response.content),
+        )
+
+    def test_async_view_queries_are_counted(self):
+        labels = {"view": "async-books:book-detail", "method": "GET"}
+        before = sample("library_http_request_db_queries_sum", **labels)
+
+        self.client.get(
+            reverse("async-books:book-detail", args=[self.book.pk])
+        )
+
+        self.assertEqual(
+            sample("library_http_request_db_queries_sum", **labels),
+            before + 1,
+        )
+
+    def test_unresolved_paths_share_one_label(self):
+        labels = {"view": "unresolved", "method": "GET", "status": "404"}
+        before = sample(
+            "library_http_request_duration_seconds_count", **labels
+        )
+
+        self.client.get("/no/such/path/")
+
+        self.assertEqual(
+            sample("library_http_request_duration_seconds_count", **labels),
+            before + 1,
+        )
+
+    def test_metrics_endpoint(self):
+        self.client.get(reverse("books:book-list"))
+
+        response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertIn(
+            b'library_http_request_duration_seconds_count{method="GET",'
+            b'status="200",view="books:book-list"}',
+            response.content,
+        )
+
+    def test_task_duration(self):
+        labels = {
+            "task": "borrowings.tasks.check_overdue_borrowings",
+            "state": "SUCCESS",
+        }
+        before = sample("library_celery_task_duration_seconds_count", **labels)
+
+        with tempfile.TemporaryDirectory() as report_dir:
+            with override_settings(OVERDUE_REPORT_DIR=report_dir):
+                check_overdue_borrowings.apply()
+
+        self.assertEqual(
+            sample("library_celery_task_duration_seconds_count", **labels),
+            before + 1,
+        )
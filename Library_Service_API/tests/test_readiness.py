@@ -0,0 +1,229 @@
+import socket
+import time
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from Library_Service_API import readiness
+from borrowings.celery import app
+
+
+def failing(timeout: float) -> None:
+    raise ConnectionError("refused")
+
+
+def passing(timeout: float) -> None:
+    pass
+
+
+@override_settings(
+    READINESS_PROBES=["database", "broker", "workers"],
+    READINESS_CRITICAL_PROBES=["database", "broker"],
+    READINESS_CACHE_TTL=60,
+)
+class ReadinessViewsTest(TestCase):
+    def setUp(self):
+        readiness.probe_cache.clear()
+        self.addCleanup(readiness.probe_cache.clear)
+        # The database probe closes its connection, which would end the
+        # test transaction; a pool thread has a connection of its own.
+        self.probes = {
+            "database": mock.Mock(side_effect=passing),
+            "broker": mock.Mock(side_effect=passing),
+            "workers": mock.Mock(side_effect=passing),
+        }
+        patcher = mock.patch.dict(readiness.PROBES, self.probes)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_healthz_does_not_probe(self):
+        response = self.client.get(reverse("healthz"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"status": "ok"})
+        for probe in self.probes.values():
+            probe.assert_not_called()
+
+    def test_readyz_reports_every_probe(self):
+        response = self.client.get(reverse("readyz"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Cache-Control"], "no-store")
+        body = response.json()
+        self.assertEqual(body["status"], "ready")
+        self.assertEqual(
+            set(body["checks"]), {"database", "broker", "workers"}
+        )
+        self.assertTrue(body["checks"]["broker"]["critical"])
+        self.assertFalse(body["checks"]["workers"]["critical"])
+
+    def test_readyz_fails_when_critical_probe_fails(self):
+        self.probes["broker"].side_effect = failing
+
+        response = self.client.get(reverse("readyz"))
+
+        self.assertEqual(
+            response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+        check = response.json()["checks"]["broker"]
+        self.assertFalse(check["ok"])
+        self.assertEqual(check["error"], "ConnectionError: refused")
+
+    def test_readyz_ignores_non_critical_failure(self):
+        self.probes["workers"].side_effect = failing
+
+        response = self.client.get(reverse("readyz"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.json()["checks"]["workers"]["ok"])
+
+    def test_readyz_caches_results(self):
+        for _ in range(3):
+            self.client.get(reverse("readyz"))
+
+        for probe in self.probes.values():
+            self.assertEqual(probe.call_count, 1)
+
+    @override_settings(READINESS_CACHE_TTL=0)
+    def test_readyz_probes_again_after_ttl(self):
+        self.client.get(reverse("readyz"))
+        self.client.get(reverse("readyz"))
+
+        self.assertEqual(self.probes["database"].call_count, 2)
+
+    @override_settings(READINESS_PROBE_TIMEOUT=0.1)
+    def test_slow_probe_times_out(self):
+        self.probes["workers"].side_effect = lambda timeout: time.sleep(0.5)
+
+        started = time.monotonic()
+        response = self.client.get(reverse("readyz"))
+
+        self.assertLess(time.monotonic() - started, 0.4)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["checks"]["workers"]["error"], "Timed out"
+        )
+
+
+@override_settings(READINESS_PROBE_TIMEOUT=0.1)
+class WaitUntilReadyTest(SimpleTestCase):
+    def test_probes_run_in_parallel(self):
+        slow = mock.Mock(side_effect=lambda timeout: time.sleep(0.2))
+        with mock.patch.dict(
+            readiness.PROBES, {"database": slow, "broker": slow}
+        ):
+            started = time.monotonic()
+            results = readiness.run_probes(["database", "broker"], 1)
+
+        self.assertLess(time.monotonic() - started, 0.35)
+        self.assertTrue(all(result.ok for result in results.values()))
+
+    def test_retries_with_exponential_backoff(self):
+        probe = mock.Mock(side_effect=[ConnectionError, ConnectionError, None])
+        on_retry = mock.Mock()
+
+        with mock.patch.dict(readiness.PROBES, {"database": probe}):
+            results = readiness.wait_until_ready(
+                ["database"], 5, initial_delay=0.01, on_retry=on_retry
+            )
+
+        self.assertTrue(results["database"].ok)
+        self.assertEqual(probe.call_count, 3)
+        self.assertEqual(
+            [call.args[2] for call in on_retry.call_args_list], [0.01, 0.02]
+        )
+
+    def test_backoff_is_capped(self):
+        on_retry = mock.Mock()
+
+        with mock.patch.dict(readiness.PROBES, {"database": failing}):
+            readiness.wait_until_ready(
+                ["database"],
+                0.5,
+                initial_delay=0.01,
+                max_delay=0.04,
+                on_retry=on_retry,
+            )
+
+        self.assertEqual(
+            max(call.args[2] for call in on_retry.call_args_list), 0.04
+        )
+
+    def test_gives_up_at_deadline(self):
+        with mock.patch.dict(readiness.PROBES, {"database": failing}):
+            started = time.monotonic()
+            results = readiness.wait_until_ready(["database"], 0.3)
+
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertFalse(results["database"].ok)
+
+
+@override_settings(READINESS_PROBE_TIMEOUT=0.1)
+class WaitForDbCommandTest(SimpleTestCase):
+    def test_waits_for_requested_probes(self):
+        probe = mock.Mock(side_effect=[ConnectionError, None])
+        out = StringIO()
+
+        with mock.patch.dict(
+            readiness.PROBES, {"database": passing, "broker": probe}
+        ):
+            call_command(
+                "wait_for_db", "--probes", "database", "broker", stdout=out
+            )
+
+        self.assertEqual(probe.call_count, 2)
+        self.assertIn("broker available", out.getvalue())
+
+    def test_fails_after_timeout(self):
+        with mock.patch.dict(readiness.PROBES, {"database": failing}):
+            with self.assertRaisesMessage(CommandError, "database"):
+                call_command("wait_for_db", "--timeout", "0.2", stdout=StringIO())
+
+
+class BrokerProbesTest(SimpleTestCase):
+    def setUp(self):
+        # Nothing listens on port 1, so connecting is refused.
+        connect = app.connection_for_write
+        patcher = mock.patch.object(
+            app,
+            "connection_for_write",
+            lambda **options: connect("amqp://guest@127.0.0.1:1//", **options),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_unreachable_broker_fails_within_timeout(self):
+        for probe in (readiness.check_broker, readiness.check_workers):
+            with self.subTest(probe=probe.__name__):
+                started = time.monotonic()
+                with self.assertRaises(Exception):
+                    probe(0.2)
+
+                self.assertLess(time.monotonic() - started, 0.5)
+
+
+class DatabaseProbeTest(SimpleTestCase):
+    databases = {DEFAULT_DB_ALIAS}
+
+    def test_unresponsive_database_fails_within_connect_timeout(self):
+        # Connections to the socket are accepted by the kernel, but no
+        # server ever answers them.
+        server = socket.socket()
+        self.addCleanup(server.close)
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        host, port = server.getsockname()
+        settings_dict = connections[DEFAULT_DB_ALIAS].settings_dict
+
+        with mock.patch.dict(settings_dict, HOST=host, PORT=port):
+            started = time.monotonic()
+            with self.assertRaisesMessage(OperationalError, "timeout"):
+                readiness.check_database(0.1)
+
+        # libpq's shortest connect timeout.
+        self.assertLess(time.monotonic() - started, 3)
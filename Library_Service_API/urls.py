@@ -23,14 +23,30 @@ from drf_spectacular.views import (
     SpectacularRedocView,
 )
 
+from Library_Service_API.metrics import metrics_view
+from Library_Service_API.readiness import healthz, readyz
+
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metrics", metrics_view, name="metrics"),
+    path("healthz", healthz, name="healthz"),
+    path("readyz", readyz, name="readyz"),
     path("api/v1/books/", include("books.urls", namespace="books")),
     path("api/v1/users/", include("users.urls", namespace="users")),
     path(
         "api/v1/borrowings/",
         include("borrowings.urls", namespace="borrowings")
     ),
+    # Async read-only twins of the list and detail endpoints; clients
+    # opt in by switching to this prefix.
+    path(
+        "api/v1/async/books/",
+        include("books.async_urls", namespace="async-books")
+    ),
+    path(
+        "api/v1/async/borrowings/",
+        include("borrowings.async_urls", namespace="async-borrowings")
+    ),
     path("api/v1/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
         "api/v1/swagger-ui/",
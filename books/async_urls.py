@@ -0,0 +1,10 @@
+from django.urls import path
+
+from books.async_views import AsyncBookDetailView, AsyncBookListView
+
+app_name = "async-books"
+
+urlpatterns = [
+    path("", AsyncBookListView.as_view(), name="book-list"),
+    path("<int:pk>/", AsyncBookDetailView.as_view(), name="book-detail"),
+]
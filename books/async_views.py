@@ -0,0 +1,45 @@
+from django.http import Http404
+from rest_framework.request import Request
+
+from Library_Service_API.async_views import AsyncReadOnlyAPIView
+from books.filters import BookSearchFilter
+from books.models import Book
+from books.pagination import BookPagination
+from books.permissions import IsAdminOrReadOnly
+from books.serializers import BookSerializer
+from books.views import BookViewSet
+
+
+class AsyncBookListView(AsyncReadOnlyAPIView):
+    """Async twin of the `BookViewSet` list, including `?search=`."""
+
+    permission_classes = (IsAdminOrReadOnly,)
+    pagination_class = BookPagination
+    filter_backends = (BookSearchFilter,)
+
+    async def get_data(self, request: Request, *args, **kwargs) -> dict:
+        queryset = BookViewSet.queryset.all()
+        for backend in self.filter_backends:
+            queryset = await backend().afilter_queryset(
+                request, queryset, self
+            )
+
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(queryset, request, self)
+        data = BookSerializer(page, many=True).data
+        return paginator.get_paginated_response(data).data
+
+
+class AsyncBookDetailView(AsyncReadOnlyAPIView):
+    """Async twin of the `BookViewSet` retrieve."""
+
+    permission_classes = (IsAdminOrReadOnly,)
+
+    async def get_data(
+        self, request: Request, pk: int, *args, **kwargs
+    ) -> dict:
+        try:
+            book = await BookViewSet.queryset.aget(pk=pk)
+        except Book.DoesNotExist:
+            raise Http404("No Book matches the given query.")
+        return BookSerializer(book).data
@@ -0,0 +1,96 @@
+import hashlib
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import mixins, status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from Library_Service_API.conditional import ConditionalGetMixin
+
+CATALOGUE_VERSION_KEY = "books:catalogue:version"
+
+
+def get_catalogue_version() -> int:
+    """
+    The version in the cache keys and ETags of catalogue responses.
+
+    It starts from the clock whenever the key is missing, e.g. after an
+    eviction, so it never comes back to a version whose entries or
+    ETags may still be around; bumps add one per invalidation.
+    """
+    cache.add(CATALOGUE_VERSION_KEY, time.time_ns(), timeout=None)
+    return cache.get(CATALOGUE_VERSION_KEY, time.time_ns())
+
+
+def invalidate_catalogue() -> None:
+    """Drop every cached catalogue response by bumping the version."""
+    cache.add(CATALOGUE_VERSION_KEY, time.time_ns(), timeout=None)
+    try:
+        cache.incr(CATALOGUE_VERSION_KEY)
+    except ValueError:
+        cache.set(CATALOGUE_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+class CatalogueCacheMixin(ConditionalGetMixin):
+    """
+    Cache list and retrieve responses of the books catalogue.
+
+    Entries are keyed by the catalogue version, the full URL (so query
+    params and pagination cursors are included) and the response format.
+    The key digest is the ETag, so a matching `If-None-Match` is
+    answered with 304 before the database or serializer is touched.
+    The cached entry also keeps `Last-Modified` for `If-Modified-Since`.
+    """
+
+    def get_catalogue_cache_key(self, request: Request) -> str:
+        url = request.build_absolute_uri()
+        renderer = request.accepted_renderer.format
+        digest = hashlib.md5(
+            f"{get_catalogue_version()}:{renderer}:{url}".encode()
+        ).hexdigest()
+        return f"books:catalogue:{digest}"
+
+    def get_cached_response(self, request: Request, render) -> Response:
+        key = self.get_catalogue_cache_key(request)
+        etag = f'"{key.rsplit(":", 1)[-1]}"'
+
+        data, last_modified = cache.get(key, (None, None))
+        precondition = self.evaluate_preconditions(
+            request, etag, last_modified
+        )
+        if precondition is not None:
+            return precondition
+
+        if data is None:
+            response, last_modified = render()
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            data = response.data
+            cache.set(
+                key,
+                (data, last_modified),
+                timeout=settings.BOOK_CACHE_TIMEOUT
+            )
+
+        return self.set_validators(Response(data), etag, last_modified)
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        def render() -> tuple[Response, datetime | None]:
+            _, last_modified = self.get_list_validators(request)
+            response = mixins.ListModelMixin.list(
+                self, request, *args, **kwargs
+            )
+            return response, last_modified
+
+        return self.get_cached_response(request, render)
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        def render() -> tuple[Response, datetime | None]:
+            instance = self.get_object()
+            _, last_modified = self.get_object_validators(request, instance)
+            return Response(self.get_serializer(instance).data), last_modified
+
+        return self.get_cached_response(request, render)
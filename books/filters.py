@@ -0,0 +1,149 @@
+import re
+
+from django.contrib.postgres.expressions import ArraySubquery
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchQueryField,
+    SearchRank,
+    TrigramDistance,
+)
+from django.db.models import (
+    BooleanField,
+    Case,
+    Exists,
+    F,
+    FloatField,
+    Func,
+    QuerySet,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.request import Request
+
+from books.models import SearchWord
+
+
+class BookSearchFilter(BaseFilterBackend):
+    """
+    Rank books against `?search=` with full-text search over the stored
+    `search_vector`. Only when nothing matches, e.g. for a misspelled
+    word, every word of the term is replaced by the `suggestions` most
+    similar catalogue words from `SearchWord` before matching.
+
+    Both happen in one query: the exact match probe is an uncorrelated
+    subquery that Postgres runs once, and the word lookups only run if
+    it found nothing. Either way the books come from the GIN index on
+    `search_vector`; trigrams are only compared with the word table.
+
+    Postgres cannot estimate how many books that match finds, as it
+    depends on the probe, and guesses thousands. The books table takes
+    no parallel workers (migration 0007): starting them for a guess
+    like that costs more than the search, and would run the word
+    lookups every time.
+
+    The rank is a `real`; it is cast to double precision so the value
+    stored in a pagination cursor compares equal to the one in SQL.
+    """
+
+    search_param = "search"
+    search_ordering = ("-rank", "id")
+    suggestions = 3
+
+    def get_search_term(self, request: Request) -> str:
+        return request.query_params.get(self.search_param, "").strip()
+
+    def filter_queryset(
+        self,
+        request: Request,
+        queryset: QuerySet,
+        view
+    ) -> QuerySet:
+        term = self.get_search_term(request)
+        if not term:
+            return queryset
+
+        query = self.get_search_query(queryset, term)
+        return (
+            queryset
+            .filter(
+                Func(
+                    F("search_vector"),
+                    query,
+                    function="",
+                    arg_joiner=" @@ ",
+                    output_field=BooleanField(),
+                )
+            )
+            .annotate(
+                rank=Cast(SearchRank(F("search_vector"), query), FloatField())
+            )
+            .order_by(*self.search_ordering)
+        )
+
+    async def afilter_queryset(
+        self,
+        request: Request,
+        queryset: QuerySet,
+        view
+    ) -> QuerySet:
+        """`filter_queryset` for async views; it runs no queries."""
+        return self.filter_queryset(request, queryset, view)
+
+    def get_search_query(self, queryset: QuerySet, term: str):
+        query = SearchQuery(term, config="english", search_type="websearch")
+        words = re.findall(r"[^\W\d_]+", term.lower())
+        if not words:
+            return query
+
+        corrected = None
+        for word in words:
+            similar = (
+                SearchWord.objects
+                .filter(word__trigram_similar=word)
+                .order_by(TrigramDistance("word", word), "word")
+                .values("word")[:self.suggestions]
+            )
+            alternatives = SearchQuery(
+                Func(
+                    ArraySubquery(similar),
+                    Value(" or "),
+                    function="array_to_string",
+                ),
+                config="english",
+                search_type="websearch",
+            )
+            corrected = (
+                alternatives if corrected is None
+                else corrected & alternatives
+            )
+
+        return Case(
+            When(Exists(queryset.filter(search_vector=query)), then=query),
+            default=corrected,
+            output_field=SearchQueryField(),
+        )
+
+    def get_ordering(
+        self,
+        request: Request,
+        queryset: QuerySet,
+        view
+    ) -> tuple[str, ...] | None:
+        """Cursor pagination pages ranked results by this ordering."""
+        if self.get_search_term(request):
+            return self.search_ordering
+        return None
+
+    def get_schema_operation_parameters(self, view) -> list[dict]:
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Ranked full-text search over title and "
+                               "author, tolerant to typos",
+                "schema": {"type": "string"},
+            },
+        ]
@@ -0,0 +1,158 @@
+import random
+import statistics
+import time
+import uuid
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework import mixins
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from books.models import Book, SearchWord
+from books.search import rebuild_search_words
+from books.views import BookViewSet
+
+SYLLABLES = (
+    "ka", "lo", "mir", "an", "dra", "gon", "sil", "ver", "mo", "on",
+    "shad", "ow", "for", "est", "win", "ter", "sto", "ne", "riv", "er",
+    "el", "dor", "tha", "lin", "qua", "rex", "vel", "ith", "bran", "do",
+)
+
+
+def make_vocabulary(rng: random.Random, size: int) -> list[str]:
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    return sorted(words)
+
+
+def make_typo(rng: random.Random, word: str) -> str:
+    position = rng.randrange(len(word) - 1)
+    return (
+        word[:position] + word[position + 1] + word[position]
+        + word[position + 2:]
+    )
+
+
+class UncachedBookViewSet(BookViewSet):
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        return mixins.ListModelMixin.list(self, request, *args, **kwargs)
+
+
+class Command(BaseCommand):
+    """
+    Django command to measure `?search=` latency of the books list
+    on a large catalogue, bypassing the response cache.
+    """
+
+    help = (
+        "Seed books inside a rolled back transaction and time ranked "
+        "search requests through the books list view."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--books", type=int, default=1_000_000)
+        parser.add_argument("--vocabulary", type=int, default=20_000)
+        parser.add_argument("--terms", type=int, default=50)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument(
+            "--max-p95-ms",
+            type=float,
+            default=50.0,
+            help="Fail if the 95th percentile latency is above this.",
+        )
+        parser.add_argument(
+            "--no-seed",
+            action="store_true",
+            help="Benchmark against the existing books only.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        self.verbosity = options["verbosity"]
+        rng = random.Random(0)
+        vocabulary = make_vocabulary(rng, options["vocabulary"])
+        terms = self.make_terms(rng, vocabulary, options["terms"])
+
+        with transaction.atomic():
+            if not options["no_seed"]:
+                self.stdout.write(f"Seeding {options['books']} books...")
+                self.seed_books(
+                    options["books"], vocabulary, options["batch_size"]
+                )
+                rebuild_search_words()
+
+            with connection.cursor() as cursor:
+                for model in (Book, SearchWord):
+                    cursor.execute(f"ANALYZE {model._meta.db_table}")
+
+            timings = self.run_searches(terms, options["repeat"])
+            transaction.set_rollback(True)
+
+        p50 = statistics.median(timings)
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        self.stdout.write(
+            f"{len(timings)} searches: p50 {p50:.1f} ms, p95 {p95:.1f} ms"
+        )
+        if p95 > options["max_p95_ms"]:
+            raise CommandError(
+                f"p95 {p95:.1f} ms is above {options['max_p95_ms']} ms"
+            )
+        self.stdout.write(self.style.SUCCESS("Search is fast enough"))
+
+    @staticmethod
+    def make_terms(
+        rng: random.Random, vocabulary: list[str], count: int
+    ) -> list[str]:
+        """One word, two words and misspelled words, in equal shares."""
+        terms = []
+        for number in range(count):
+            words = rng.sample(vocabulary, 1 + number % 2)
+            if number % 3 == 2:
+                words = [make_typo(rng, word) for word in words]
+            terms.append(" ".join(words))
+        return terms
+
+    @staticmethod
+    def seed_books(
+        count: int, vocabulary: list[str], batch_size: int
+    ) -> None:
+        rng = random.Random(1)
+        prefix = uuid.uuid4().hex[:8]
+        for start in range(0, count, batch_size):
+            Book.objects.bulk_create(
+                Book(
+                    title=(
+                        " ".join(rng.sample(vocabulary, rng.randint(2, 4)))
+                        + f" {prefix}-{number}"
+                    ),
+                    author=" ".join(rng.sample(vocabulary, 2)).title(),
+                    cover=rng.choice(Book.CoverChoices.values),
+                    inventory=rng.randint(0, 20),
+                    daily_fee=Decimal(rng.randint(10, 500)) / 100,
+                )
+                for number in range(start, min(start + batch_size, count))
+            )
+
+    def run_searches(self, terms: list[str], repeat: int) -> list[float]:
+        factory = APIRequestFactory()
+        view = UncachedBookViewSet.as_view({"get": "list"})
+        timings = []
+        for term in terms:
+            for _ in range(repeat):
+                request = factory.get(
+                    "/api/books/", {"search": term}, SERVER_NAME="localhost"
+                )
+                started = time.perf_counter()
+                response = view(request)
+                response.render()
+                timings.append((time.perf_counter() - started) * 1000)
+            if self.verbosity > 1:
+                self.stdout.write(
+                    f"  {term!r}: {len(response.data['results'])} results, "
+                    f"{statistics.median(timings[-repeat:]):.1f} ms"
+                )
+        return timings
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.10 on 2026-10-18 18:56
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+COLLECT_WORDS = """
+    INSERT INTO books_searchword (word)
+    SELECT DISTINCT lexeme
+    FROM books_book,
+        unnest(to_tsvector('simple', title || ' ' || author))
+    WHERE lexeme ~ '^[[:alpha:]]+$'
+"""
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0005_book_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchWord",
+            fields=[
+                (
+                    "word",
+                    models.CharField(
+                        max_length=255, primary_key=True, serialize=False
+                    ),
+                ),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name="book",
+            name="book_title_trgm_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="book",
+            name="book_author_trgm_idx",
+        ),
+        migrations.AddIndex(
+            model_name="searchword",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fastupdate=False,
+                fields=["word"],
+                name="search_word_trgm_idx",
+                opclasses=("gin_trgm_ops",),
+            ),
+        ),
+        migrations.RunSQL(COLLECT_WORDS, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Plan scans of books without parallel workers; see
+    `books.filters.BookSearchFilter`.
+    """
+
+    dependencies = [
+        ("books", "0006_search_words"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "ALTER TABLE books_book SET (parallel_workers = 0)",
+            "ALTER TABLE books_book RESET (parallel_workers)",
+        ),
+    ]
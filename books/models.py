@@ -1,3 +1,5 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 
 
@@ -11,9 +13,50 @@ class Book(models.Model):
     cover = models.CharField(max_length=30, choices=CoverChoices.choices)
     inventory = models.PositiveIntegerField()
     daily_fee = models.DecimalField(max_digits=10, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True)
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("title", weight="A", config="english")
+            + SearchVector("author", weight="B", config="english")
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     def __str__(self):
         return self.title
 
     class Meta:
         ordering = ("inventory", "title",)
+        # Catalogue writes are rare, so the GIN indexes skip the pending
+        # list that every search would otherwise have to scan.
+        indexes = (
+            GinIndex(
+                fields=("search_vector",),
+                fastupdate=False,
+                name="book_search_vector_idx",
+            ),
+        )
+
+
+class SearchWord(models.Model):
+    """
+    Every distinct word of the catalogue's titles and authors, kept by
+    `books.search`. Misspelled search terms are corrected against this
+    table: its trigram index holds one entry per word, not per book.
+    """
+
+    word = models.CharField(max_length=255, primary_key=True)
+
+    def __str__(self):
+        return self.word
+
+    class Meta:
+        indexes = (
+            GinIndex(
+                fields=("word",),
+                opclasses=("gin_trgm_ops",),
+                fastupdate=False,
+                name="search_word_trgm_idx",
+            ),
+        )
@@ -0,0 +1,5 @@
+from Library_Service_API.pagination import KeysetCursorPagination
+
+
+class BookPagination(KeysetCursorPagination):
+    ordering = ("title",)
@@ -0,0 +1,35 @@
+from typing import Iterable
+
+from django.db import connection, transaction
+
+from books.models import Book, SearchWord
+
+# Words as the 'simple' configuration splits and lowercases them,
+# without numbers and other tokens nobody misspells.
+INSERT_WORDS_SQL = f"""
+    INSERT INTO {SearchWord._meta.db_table} (word)
+    SELECT DISTINCT lexeme
+    FROM {Book._meta.db_table},
+        unnest(to_tsvector('simple', title || ' ' || author))
+    WHERE lexeme ~ '^[[:alpha:]]+$' {{condition}}
+    ON CONFLICT DO NOTHING
+"""
+
+
+def add_search_words(book_ids: Iterable[int]) -> None:
+    """Add the words of these books to `SearchWord`."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            INSERT_WORDS_SQL.format(condition="AND id = ANY(%s)"),
+            [list(book_ids)],
+        )
+
+
+def rebuild_search_words() -> None:
+    """
+    Collect the words of the whole catalogue again. Needed after bulk
+    writes, which send no signals, and drops words of changed books.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SearchWord._meta.db_table}")
+        cursor.execute(INSERT_WORDS_SQL.format(condition=""))
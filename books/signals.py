@@ -0,0 +1,18 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from books.cache import invalidate_catalogue
+from books.models import Book
+from books.search import add_search_words
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def invalidate_catalogue_on_change(sender, **kwargs) -> None:
+    transaction.on_commit(invalidate_catalogue)
+
+
+@receiver(post_save, sender=Book)
+def add_search_words_on_save(sender, instance: Book, **kwargs) -> None:
+    add_search_words([instance.pk])
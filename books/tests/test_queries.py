@@ -0,0 +1,75 @@
+from itertools import count
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from Library_Service_API.testing import ConstantQueriesMixin, query_budget
+from books.models import Book
+from users.models import User
+
+numbers = count()
+
+
+def create_books(rows: int) -> list[Book]:
+    return Book.objects.bulk_create(
+        Book(
+            title=f"Book {next(numbers)}",
+            author="Author",
+            cover=Book.CoverChoices.SOFT,
+            inventory=1,
+            daily_fee="1.00",
+        )
+        for _ in range(rows)
+    )
+
+
+class BookQueryCountTest(ConstantQueriesMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            email="admin@test.com", password="pass123"
+        )
+
+    def test_list(self):
+        self.assertConstantQueries(
+            create_books,
+            lambda: self.client.get(
+                reverse("books:book-list"), {"page_size": 100}
+            ),
+        )
+
+    def test_search(self):
+        self.assertConstantQueries(
+            create_books,
+            lambda: self.client.get(
+                reverse("books:book-list"),
+                {"search": "book", "page_size": 100},
+            ),
+        )
+
+    def test_async_list(self):
+        self.assertConstantQueries(
+            create_books,
+            lambda: self.client.get(
+                reverse("async-books:book-list"), {"page_size": 100}
+            ),
+        )
+
+    def test_admin_changelist(self):
+        self.client.force_login(self.admin)
+        self.assertConstantQueries(
+            create_books,
+            lambda: self.client.get(reverse("admin:books_book_changelist")),
+        )
+
+    def test_detail(self):
+        book = create_books(1)[0]
+        for url in (
+            reverse("books:book-detail", args=[book.pk]),
+            reverse("async-books:book-detail", args=[book.pk]),
+        ):
+            with query_budget(2):
+                self.client.get(url)
@@ -1,8 +1,13 @@
-from django.test import TestCase
+from base64 import b64encode
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from books.cache import CATALOGUE_VERSION_KEY
 from books.models import Book
 from users.models import User
 
@@ -58,3 +63,259 @@ class BookViewSetPermissionTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Book.objects.count(), 1)
         self.assertEqual(Book.objects.first().title, "Admin Book")
+
+
+class BookPaginationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        for title in ("Dune", "Anathem", "Solaris", "Bleak House"):
+            Book.objects.create(
+                title=title,
+                author="Author",
+                cover=Book.CoverChoices.SOFT,
+                inventory=1,
+                daily_fee="1.00"
+            )
+        self.list_url = reverse("books:book-list")
+
+    def test_list_is_paginated_by_title(self):
+        titles = []
+        url = self.list_url + "?page_size=3"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            titles += [book["title"] for book in response.data["results"]]
+            url = response.data["next"]
+
+        self.assertEqual(
+            titles, ["Anathem", "Bleak House", "Dune", "Solaris"]
+        )
+
+
+@override_settings(CACHES={
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+})
+class BookCatalogueCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            email="admin@test.com", password="pass123", is_staff=True
+        )
+        self.book = Book.objects.create(
+            title="Dune",
+            author="Frank Herbert",
+            cover=Book.CoverChoices.SOFT,
+            inventory=3,
+            daily_fee="1.00"
+        )
+        self.list_url = reverse("books:book-list")
+        self.detail_url = reverse("books:book-detail", args=[self.book.id])
+
+    def test_repeated_list_is_served_from_cache(self):
+        first = self.client.get(self.list_url)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.list_url)
+
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_query_params_are_cached_separately(self):
+        self.client.get(self.list_url)
+
+        with self.assertNumQueries(2):
+            self.client.get(self.list_url + "?page_size=1")
+
+    def test_matching_etag_returns_not_modified(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                self.detail_url, HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_book_update_invalidates_cache(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        self.client.force_authenticate(self.admin)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(self.detail_url, {"inventory": 7})
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["inventory"], 7)
+
+    def test_borrowing_invalidates_cache(self):
+        self.client.get(self.detail_url)
+        self.client.force_authenticate(self.admin)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("borrowings:borrowing-list-create"), {
+                "borrow_date": "2024-01-01",
+                "expected_return_date": "2024-01-02",
+                "book": self.book.title
+            })
+        response = self.client.get(self.detail_url)
+
+        self.assertEqual(response.data["inventory"], 2)
+
+    def test_evicted_version_does_not_revive_old_etags(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        self.client.force_authenticate(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(self.detail_url, {"inventory": 7})
+
+        cache.delete(CATALOGUE_VERSION_KEY)
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["inventory"], 7)
+
+    def test_if_modified_since_returns_not_modified(self):
+        last_modified = self.client.get(self.list_url)["Last-Modified"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                self.list_url, HTTP_IF_MODIFIED_SINCE=last_modified
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class BookSearchTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        for title, author in (
+            ("Dune", "Frank Herbert"),
+            ("Dune Messiah", "Frank Herbert"),
+            ("Solaris", "Stanislaw Lem"),
+            ("The Left Hand of Darkness", "Ursula K. Le Guin"),
+        ):
+            Book.objects.create(
+                title=title,
+                author=author,
+                cover=Book.CoverChoices.SOFT,
+                inventory=1,
+                daily_fee="1.00"
+            )
+        self.list_url = reverse("books:book-list")
+
+    def search(self, term: str) -> list[str]:
+        response = self.client.get(self.list_url, {"search": term})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [book["title"] for book in response.data["results"]]
+
+    def test_full_text_search_ranks_best_match_first(self):
+        self.assertEqual(self.search("dune"), ["Dune", "Dune Messiah"])
+
+    def test_search_by_author(self):
+        self.assertEqual(self.search("Lem"), ["Solaris"])
+
+    def test_search_tolerates_typos(self):
+        self.assertEqual(self.search("solarsi"), ["Solaris"])
+        self.assertEqual(
+            self.search("darknes"), ["The Left Hand of Darkness"]
+        )
+
+    def test_search_without_matches(self):
+        self.assertEqual(self.search("xylophone"), [])
+
+    def test_search_results_are_paginated_by_rank(self):
+        titles = []
+        url = self.list_url + "?search=frank+herbert&page_size=1"
+        while url:
+            response = self.client.get(url)
+            titles += [book["title"] for book in response.data["results"]]
+            url = response.data["next"]
+
+        self.assertEqual(sorted(titles), ["Dune", "Dune Messiah"])
+
+    def test_malformed_rank_position_returns_not_found(self):
+        cursor = b64encode(urlencode({"p": '["x",1]'}).encode()).decode()
+
+        response = self.client.get(
+            self.list_url, {"search": "dune", "cursor": cursor}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class AsyncBookViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.books = [
+            Book.objects.create(
+                title=title,
+                author="Frank Herbert",
+                cover=Book.CoverChoices.SOFT,
+                inventory=1,
+                daily_fee="1.25"
+            )
+            for title in ("Dune", "Dune Messiah", "Children of Dune")
+        ]
+        self.list_url = reverse("async-books:book-list")
+
+    def test_list_matches_sync_endpoint(self):
+        response = self.client.get(self.list_url)
+        expected = self.client.get(reverse("books:book-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(response.json(), expected.json())
+
+    def test_list_is_paginated(self):
+        titles = []
+        url = self.list_url + "?page_size=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            titles += [book["title"] for book in response.json()["results"]]
+            url = response.json()["next"]
+
+        self.assertEqual(titles, ["Children of Dune", "Dune", "Dune Messiah"])
+
+    def test_search(self):
+        response = self.client.get(self.list_url, {"search": "messiah"})
+
+        self.assertEqual(
+            [book["title"] for book in response.json()["results"]],
+            ["Dune Messiah"],
+        )
+
+    def test_detail_matches_sync_endpoint(self):
+        book = self.books[0]
+        response = self.client.get(
+            reverse("async-books:book-detail", args=[book.pk])
+        )
+        expected = self.client.get(
+            reverse("books:book-detail", args=[book.pk])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), expected.json())
+
+    def test_missing_book(self):
+        response = self.client.get(
+            reverse("async-books:book-detail", args=[10 ** 6])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(
+            response.json(), {"detail": "No Book matches the given query."}
+        )
+
+    def test_writes_are_not_allowed(self):
+        response = self.client.post(self.list_url, {"title": "New"})
+
+        self.assertEqual(
+            response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED
+        )
@@ -1,11 +1,16 @@
 from rest_framework import viewsets
 
+from books.cache import CatalogueCacheMixin
+from books.filters import BookSearchFilter
 from books.models import Book
+from books.pagination import BookPagination
 from books.permissions import IsAdminOrReadOnly
 from books.serializers import BookSerializer
 
 
-class BookViewSet(viewsets.ModelViewSet):
-    queryset = Book.objects.all()
+class BookViewSet(CatalogueCacheMixin, viewsets.ModelViewSet):
+    queryset = Book.objects.defer("search_vector")
     serializer_class = BookSerializer
     permission_classes = (IsAdminOrReadOnly,)
+    pagination_class = BookPagination
+    filter_backends = (BookSearchFilter,)
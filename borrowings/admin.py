@@ -1,5 +1,19 @@
 from django.contrib import admin
 
-from borrowings.models import Borrowing
+from borrowings.models import Borrowing, DailyBookStats, Hold
 
-admin.site.register(Borrowing)
+
+@admin.register(Borrowing)
+class BorrowingAdmin(admin.ModelAdmin):
+    # `Borrowing.__str__` shows the book title.
+    list_select_related = ("book",)
+
+
+@admin.register(Hold)
+class HoldAdmin(admin.ModelAdmin):
+    list_display = ("book", "user", "status", "created_at", "ready_until")
+    list_filter = ("status",)
+    list_select_related = ("book", "user")
+
+
+admin.site.register(DailyBookStats)
@@ -0,0 +1,17 @@
+from django.urls import path
+
+from borrowings.async_views import (
+    AsyncBorrowingDetailView,
+    AsyncBorrowingListView,
+)
+
+app_name = "async-borrowings"
+
+urlpatterns = [
+    path("", AsyncBorrowingListView.as_view(), name="borrowing-list"),
+    path(
+        "<int:pk>/",
+        AsyncBorrowingDetailView.as_view(),
+        name="borrowing-detail"
+    ),
+]
@@ -0,0 +1,48 @@
+from django.http import Http404
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+
+from Library_Service_API.async_views import AsyncReadOnlyAPIView
+from borrowings.models import Borrowing
+from borrowings.pagination import BorrowingPagination
+from borrowings.permissions import AsyncIsBorrower
+from borrowings.serializers import (
+    BorrowingDetailSerializer,
+    BorrowingListValuesSerializer,
+)
+from borrowings.views import BorrowingDetailView, BorrowingListCreateView
+
+
+class AsyncBorrowingListView(AsyncReadOnlyAPIView):
+    """
+    Async twin of the `BorrowingListCreateView` list. The queryset,
+    filters and `values()` projection come from the sync view.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    pagination_class = BorrowingPagination
+
+    async def get_data(self, request: Request, *args, **kwargs) -> dict:
+        view = BorrowingListCreateView(request=request, format_kwarg=None)
+        queryset = view.filter_queryset(view.get_queryset())
+
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(queryset, request, self)
+        data = BorrowingListValuesSerializer(page, many=True).data
+        return paginator.get_paginated_response(data).data
+
+
+class AsyncBorrowingDetailView(AsyncReadOnlyAPIView):
+    """Async twin of `BorrowingDetailView`."""
+
+    permission_classes = (AsyncIsBorrower,)
+
+    async def get_data(
+        self, request: Request, pk: int, *args, **kwargs
+    ) -> dict:
+        try:
+            borrowing = await BorrowingDetailView.queryset.aget(pk=pk)
+        except Borrowing.DoesNotExist:
+            raise Http404("No Borrowing matches the given query.")
+        await self.check_object_permissions(request, borrowing)
+        return BorrowingDetailSerializer(borrowing).data
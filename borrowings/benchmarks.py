@@ -0,0 +1,132 @@
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, NamedTuple
+
+import django
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Bump when the layout of the results changes.
+SCHEMA_VERSION = 1
+
+
+class Scenario(NamedTuple):
+    """
+    One timed flow. `prepare` runs untimed before every iteration and
+    its return value is passed to `run`, e.g. a borrowing to return.
+    """
+
+    name: str
+    run: Callable[[Any], Any]
+    prepare: Callable[[], Any] = lambda: None
+    iterations: int | None = None
+
+
+def measure(
+    scenario: Scenario,
+    iterations: int,
+    warmup: int,
+    memory_samples: int,
+) -> dict:
+    """
+    Time `scenario` and count its queries per iteration, then trace
+    the peak Python memory of a few more iterations separately, so
+    tracing does not slow down the timed ones.
+    """
+    iterations = scenario.iterations or iterations
+    for _ in range(warmup):
+        scenario.run(scenario.prepare())
+
+    timings = []
+    queries = []
+    for _ in range(iterations):
+        argument = scenario.prepare()
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            scenario.run(argument)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(len(context))
+
+    peaks = []
+    for _ in range(memory_samples):
+        argument = scenario.prepare()
+        tracemalloc.start()
+        try:
+            scenario.run(argument)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+
+    return summarize(timings, queries, peaks)
+
+
+def summarize(
+    timings: list[float], queries: list[int], peaks: list[int]
+) -> dict:
+    if len(timings) > 1:
+        quantiles = statistics.quantiles(timings, n=100, method="inclusive")
+    else:
+        quantiles = timings * 99
+    return {
+        "iterations": len(timings),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "p50_ms": round(quantiles[49], 3),
+        "p95_ms": round(quantiles[94], 3),
+        "p99_ms": round(quantiles[98], 3),
+        "queries_per_request": round(statistics.fmean(queries), 2),
+        "max_queries": max(queries),
+        "peak_memory_kib": round(max(peaks) / 1024, 1) if peaks else None,
+    }
+
+
+def _git(*args: str) -> str | None:
+    try:
+        return subprocess.run(
+            ("git", *args),
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def describe_environment() -> dict:
+    """Where the numbers come from, to tell comparable runs apart."""
+    status = _git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(status) if status is not None else None,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": "{} {}".format(
+            connection.vendor,
+            ".".join(str(part) for part in connection.get_database_version()),
+        ),
+        "cpus": os.cpu_count(),
+    }
+
+
+def max_rss_kib() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def compare(results: dict, baseline: dict, metric: str = "p95_ms") -> dict:
+    """Relative change of `metric` per scenario present in both runs."""
+    return {
+        name: (
+            result[metric] / baseline["results"][name][metric] - 1
+            if baseline["results"][name][metric] else None
+        )
+        for name, result in results["results"].items()
+        if name in baseline.get("results", {})
+    }
@@ -1,6 +1,12 @@
 import os
+import time
 
-from celery import Celery
+from celery import Celery, signals
+from django.conf import settings
+from django.db import close_old_connections
+from prometheus_client import start_http_server
+
+from Library_Service_API.metrics import get_registry, observe_task
 
 
 os.environ.setdefault(
@@ -15,3 +21,47 @@ app.config_from_object(
 )
 
 app.autodiscover_tasks()
+
+
+@signals.task_prerun.connect
+@signals.task_postrun.connect
+def close_obsolete_connections(sender=None, **kwargs) -> None:
+    """
+    Treat every task like a web request: drop connections that are
+    older than CONN_MAX_AGE or fail the health check, reuse the rest.
+    Eager tasks run inside the caller's transaction and are left alone.
+    """
+    if sender is not None and getattr(sender.request, "is_eager", False):
+        return
+    close_old_connections()
+
+
+_task_started: dict[str, float] = {}
+
+
+@signals.task_prerun.connect
+def start_task_timer(task_id=None, **kwargs) -> None:
+    _task_started[task_id] = time.perf_counter()
+
+
+@signals.task_postrun.connect
+def observe_task_duration(
+    task_id=None, task=None, state=None, **kwargs
+) -> None:
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        observe_task(
+            task.name, state or "UNKNOWN", time.perf_counter() - started
+        )
+
+
+@signals.worker_ready.connect
+def start_metrics_server(**kwargs) -> None:
+    """
+    Serve the task metrics on PROMETHEUS_WORKER_PORT. Prefork children
+    only show up with PROMETHEUS_MULTIPROC_DIR set.
+    """
+    if settings.PROMETHEUS_WORKER_PORT:
+        start_http_server(
+            settings.PROMETHEUS_WORKER_PORT, registry=get_registry()
+        )
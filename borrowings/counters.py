@@ -0,0 +1,159 @@
+from collections import Counter
+from datetime import date
+from typing import Iterable, Iterator
+
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    IntegerField,
+    OuterRef,
+    QuerySet,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Greatest
+
+from borrowings.models import Borrowing
+from users.models import User
+
+
+def _overdue_delta(expected_return_dates: Counter):
+    """How many of the loans the user's overdue count includes."""
+    return sum(
+        (
+            Case(
+                When(overdue_checked_on__gte=expected, then=Value(count)),
+                default=Value(0),
+            )
+            for expected, count in expected_return_dates.items()
+        ),
+        Value(0),
+    )
+
+
+def count_loans(user_id: int, expected_return_dates: Iterable[date]) -> None:
+    """
+    Add new loans to a user's counters in one UPDATE.
+
+    Call inside the transaction that creates the borrowings, so the
+    counters commit or roll back together with them.
+    """
+    due = Counter(expected_return_dates)
+    total = sum(due.values())
+    if not total:
+        return
+
+    User.objects.filter(pk=user_id).update(
+        active_loans=F("active_loans") + total,
+        overdue_loans=F("overdue_loans") + _overdue_delta(due),
+        lifetime_loans=F("lifetime_loans") + total,
+    )
+
+
+def uncount_loans(returned: dict[int, Iterable[date]]) -> None:
+    """
+    Remove returned loans, `{user_id: expected_return_dates}`, from the
+    users' active and overdue counters in one grouped UPDATE.
+
+    Borrowings created outside the API (admin, fixtures) were never
+    counted, so the counters stop at zero instead of failing the return;
+    `reconcile_loan_counters` repairs such drift.
+    """
+    dues = {user_id: Counter(dates) for user_id, dates in returned.items()}
+    dues = {user_id: due for user_id, due in dues.items() if due}
+    if not dues:
+        return
+
+    def per_user(delta) -> Case:
+        return Case(
+            *(
+                When(pk=user_id, then=delta(due))
+                for user_id, due in dues.items()
+            ),
+            default=Value(0),
+        )
+
+    User.objects.filter(pk__in=dues).update(
+        active_loans=Greatest(
+            F("active_loans") - per_user(
+                lambda due: Value(sum(due.values()))
+            ),
+            Value(0),
+        ),
+        overdue_loans=Greatest(
+            F("overdue_loans") - per_user(_overdue_delta), Value(0)
+        ),
+    )
+
+
+def _count_subquery(**filters) -> Coalesce:
+    return Coalesce(
+        Subquery(
+            Borrowing.objects
+            .filter(user=OuterRef("pk"), **filters)
+            .order_by()
+            .values("user")
+            .annotate(count=Count("pk"))
+            .values("count"),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def iter_user_batches(
+    users: QuerySet[User], batch_size: int
+) -> Iterator[QuerySet[User]]:
+    """Walk the users in pk order, `batch_size` at a time."""
+    last_pk = 0
+    while True:
+        pks = list(
+            users
+            .filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not pks:
+            return
+        yield User.objects.filter(pk__in=pks)
+        last_pk = pks[-1]
+
+
+def _locked_update(users: QuerySet[User], **updates) -> int:
+    # Borrow and return paths update the same rows, so holding the row
+    # locks first keeps them from committing between count and write.
+    with transaction.atomic():
+        pks = list(
+            users
+            .select_for_update()
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        return User.objects.filter(pk__in=pks).update(**updates)
+
+
+def refresh_overdue_loans(users: QuerySet[User], today: date) -> int:
+    """Recount the users' overdue loans as of `today`."""
+    return _locked_update(
+        users,
+        overdue_loans=_count_subquery(
+            actual_return_date=None, expected_return_date__lte=today
+        ),
+        overdue_checked_on=today,
+    )
+
+
+def reconcile_loan_counters(users: QuerySet[User], today: date) -> int:
+    """Recompute every loan counter of the users from their borrowings."""
+    return _locked_update(
+        users,
+        active_loans=_count_subquery(actual_return_date=None),
+        overdue_loans=_count_subquery(
+            actual_return_date=None, expected_return_date__lte=today
+        ),
+        lifetime_loans=_count_subquery(),
+        overdue_checked_on=today,
+    )
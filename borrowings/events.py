@@ -0,0 +1,41 @@
+from typing import Iterable
+
+from Library_Service_API.events import Event, publish
+from borrowings.models import Borrowing, Hold
+
+
+def publish_inventory(changes: dict[int, int]) -> None:
+    """`{book_id: delta}` inventory changes, visible to everyone."""
+    publish(*(
+        Event("inventory", {"book": book_id, "change": delta})
+        for book_id, delta in changes.items()
+        if delta
+    ))
+
+
+def publish_borrowings(type: str, borrowings: Iterable[Borrowing]) -> None:
+    """`borrowing.<type>` events for the borrowers."""
+    publish(*(
+        Event(
+            f"borrowing.{type}",
+            {"id": borrowing.pk, "book": borrowing.book_id},
+            borrowing.user_id,
+        )
+        for borrowing in borrowings
+    ))
+
+
+def publish_holds_ready(holds: Iterable[Hold]) -> None:
+    """Tell holders a copy is set aside for them."""
+    publish(*(
+        Event(
+            "hold.ready",
+            {
+                "id": hold.pk,
+                "book": hold.book_id,
+                "ready_until": hold.ready_until.isoformat(),
+            },
+            hold.user_id,
+        )
+        for hold in holds
+    ))
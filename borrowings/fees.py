@@ -0,0 +1,112 @@
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db.models import (
+    DateField,
+    DecimalField,
+    F,
+    Func,
+    IntegerField,
+    QuerySet,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Cast, Coalesce, Greatest
+from django.utils import timezone
+
+CENT = Decimal("0.01")
+
+MONEY_FIELD = DecimalField(max_digits=12, decimal_places=2)
+
+
+class BorrowingFee(NamedTuple):
+    base_fee: Decimal
+    overdue_days: int
+    overdue_fee: Decimal
+
+    @property
+    def total_fee(self) -> Decimal:
+        return self.base_fee + self.overdue_fee
+
+
+class DaysBetween(Func):
+    """Whole days from `start` to `end`; Postgres `date - date`."""
+
+    arg_joiner = " - "
+    template = "(%(expressions)s)"
+    output_field = IntegerField()
+
+    def __init__(self, end, start, **extra) -> None:
+        super().__init__(end, start, **extra)
+
+
+def _money(value: Decimal) -> Decimal:
+    return value.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def calculate_fee(borrowing, today: date = None) -> BorrowingFee:
+    """
+    Fee for one borrowing: the daily fee for every planned day plus
+    the daily fee times `BORROWING_FINE_MULTIPLIER` for every day past
+    the expected return date, counted up to the return or `today`.
+    """
+    today = today or timezone.now().date()
+    daily_fee = borrowing.book.daily_fee
+    end = borrowing.actual_return_date or today
+
+    base_days = max(
+        (borrowing.expected_return_date - borrowing.borrow_date).days, 0
+    )
+    overdue_days = max((end - borrowing.expected_return_date).days, 0)
+
+    return BorrowingFee(
+        base_fee=_money(daily_fee * base_days),
+        overdue_days=overdue_days,
+        overdue_fee=_money(
+            daily_fee * overdue_days * settings.BORROWING_FINE_MULTIPLIER
+        ),
+    )
+
+
+def annotate_fees(queryset: QuerySet, today: date = None) -> QuerySet:
+    """
+    Annotate `base_fee`, `overdue_days`, `overdue_fee` and `total_fee`
+    computed in SQL, matching `calculate_fee` row for row.
+    """
+    today = today or timezone.now().date()
+    end = Coalesce(
+        F("actual_return_date"), Value(today, output_field=DateField())
+    )
+
+    base_days = Greatest(
+        DaysBetween(F("expected_return_date"), F("borrow_date")), Value(0)
+    )
+    overdue_days = Greatest(
+        DaysBetween(end, F("expected_return_date")), Value(0)
+    )
+    multiplier = Value(
+        settings.BORROWING_FINE_MULTIPLIER, output_field=MONEY_FIELD
+    )
+
+    return queryset.annotate(
+        base_fee=Cast(F("book__daily_fee") * base_days, MONEY_FIELD),
+        overdue_days=overdue_days,
+        overdue_fee=Cast(
+            F("book__daily_fee") * F("overdue_days") * multiplier,
+            MONEY_FIELD,
+        ),
+        total_fee=F("base_fee") + F("overdue_fee"),
+    )
+
+
+def summarize_fees(queryset: QuerySet, today: date = None) -> dict:
+    """Total fees of a whole queryset in a single aggregate query."""
+    names = ("base_fee", "overdue_fee", "total_fee")
+    totals = annotate_fees(queryset, today).aggregate(
+        **{f"sum_{name}": Sum(name) for name in names}
+    )
+    return {
+        name: totals[f"sum_{name}"] or _money(Decimal(0)) for name in names
+    }
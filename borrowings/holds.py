@@ -0,0 +1,167 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from books.models import Book
+from borrowings.events import publish_holds_ready
+from borrowings.inventory import adjust_inventories
+from borrowings.models import Hold
+
+
+def lock_books(book_ids) -> None:
+    """
+    Lock the books' rows. Changes to a book's queue, other than a
+    holder claiming their copy, happen under this lock, so a copy
+    coming back and a hold being placed or cancelled cannot miss each
+    other.
+    """
+    list(
+        Book.objects
+        .select_for_update()
+        .filter(pk__in=book_ids)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+
+def shelve_copies(copies: dict[int, int]) -> list[Hold]:
+    """
+    Put `{book_id: count}` returned copies back: each copy goes to the
+    oldest waiting hold of its book, the rest to the inventory.
+
+    The queue heads of every book are read in one query over the
+    partial queue index, so a return costs the same however long the
+    queues are. Call inside the transaction that frees the copies.
+    Returns the holds that became ready.
+    """
+    copies = {book_id: count for book_id, count in copies.items() if count}
+    if not copies:
+        return []
+
+    lock_books(copies)
+    heads = (
+        Hold.objects
+        .filter(book_id__in=copies, status=Hold.Status.WAITING)
+        .annotate(
+            position=Window(
+                RowNumber(),
+                partition_by=F("book_id"),
+                order_by=(F("created_at").asc(), F("id").asc()),
+            )
+        )
+        .filter(position__lte=max(copies.values()))
+        .only("id", "book_id", "user_id")
+    )
+    ready = [
+        hold for hold in heads if hold.position <= copies[hold.book_id]
+    ]
+
+    if ready:
+        ready_until = timezone.now() + timedelta(
+            hours=settings.HOLD_CLAIM_HOURS
+        )
+        Hold.objects.filter(pk__in=[hold.pk for hold in ready]).update(
+            status=Hold.Status.READY, ready_until=ready_until
+        )
+        for hold in ready:
+            hold.status = Hold.Status.READY
+            hold.ready_until = ready_until
+        publish_holds_ready(ready)
+
+    allocated = Counter(hold.book_id for hold in ready)
+    adjust_inventories(
+        {
+            book_id: count - allocated[book_id]
+            for book_id, count in copies.items()
+        }
+    )
+    return ready
+
+
+def claim_hold(book_id: int, user_id: int) -> bool:
+    """Hand the copy set aside for the user over to their borrowing."""
+    return bool(
+        Hold.objects
+        .filter(book_id=book_id, user_id=user_id, status=Hold.Status.READY)
+        .update(status=Hold.Status.FULFILLED)
+    )
+
+
+def claim_holds(book_ids, user_id: int) -> Counter:
+    """
+    `claim_hold` for many books in one UPDATE. Call with the books
+    locked, like the bulk borrowing does, so a claim cannot race an
+    expiry passing the copy on. Returns `{book_id: count}` of copies
+    handed over.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {Hold._meta.db_table} SET status = %s "
+            "WHERE user_id = %s AND status = %s AND book_id = ANY(%s) "
+            "RETURNING book_id",
+            [
+                Hold.Status.FULFILLED,
+                user_id,
+                Hold.Status.READY,
+                list(book_ids),
+            ],
+        )
+        return Counter(book_id for book_id, in cursor.fetchall())
+
+
+def cancel_hold(hold: Hold) -> bool:
+    """Leave the queue, passing a copy set aside on to the next holder."""
+    with transaction.atomic():
+        lock_books([hold.book_id])
+        status = (
+            Hold.objects
+            .select_for_update()
+            .filter(pk=hold.pk, status__in=Hold.OPEN)
+            .values_list("status", flat=True)
+            .first()
+        )
+        if status is None:
+            return False
+        Hold.objects.filter(pk=hold.pk).update(status=Hold.Status.CANCELLED)
+        if status == Hold.Status.READY:
+            shelve_copies({hold.book_id: 1})
+    return True
+
+
+def expire_ready_holds(now: datetime, batch_size: int) -> int:
+    """
+    Expire up to `batch_size` holds whose copy was not borrowed in
+    time and shelve the copies again. Returns the number expired.
+    """
+    candidates = list(
+        Hold.objects
+        .filter(status=Hold.Status.READY, ready_until__lt=now)
+        .order_by("ready_until")
+        .values_list("id", "book_id")[:batch_size]
+    )
+    if not candidates:
+        return 0
+
+    with transaction.atomic():
+        # Books first, like every other queue change, then recheck the
+        # holds in case they were borrowed or cancelled meanwhile.
+        lock_books({book_id for _, book_id in candidates})
+        expired = list(
+            Hold.objects
+            .select_for_update()
+            .filter(
+                pk__in=[pk for pk, _ in candidates],
+                status=Hold.Status.READY,
+            )
+            .values_list("id", "book_id")
+        )
+        Hold.objects.filter(pk__in=[pk for pk, _ in expired]).update(
+            status=Hold.Status.EXPIRED
+        )
+        shelve_copies(Counter(book_id for _, book_id in expired))
+    return len(expired)
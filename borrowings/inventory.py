@@ -0,0 +1,32 @@
+from django.db import transaction
+from django.db.models import Case, F, PositiveIntegerField, When
+from django.utils import timezone
+
+from books.cache import invalidate_catalogue
+from books.models import Book
+from borrowings.events import publish_inventory
+
+
+def adjust_inventories(changes: dict[int, int]) -> None:
+    """
+    Apply `{book_id: delta}` inventory changes with one grouped UPDATE.
+
+    Callers must hold row locks on the books (or otherwise know the
+    deltas are safe), since the statement itself does not guard stock.
+    """
+    changes = {book_id: delta for book_id, delta in changes.items() if delta}
+    if not changes:
+        return
+
+    Book.objects.filter(pk__in=changes).update(
+        inventory=Case(
+            *(
+                When(pk=book_id, then=F("inventory") + delta)
+                for book_id, delta in changes.items()
+            ),
+            output_field=PositiveIntegerField(),
+        ),
+        updated_at=timezone.now(),
+    )
+    transaction.on_commit(invalidate_catalogue)
+    publish_inventory(changes)
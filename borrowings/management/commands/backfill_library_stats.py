@@ -0,0 +1,47 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+from django.utils import timezone
+
+from borrowings.models import Borrowing
+from borrowings.stats import aggregate_day, iter_days
+
+
+class Command(BaseCommand):
+    """
+    Django command to aggregate past days into the daily book stats,
+    which the nightly task only keeps up to date for recent days.
+    """
+
+    help = (
+        "Recount daily book stats for a date range, by default from the "
+        "first borrowing until yesterday."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--since", type=date.fromisoformat)
+        parser.add_argument("--until", type=date.fromisoformat)
+
+    def handle(self, *args, **options) -> None:
+        until = options["until"] or (
+            timezone.now().date() - timedelta(days=1)
+        )
+        since = options["since"] or Borrowing.objects.aggregate(
+            first=Min("borrow_date")
+        )["first"]
+        if since is None:
+            self.stdout.write("There are no borrowings to aggregate")
+            return
+        if since > until:
+            raise CommandError("--since must not be after --until")
+
+        rows = 0
+        for day in iter_days(since, until):
+            rows += aggregate_day(day)
+            if day.day == 1:
+                self.stdout.write(f"Aggregated up to {day}...")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Aggregated {since} to {until} into {rows} stats rows"
+        ))
@@ -0,0 +1,206 @@
+import os
+import socket
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from books.models import Book
+from borrowings.management.commands.benchmark_serving import (
+    Command as ServingCommand,
+    RunningServer,
+    get_free_port,
+)
+from borrowings.models import Borrowing
+from users.models import User
+
+# (worker class, path prefix) of every compared setup.
+SETUPS = {
+    "wsgi sync": ("wsgi", "/api/v1/borrowings/"),
+    "asgi sync": ("asgi", "/api/v1/borrowings/"),
+    "asgi async": ("asgi", "/api/v1/async/borrowings/"),
+}
+
+
+class Command(BaseCommand):
+    """
+    Django command to compare the sync and async borrowing endpoints
+    in one server process while slow clients hold connections open.
+
+    Slow clients trickle their request a few bytes at a time, as mobile
+    clients on bad networks do. A threaded WSGI worker parks one of its
+    threads on every such connection; the event loop of an ASGI worker
+    does not. The fast clients measure what throughput is left.
+    """
+
+    help = (
+        "Serve the sync and async borrowing endpoints from a single "
+        "gunicorn worker and measure req/s and latency of fast clients "
+        "alongside slow ones."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--setups",
+            nargs="+",
+            choices=SETUPS,
+            default=list(SETUPS),
+        )
+        parser.add_argument("--seconds", type=float, default=10)
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument("--slow-clients", type=int, default=32)
+        parser.add_argument(
+            "--slow-interval",
+            type=float,
+            default=0.05,
+            help="Seconds between the chunks a slow client sends.",
+        )
+        parser.add_argument("--borrowings", type=int, default=50)
+
+    def handle(self, *args, **options) -> None:
+        prefix = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(
+            email=f"benchmark-{prefix}@example.com"
+        )
+        book = Book.objects.create(
+            title=f"Benchmark book {prefix}",
+            author="Benchmark",
+            cover=Book.CoverChoices.SOFT,
+            inventory=0,
+            daily_fee="1.00",
+        )
+        today = timezone.now().date()
+        borrowings = Borrowing.objects.bulk_create(
+            Borrowing(
+                user=user,
+                book=book,
+                borrow_date=today - timezone.timedelta(days=number),
+                expected_return_date=today + timezone.timedelta(days=7),
+            )
+            for number in range(options["borrowings"])
+        )
+        headers = {
+            settings.SIMPLE_JWT["AUTH_HEADER_NAME"][5:].replace("_", "-"):
+                f"Bearer {AccessToken.for_user(user)}",
+        }
+
+        self.stdout.write(
+            f"1 worker, {options['concurrency']} fast and "
+            f"{options['slow_clients']} slow clients, "
+            f"{options['seconds']} s per endpoint, {os.cpu_count()} CPUs"
+        )
+        try:
+            for setup in options["setups"]:
+                interface, path = SETUPS[setup]
+                with self.serve(interface) as port:
+                    for name, endpoint in (
+                        ("list", path),
+                        ("detail", f"{path}{borrowings[0].pk}/"),
+                    ):
+                        with SlowClients(
+                            port,
+                            endpoint,
+                            headers,
+                            options["slow_clients"],
+                            options["slow_interval"],
+                        ) as slow:
+                            result = ServingCommand.load(
+                                port, headers, "GET", endpoint, [None], 200,
+                                options,
+                            )
+                        self.stdout.write(
+                            f"{setup:>10} {name:>6}: "
+                            f"{result['throughput']:7.1f} req/s, "
+                            f"p50 {result['p50']:6.1f} ms, "
+                            f"p99 {result['p99']:6.1f} ms, "
+                            f"{result['errors']} errors, "
+                            f"{slow.completed} slow requests served"
+                        )
+        finally:
+            Borrowing.objects.filter(user=user).delete()
+            user.delete()
+            book.delete()
+
+    @staticmethod
+    def serve(interface: str) -> RunningServer:
+        port = get_free_port()
+        module = "asgi" if interface == "asgi" else "wsgi"
+        return RunningServer(
+            [
+                "gunicorn",
+                f"Library_Service_API.{module}",
+                "--bind",
+                f"127.0.0.1:{port}",
+            ],
+            {
+                **os.environ,
+                "DJANGO_ENV": "production",
+                "GUNICORN_WORKER_CLASS": interface,
+                "WEB_CONCURRENCY": "1",
+            },
+            port,
+        )
+
+
+class SlowClients:
+    """Context manager running clients that trickle their requests."""
+
+    chunk_size = 8
+
+    def __init__(
+        self,
+        port: int,
+        path: str,
+        headers: dict,
+        count: int,
+        interval: float,
+    ) -> None:
+        self.port = port
+        self.request = (
+            f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+            + "".join(
+                f"{name}: {value}\r\n" for name, value in headers.items()
+            )
+            + "\r\n"
+        ).encode()
+        self.count = count
+        self.interval = interval
+        self.completed = 0
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+
+    def __enter__(self) -> "SlowClients":
+        self.threads = [
+            threading.Thread(target=self.client, daemon=True)
+            for _ in range(self.count)
+        ]
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def client(self) -> None:
+        while not self.stopped.is_set():
+            try:
+                with socket.create_connection(
+                    ("127.0.0.1", self.port), timeout=30
+                ) as sock:
+                    for start in range(0, len(self.request), self.chunk_size):
+                        if self.stopped.wait(self.interval):
+                            return
+                        sock.sendall(
+                            self.request[start:start + self.chunk_size]
+                        )
+                    if sock.recv(65536).startswith(b"HTTP/1.1 200"):
+                        with self.lock:
+                            self.completed += 1
+            except OSError:
+                time.sleep(self.interval)
+
+    def __exit__(self, *exc_info) -> None:
+        self.stopped.set()
+        for thread in self.threads:
+            thread.join()
@@ -0,0 +1,86 @@
+import statistics
+import time
+from typing import Callable
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from borrowings.models import Borrowing
+from borrowings.seeding import seed_library
+from borrowings.serializers import (
+    BorrowingListSerializer,
+    BorrowingListValuesSerializer,
+)
+
+
+class Command(BaseCommand):
+    """
+    Django command to compare rendering the borrowing list through
+    `BorrowingListSerializer` and `BorrowingListValuesSerializer`.
+    """
+
+    help = (
+        "Seed borrowings inside a rolled back transaction and time "
+        "querying, serializing and rendering them with both serializers."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--rows", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--min-speedup",
+            type=float,
+            default=3.0,
+            help="Fail if the values() path is not this many times faster.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        rows = options["rows"]
+        with transaction.atomic():
+            self.stdout.write(f"Seeding {rows} borrowings...")
+            seed_library(users=100, books=1_000, borrowings=rows)
+            queryset = Borrowing.objects.select_related(
+                "user", "book"
+            ).order_by("-borrow_date", "id")[:rows]
+
+            def render_models() -> bytes:
+                return JSONRenderer().render(
+                    BorrowingListSerializer(queryset.all(), many=True).data
+                )
+
+            def render_values() -> bytes:
+                return JSONRenderer().render(
+                    BorrowingListValuesSerializer(
+                        BorrowingListValuesSerializer.project(queryset.all()),
+                        many=True,
+                    ).data
+                )
+
+            if render_models() != render_values():
+                raise CommandError("The serializers render different JSON")
+
+            models_ms = self.measure(render_models, options["repeat"])
+            values_ms = self.measure(render_values, options["repeat"])
+            transaction.set_rollback(True)
+
+        speedup = models_ms / values_ms
+        self.stdout.write(
+            f"{rows} rows: model serializer {models_ms:.1f} ms, "
+            f"values() serializer {values_ms:.1f} ms, {speedup:.1f}x faster"
+        )
+        if speedup < options["min_speedup"]:
+            raise CommandError(
+                f"Speedup {speedup:.1f}x is below {options['min_speedup']}x"
+            )
+        self.stdout.write(self.style.SUCCESS("The values() path is faster"))
+
+    @staticmethod
+    def measure(render: Callable[[], bytes], repeat: int) -> float:
+        """Median wall time of `render` in milliseconds."""
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            render()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
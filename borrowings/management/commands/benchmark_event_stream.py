@@ -0,0 +1,189 @@
+import asyncio
+import http.client
+import json
+import os
+import statistics
+import time
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from Library_Service_API.streaming import EVENTS_PATH
+from books.models import Book
+from borrowings.management.commands.benchmark_serving import (
+    RunningServer,
+    get_free_port,
+)
+from borrowings.models import Borrowing
+from users.models import User
+
+BROKERS = {
+    "memory": "Library_Service_API.events.InProcessEventBroker",
+    "redis": "Library_Service_API.events.RedisEventBroker",
+}
+
+
+def rss_kib(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    raise CommandError("VmRSS is not available")
+
+
+class Command(BaseCommand):
+    """
+    Django command to measure what idle event streams cost one ASGI
+    process and how fast a change reaches all of them.
+    """
+
+    help = (
+        "Open many idle event streams against one uvicorn process, then "
+        "borrow books and time the inventory events reaching every stream."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--streams", type=int, default=2000)
+        parser.add_argument("--events", type=int, default=20)
+        parser.add_argument(
+            "--broker",
+            choices=BROKERS,
+            default="memory",
+            help="redis needs EVENTS_REDIS_URL to point at a server.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        prefix = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(
+            email=f"benchmark-{prefix}@example.com"
+        )
+        book = Book.objects.create(
+            title=f"Benchmark book {prefix}",
+            author="Benchmark",
+            cover=Book.CoverChoices.SOFT,
+            inventory=options["events"],
+            daily_fee="1.00",
+        )
+        header = settings.SIMPLE_JWT["AUTH_HEADER_NAME"][5:].replace("_", "-")
+        self.headers = {header: f"Bearer {AccessToken.for_user(user)}"}
+        self.book = book
+
+        port = get_free_port()
+        server = RunningServer(
+            [
+                "uvicorn",
+                "Library_Service_API.asgi:application",
+                "--port",
+                str(port),
+                "--log-level",
+                "warning",
+            ],
+            {**os.environ, "EVENTS_BROKER": BROKERS[options["broker"]]},
+            port,
+        )
+        try:
+            with server:
+                result = asyncio.run(self.measure(server, port, options))
+        finally:
+            Borrowing.objects.filter(user=user).delete()
+            user.delete()
+            book.delete()
+
+        per_stream = (
+            (result["rss_streams"] - result["rss_idle"]) / options["streams"]
+        )
+        self.stdout.write(
+            f"{options['streams']} streams, {options['broker']} broker: "
+            f"RSS {result['rss_idle']} -> {result['rss_streams']} KiB "
+            f"({per_stream:.1f} KiB per stream), "
+            f"opened in {result['connect_s']:.2f} s"
+        )
+        latencies = result["latencies"]
+        quantiles = statistics.quantiles(latencies, n=100)
+        self.stdout.write(
+            f"{options['events']} events to every stream: "
+            f"p50 {quantiles[49]:.1f} ms, p99 {quantiles[98]:.1f} ms, "
+            f"max {max(latencies):.1f} ms after the borrow returned"
+        )
+
+    async def measure(
+        self, server: RunningServer, port: int, options: dict
+    ) -> dict:
+        rss_idle = rss_kib(server.process.pid)
+        started = time.perf_counter()
+        streams = await asyncio.gather(*(
+            self.open_stream(port) for _ in range(options["streams"])
+        ))
+        connect_s = time.perf_counter() - started
+        rss_streams = rss_kib(server.process.pid)
+
+        latencies = []
+        for _ in range(options["events"]):
+            await asyncio.to_thread(self.borrow, port)
+            borrowed = time.perf_counter()
+            arrivals = await asyncio.gather(*(
+                self.next_inventory_event(reader) for reader, _ in streams
+            ))
+            latencies.extend(
+                (arrival - borrowed) * 1000 for arrival in arrivals
+            )
+
+        for _, writer in streams:
+            writer.close()
+        return {
+            "rss_idle": rss_idle,
+            "rss_streams": rss_streams,
+            "connect_s": connect_s,
+            "latencies": latencies,
+        }
+
+    async def open_stream(self, port: int):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(
+            (
+                f"GET {EVENTS_PATH}?types=inventory HTTP/1.1\r\n"
+                "Host: 127.0.0.1\r\n"
+                + "".join(
+                    f"{name}: {value}\r\n"
+                    for name, value in self.headers.items()
+                )
+                + "\r\n"
+            ).encode()
+        )
+        await writer.drain()
+        # Wait until subscribed, so no event is missed.
+        while b": subscribed" not in await reader.readline():
+            pass
+        return reader, writer
+
+    @staticmethod
+    async def next_inventory_event(reader) -> float:
+        while not (await reader.readline()).startswith(b"event: inventory"):
+            pass
+        return time.perf_counter()
+
+    def borrow(self, port: int) -> None:
+        today = timezone.now().date()
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        try:
+            conn.request(
+                "POST",
+                "/api/v1/borrowings/",
+                json.dumps({
+                    "borrow_date": str(today),
+                    "expected_return_date": str(
+                        today + timezone.timedelta(days=7)
+                    ),
+                    "book": self.book.title,
+                }),
+                {"Content-Type": "application/json", **self.headers},
+            )
+            response = conn.getresponse()
+            response.read()
+            if response.status != 201:
+                raise CommandError(f"Borrowing answered {response.status}")
+        finally:
+            conn.close()
@@ -0,0 +1,99 @@
+import io
+import statistics
+import time
+from typing import Callable
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from Library_Service_API.parsers import FastJSONParser
+from Library_Service_API.renderers import FastJSONRenderer, orjson
+from books.models import Book
+from books.serializers import BookSerializer
+from borrowings.models import Borrowing
+from borrowings.seeding import seed_library
+from borrowings.serializers import BorrowingListValuesSerializer
+
+
+class Command(BaseCommand):
+    """
+    Django command to compare DRF's stdlib JSON renderer and parser
+    with `FastJSONRenderer` and `FastJSONParser` on large lists.
+    """
+
+    help = (
+        "Seed books and borrowings inside a rolled back transaction and "
+        "time rendering and parsing their serialized lists."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--books", type=int, default=20_000)
+        parser.add_argument("--borrowings", type=int, default=50_000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options) -> None:
+        if orjson is None:
+            raise CommandError("orjson is not installed, nothing to compare")
+
+        with transaction.atomic():
+            self.stdout.write("Seeding dataset...")
+            seed_library(
+                users=500,
+                books=options["books"],
+                borrowings=options["borrowings"],
+            )
+            payloads = {
+                "books": BookSerializer(
+                    Book.objects.all(), many=True
+                ).data,
+                "borrowings": BorrowingListValuesSerializer(
+                    BorrowingListValuesSerializer.project(
+                        Borrowing.objects.all()
+                    ),
+                    many=True,
+                ).data,
+            }
+            transaction.set_rollback(True)
+
+        for name, data in payloads.items():
+            body = JSONRenderer().render(data)
+            if FastJSONRenderer().render(data) != body:
+                raise CommandError(f"The renderers disagree on {name}")
+            megabytes = len(body) / 1024 / 1024
+
+            self.stdout.write(
+                f"\n{name}: {len(data)} rows, {megabytes:.1f} MB"
+            )
+            for action, stdlib, fast in (
+                (
+                    "render",
+                    lambda: JSONRenderer().render(data),
+                    lambda: FastJSONRenderer().render(data),
+                ),
+                (
+                    "parse",
+                    lambda: JSONParser().parse(io.BytesIO(body)),
+                    lambda: FastJSONParser().parse(io.BytesIO(body)),
+                ),
+            ):
+                stdlib_ms = self.measure(stdlib, options["repeat"])
+                fast_ms = self.measure(fast, options["repeat"])
+                self.stdout.write(
+                    f"  {action}: stdlib {stdlib_ms:.1f} ms "
+                    f"({megabytes / stdlib_ms * 1000:.0f} MB/s), "
+                    f"fast {fast_ms:.1f} ms "
+                    f"({megabytes / fast_ms * 1000:.0f} MB/s), "
+                    f"{stdlib_ms / fast_ms:.1f}x"
+                )
+
+    @staticmethod
+    def measure(run: Callable, repeat: int) -> float:
+        """Median wall time of `run` in milliseconds."""
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,229 @@
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from typing import Callable
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from books.models import Book
+from users.models import User
+
+BENCHMARK_BOOKS = 64
+
+SERVERS = {
+    "runserver": (
+        [sys.executable, "manage.py", "runserver", "--noreload", "{bind}"],
+        {"DJANGO_ENV": "development"},
+    ),
+    "gunicorn": (
+        ["gunicorn", "Library_Service_API.wsgi", "--bind", "{bind}"],
+        {"DJANGO_ENV": "production"},
+    ),
+    "gunicorn-asgi": (
+        ["gunicorn", "Library_Service_API.asgi", "--bind", "{bind}"],
+        {"DJANGO_ENV": "production", "GUNICORN_WORKER_CLASS": "asgi"},
+    ),
+}
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    """
+    Django command to compare the development server with the
+    production serving profile under the same load.
+    """
+
+    help = (
+        "Start each server on a free local port and measure throughput "
+        "and latency of the books list and of borrowing creation."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--servers",
+            nargs="+",
+            choices=SERVERS,
+            default=["runserver", "gunicorn"],
+        )
+        parser.add_argument("--seconds", type=float, default=10)
+        parser.add_argument("--concurrency", type=int, default=16)
+
+    def handle(self, *args, **options) -> None:
+        prefix = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(
+            email=f"benchmark-{prefix}@example.com"
+        )
+        # Borrowing one book serializes on its row lock; spread the load.
+        books = Book.objects.bulk_create(
+            Book(
+                title=f"Benchmark book {prefix}-{number}",
+                author="Benchmark",
+                cover=Book.CoverChoices.SOFT,
+                inventory=10 ** 9,
+                daily_fee="1.00",
+            )
+            for number in range(BENCHMARK_BOOKS)
+        )
+        headers = {
+            settings.SIMPLE_JWT["AUTH_HEADER_NAME"][5:].replace("_", "-"):
+                f"Bearer {AccessToken.for_user(user)}",
+            "Content-Type": "application/json",
+        }
+        borrowings = [
+            json.dumps({
+                "borrow_date": "2026-01-01",
+                "expected_return_date": "2026-01-15",
+                "book": book.title,
+            })
+            for book in books
+        ]
+        scenarios = {
+            "books list": ("GET", "/api/v1/books/", [None], 200),
+            "borrow": ("POST", "/api/v1/borrowings/", borrowings, 201),
+        }
+
+        self.stdout.write(
+            f"{options['concurrency']} clients, {options['seconds']} s "
+            f"per scenario, {os.cpu_count()} CPUs"
+        )
+        try:
+            for server in options["servers"]:
+                with self.serve(server) as port:
+                    for name, scenario in scenarios.items():
+                        result = self.load(
+                            port, headers, *scenario, options
+                        )
+                        self.stdout.write(
+                            f"{server:>14} {name:>11}: "
+                            f"{result['throughput']:7.1f} req/s, "
+                            f"p50 {result['p50']:6.1f} ms, "
+                            f"p99 {result['p99']:6.1f} ms, "
+                            f"{result['errors']} errors"
+                        )
+        finally:
+            user.delete()
+            Book.objects.filter(pk__in=[book.pk for book in books]).delete()
+
+    def serve(self, server: str) -> "RunningServer":
+        port = get_free_port()
+        command, env = SERVERS[server]
+        return RunningServer(
+            [part.format(bind=f"127.0.0.1:{port}") for part in command],
+            {**os.environ, **env},
+            port,
+        )
+
+    @staticmethod
+    def load(
+        port: int,
+        headers: dict,
+        method: str,
+        path: str,
+        bodies: list[str | None],
+        expected_status: int,
+        options: dict,
+    ) -> dict:
+        timings = []
+        errors = []
+        lock = threading.Lock()
+        deadline = time.perf_counter() + options["seconds"]
+
+        def client(number: int) -> None:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            while time.perf_counter() < deadline:
+                body = bodies[number % len(bodies)]
+                number += options["concurrency"]
+                started = time.perf_counter()
+                try:
+                    conn.request(method, path, body=body, headers=headers)
+                    response = conn.getresponse()
+                    response.read()
+                    ok = response.status == expected_status
+                except (OSError, http.client.HTTPException):
+                    conn.close()
+                    ok = False
+                elapsed = (time.perf_counter() - started) * 1000
+                with lock:
+                    (timings if ok else errors).append(elapsed)
+            conn.close()
+
+        started = time.perf_counter()
+        threads = [
+            threading.Thread(target=client, args=(number,))
+            for number in range(options["concurrency"])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        if len(timings) < 2:
+            raise CommandError(f"{method} {path} failed on every request")
+        quantiles = statistics.quantiles(timings, n=100)
+        return {
+            "throughput": len(timings) / elapsed,
+            "p50": quantiles[49],
+            "p99": quantiles[98],
+            "errors": len(errors),
+        }
+
+
+class RunningServer:
+    """Context manager running a server process until it answers."""
+
+    def __init__(self, command: list[str], env: dict, port: int) -> None:
+        self.command = command
+        self.env = env
+        self.port = port
+
+    def __enter__(self) -> int:
+        self.process = subprocess.Popen(
+            self.command,
+            env=self.env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self.wait_until_ready(self.wait_for_port)
+        return self.port
+
+    def wait_for_port(self) -> bool:
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=1)
+        try:
+            conn.request("GET", "/api/v1/books/")
+            return conn.getresponse().status == 200
+        except (OSError, http.client.HTTPException):
+            return False
+        finally:
+            conn.close()
+
+    def wait_until_ready(self, check: Callable[[], bool]) -> None:
+        deadline = time.monotonic() + 30
+        while not check():
+            if self.process.poll() is not None:
+                raise CommandError(f"{self.command[0]} exited early")
+            if time.monotonic() > deadline:
+                self.__exit__()
+                raise CommandError(f"{self.command[0]} did not start")
+            time.sleep(0.2)
+
+    def __exit__(self, *exc_info) -> None:
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
@@ -0,0 +1,135 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.request import Request
+
+from Library_Service_API.explain import explain_scans, is_unbounded_scan
+from books.models import Book
+from borrowings.models import Borrowing
+from borrowings.pagination import BorrowingPagination
+from borrowings.seeding import seed_library
+from borrowings.tasks import get_overdue_borrowings
+from borrowings.views import BorrowingDetailView, BorrowingListCreateView
+from users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Django command to EXPLAIN the borrowing view and task queries
+    and fail if any of them reads the borrowings table from the start:
+    a sequential scan, or an index scan without an index condition
+    that discards rows with a filter instead.
+    """
+
+    help = (
+        "Seed a dataset inside a rolled back transaction, EXPLAIN every "
+        "borrowing query shape and fail on scans of the whole table."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--users", type=int, default=1_000)
+        parser.add_argument("--books", type=int, default=5_000)
+        parser.add_argument("--borrowings", type=int, default=200_000)
+        parser.add_argument(
+            "--no-seed",
+            action="store_true",
+            help="Explain against the existing data only.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        with transaction.atomic():
+            if not options["no_seed"]:
+                self.stdout.write("Seeding dataset...")
+                seed_library(
+                    users=options["users"],
+                    books=options["books"],
+                    borrowings=options["borrowings"],
+                )
+
+            with connection.cursor() as cursor:
+                for model in (User, Book, Borrowing):
+                    cursor.execute(f"ANALYZE {model._meta.db_table}")
+
+            failures = []
+            for name, queryset in self.get_queries():
+                plan = queryset.explain()
+                self.stdout.write(f"\n== {name}\n{plan}")
+                if any(
+                    is_unbounded_scan(scan)
+                    for scan in explain_scans(
+                        queryset, Borrowing._meta.db_table
+                    )
+                ):
+                    failures.append(name)
+
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(
+                "Unbounded scan of borrowings in: " + ", ".join(failures)
+            )
+        self.stdout.write(self.style.SUCCESS("\nAll queries use indexes"))
+
+    @staticmethod
+    def get_list_queryset(user: User, params: dict) -> QuerySet[Borrowing]:
+        request = Request(RequestFactory().get("/", params))
+        request.user = user
+        view = BorrowingListCreateView(request=request, format_kwarg=None)
+        return view.get_queryset().order_by(*BorrowingPagination.ordering)
+
+    def get_queries(self) -> list[tuple[str, QuerySet]]:
+        page_size = BorrowingPagination.page_size + 1
+        staff = User(is_staff=True)
+        sample = Borrowing.objects.order_by("-pk").first()
+        if sample is None:
+            raise CommandError("There are no borrowings to explain")
+        user = User(pk=sample.user_id)
+
+        paginator = BorrowingPagination()
+        paginator.ordering = BorrowingPagination.ordering
+        middle = (
+            Borrowing.objects
+            .filter(pk__lte=sample.pk // 2)
+            .order_by("-pk")
+            .first()
+        ) or sample
+        position = paginator._get_position_from_instance(
+            middle, paginator.ordering
+        )
+
+        return [
+            ("staff list", self.get_list_queryset(staff, {})[:page_size]),
+            (
+                "staff list, active",
+                self.get_list_queryset(staff, {"is_active": "1"})[:page_size],
+            ),
+            (
+                "staff list, user_id",
+                self.get_list_queryset(
+                    staff, {"user_id": sample.user_id}
+                )[:page_size],
+            ),
+            (
+                "staff list, deep page",
+                self.get_list_queryset(staff, {}).filter(
+                    paginator.get_keyset_filter(
+                        Borrowing.objects.all(), position, reverse=False
+                    )
+                )[:page_size],
+            ),
+            ("user list", self.get_list_queryset(user, {})[:page_size]),
+            (
+                "user list, active",
+                self.get_list_queryset(user, {"is_active": "1"})[:page_size],
+            ),
+            (
+                "detail",
+                BorrowingDetailView.queryset.filter(pk=sample.pk),
+            ),
+            (
+                "overdue task",
+                get_overdue_borrowings(timezone.now().date()),
+            ),
+        ]
@@ -0,0 +1,193 @@
+import io
+import statistics
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.backends.postgresql.psycopg_any import is_psycopg3
+from django.db.backends.signals import connection_created
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.models import User
+
+MODES = ("off", "persistent", "pool")
+
+
+class Command(BaseCommand):
+    """
+    Django command to measure DB connection churn and latency of API
+    requests without persistent connections, with them and with the
+    psycopg pool.
+
+    Requests go through `WSGIHandler`, so connections are closed or kept
+    by the same request signals as under a real server. "Django
+    connects" also counts pool checkouts; "Postgres sessions" are the
+    server-side backends actually started.
+    """
+
+    help = (
+        "Drive concurrent authenticated requests through Django's WSGI "
+        "handler in each connection mode and report new Postgres "
+        "sessions and latency percentiles."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--path", default="/api/v1/borrowings/")
+        parser.add_argument("--requests", type=int, default=2_000)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument(
+            "--modes",
+            nargs="+",
+            choices=MODES,
+            default=list(MODES),
+        )
+
+    def handle(self, *args, **options) -> None:
+        if "pool" in options["modes"] and not is_psycopg3:
+            raise CommandError("The pool mode needs psycopg 3")
+
+        self.settings_dict = connections.settings["default"]
+        self.original = {
+            key: self.settings_dict.get(key)
+            for key in ("CONN_MAX_AGE", "OPTIONS")
+        }
+        user = User.objects.create_user(
+            email=f"loadtest-{uuid.uuid4().hex[:8]}@example.com"
+        )
+        token = str(AccessToken.for_user(user))
+        try:
+            self.stdout.write(
+                f"{options['requests']} x GET {options['path']}, "
+                f"{options['concurrency']} threads"
+            )
+            for mode in options["modes"]:
+                self.report(mode, self.run(mode, token, options))
+        finally:
+            self.configure(**self.original)
+            user.delete()
+
+    def configure(self, CONN_MAX_AGE, OPTIONS) -> None:
+        connections.close_all()
+        if hasattr(connection, "close_pool"):
+            connection.close_pool()
+        self.settings_dict["CONN_MAX_AGE"] = CONN_MAX_AGE
+        self.settings_dict["OPTIONS"] = OPTIONS
+
+    def count_sessions(self) -> int:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT sessions FROM pg_stat_database "
+                "WHERE datname = current_database()"
+            )
+            return cursor.fetchone()[0]
+
+    def run(self, mode: str, token: str, options: dict) -> dict:
+        if mode == "off":
+            self.configure(CONN_MAX_AGE=0, OPTIONS={})
+        elif mode == "persistent":
+            self.configure(
+                CONN_MAX_AGE=settings.DB_CONN_MAX_AGE or 60, OPTIONS={}
+            )
+        else:
+            self.configure(
+                CONN_MAX_AGE=0,
+                OPTIONS={"pool": {
+                    **settings.DB_POOL_OPTIONS,
+                    "max_size": max(
+                        settings.DB_POOL_OPTIONS["max_size"],
+                        options["concurrency"],
+                    ),
+                }},
+            )
+
+        handler = WSGIHandler()
+        path, _, query = options["path"].partition("?")
+        timings = []
+        opened = []
+        lock = threading.Lock()
+
+        def count_connection(sender, **kwargs) -> None:
+            with lock:
+                opened.append(1)
+
+        def request() -> None:
+            environ = {
+                "REQUEST_METHOD": "GET",
+                "PATH_INFO": path,
+                "QUERY_STRING": query,
+                "SERVER_NAME": "localhost",
+                "SERVER_PORT": "80",
+                "HTTP_AUTHORIZE": f"Bearer {token}",
+                "wsgi.input": io.BytesIO(),
+                "wsgi.url_scheme": "http",
+            }
+            started = time.perf_counter()
+            response = handler(environ, lambda status, headers: None)
+            b"".join(response)
+            response.close()
+            elapsed = (time.perf_counter() - started) * 1000
+            if response.status_code != 200:
+                raise CommandError(
+                    f"GET {options['path']} -> {response.status_code}"
+                )
+            with lock:
+                timings.append(elapsed)
+
+        def worker(count: int) -> None:
+            try:
+                for _ in range(count):
+                    request()
+            finally:
+                connections.close_all()
+
+        per_thread, extra = divmod(
+            options["requests"], options["concurrency"]
+        )
+        threads = [
+            threading.Thread(
+                target=worker, args=(per_thread + (number < extra),)
+            )
+            for number in range(options["concurrency"])
+        ]
+
+        sessions = self.count_sessions()
+        connection_created.connect(count_connection)
+        started = time.perf_counter()
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            connection_created.disconnect(count_connection)
+        elapsed = time.perf_counter() - started
+        # The session counter is updated when a backend exits.
+        if hasattr(connection, "close_pool"):
+            connection.close_pool()
+        time.sleep(0.5)
+
+        if len(timings) != options["requests"]:
+            raise CommandError(f"{mode}: some requests failed")
+
+        quantiles = statistics.quantiles(timings, n=100)
+        return {
+            "throughput": len(timings) / elapsed,
+            "p50": quantiles[49],
+            "p95": quantiles[94],
+            "p99": quantiles[98],
+            "connects": len(opened),
+            "sessions": self.count_sessions() - sessions,
+        }
+
+    def report(self, mode: str, result: dict) -> None:
+        self.stdout.write(
+            f"{mode:>10}: {result['throughput']:7.1f} req/s, "
+            f"p50 {result['p50']:6.1f} ms, p95 {result['p95']:6.1f} ms, "
+            f"p99 {result['p99']:6.1f} ms, "
+            f"{result['connects']} Django connects, "
+            f"{result['sessions']} new Postgres sessions"
+        )
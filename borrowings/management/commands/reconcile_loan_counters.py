@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from borrowings.counters import iter_user_batches, reconcile_loan_counters
+from users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Django command to recompute every user's loan counters
+    from their borrowings.
+    """
+
+    help = (
+        "Recompute active, overdue and lifetime loan counters of all "
+        "users in batches, fixing any drift."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options) -> None:
+        today = timezone.now().date()
+        updated = 0
+        for batch in iter_user_batches(
+            User.objects.all(), options["batch_size"]
+        ):
+            updated += reconcile_loan_counters(batch, today)
+            self.stdout.write(f"Reconciled {updated} users...")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Reconciled loan counters of {updated} users")
+        )
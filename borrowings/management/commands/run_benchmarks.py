@@ -0,0 +1,290 @@
+import itertools
+import json
+import tempfile
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from books.cache import invalidate_catalogue
+from books.models import Book
+from borrowings import benchmarks
+from borrowings.models import Borrowing
+from borrowings.seeding import seed_library
+from borrowings.tasks import check_overdue_borrowings
+from users.models import User
+
+# Books the borrow scenario spreads over, so it does not measure
+# waiting on a single row lock.
+BORROWED_BOOKS = 64
+
+DATASET_OPTIONS = ("users", "books", "borrowings", "skew", "seed")
+
+
+class Command(BaseCommand):
+    """
+    Django command to benchmark the API hot paths against a seeded
+    dataset and write machine-readable results.
+
+    Requests go through the full Django stack in process. Everything
+    runs inside one transaction that is rolled back, so runs with the
+    same options start from the same data and can be compared across
+    commits.
+    """
+
+    help = (
+        "Seed a dataset, time the main API flows and the overdue task and "
+        "report p50/p95/p99 latency, queries per request and memory as JSON."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--users", type=int, default=5_000)
+        parser.add_argument("--books", type=int, default=20_000)
+        parser.add_argument("--borrowings", type=int, default=200_000)
+        parser.add_argument("--skew", type=float, default=1.0)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--no-seed",
+            action="store_true",
+            help="Benchmark the existing data only.",
+        )
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--warmup", type=int, default=10)
+        parser.add_argument(
+            "--task-iterations",
+            type=int,
+            default=5,
+            help="Iterations of the overdue task, which is much slower.",
+        )
+        parser.add_argument("--memory-samples", type=int, default=5)
+        parser.add_argument(
+            "--scenarios",
+            nargs="+",
+            help="Only run these scenarios.",
+        )
+        parser.add_argument(
+            "--output",
+            help="Write the JSON results to this file instead of stdout.",
+        )
+        parser.add_argument(
+            "--baseline",
+            help="JSON results of an earlier run to compare p95 against.",
+        )
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            help="Fail if any p95 grew by more than this fraction "
+                 "over the baseline, e.g. 0.2.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        report = {
+            "schema": benchmarks.SCHEMA_VERSION,
+            **benchmarks.describe_environment(),
+            "dataset": {
+                "seeded": not options["no_seed"],
+                **{
+                    name: options[name]
+                    for name in DATASET_OPTIONS
+                },
+            },
+            "config": {
+                name: options[name]
+                for name in ("iterations", "warmup", "memory_samples")
+            },
+            "results": {},
+        }
+
+        with (
+            tempfile.TemporaryDirectory() as report_dir,
+            override_settings(OVERDUE_REPORT_DIR=report_dir),
+            transaction.atomic(),
+        ):
+            self.prepare_data(options)
+            scenarios = self.get_scenarios(options)
+            for scenario in scenarios:
+                if (
+                    options["scenarios"]
+                    and scenario.name not in options["scenarios"]
+                ):
+                    continue
+                result = benchmarks.measure(
+                    scenario,
+                    options["iterations"],
+                    options["warmup"],
+                    options["memory_samples"],
+                )
+                report["results"][scenario.name] = result
+                self.stderr.write(
+                    f"{scenario.name:>24}: "
+                    f"p50 {result['p50_ms']:8.2f} ms, "
+                    f"p95 {result['p95_ms']:8.2f} ms, "
+                    f"p99 {result['p99_ms']:8.2f} ms, "
+                    f"{result['queries_per_request']:5.1f} queries"
+                )
+            transaction.set_rollback(True)
+
+        report["max_rss_kib"] = benchmarks.max_rss_kib()
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+        if options["baseline"]:
+            self.check_baseline(report, options)
+
+    def prepare_data(self, options: dict) -> None:
+        if options["no_seed"]:
+            self.library_books = list(
+                Book.objects.order_by("pk")
+                .values_list("pk", flat=True)[:BORROWED_BOOKS]
+            )
+            self.reader = (
+                User.objects.filter(is_staff=False).order_by("pk").first()
+            )
+            if self.reader is None or not self.library_books:
+                raise CommandError("There is no data to benchmark")
+        else:
+            self.stderr.write("Seeding dataset...")
+            library = seed_library(
+                users=options["users"],
+                books=options["books"],
+                borrowings=options["borrowings"],
+                skew=options["skew"],
+                seed=options["seed"],
+            )
+            # With skew the first rows are the most popular ones.
+            self.library_books = library.book_ids[:BORROWED_BOOKS]
+            self.reader = User.objects.get(pk=library.user_ids[0])
+            with connection.cursor() as cursor:
+                for model in (User, Book, Borrowing):
+                    cursor.execute(f"ANALYZE {model._meta.db_table}")
+
+        Book.objects.filter(pk__in=self.library_books).update(
+            inventory=10 ** 9
+        )
+        self.staff = User.objects.create_user(
+            email=f"benchmark-{uuid.uuid4().hex[:8]}@example.com",
+            is_staff=True,
+        )
+
+    def get_scenarios(self, options: dict) -> list[benchmarks.Scenario]:
+        client = Client(SERVER_NAME="localhost")
+        header = settings.SIMPLE_JWT["AUTH_HEADER_NAME"]
+        staff = {header: f"Bearer {AccessToken.for_user(self.staff)}"}
+        reader = {header: f"Bearer {AccessToken.for_user(self.reader)}"}
+        titles = itertools.cycle(
+            Book.objects.filter(pk__in=self.library_books)
+            .values_list("title", flat=True)
+        )
+        today = timezone.now().date()
+
+        def get(path: str, headers: dict, **params):
+            return lambda _: self.check_response(
+                client.get(path, params, **headers), 200
+            )
+
+        def borrow(_) -> None:
+            self.check_response(
+                client.post(
+                    "/api/v1/borrowings/",
+                    {
+                        "borrow_date": str(today),
+                        "expected_return_date": str(today + timedelta(7)),
+                        "book": next(titles),
+                    },
+                    content_type="application/json",
+                    **reader,
+                ),
+                201,
+            )
+
+        def create_borrowing() -> int:
+            return Borrowing.objects.create(
+                user=self.reader,
+                book_id=self.library_books[0],
+                borrow_date=today,
+                expected_return_date=today + timedelta(7),
+            ).pk
+
+        def return_borrowing(pk: int) -> None:
+            self.check_response(
+                client.post(f"/api/v1/borrowings/{pk}/return/", **reader),
+                201,
+            )
+
+        return [
+            benchmarks.Scenario(
+                "book_list",
+                get("/api/v1/books/", {}),
+                prepare=invalidate_catalogue,
+            ),
+            benchmarks.Scenario(
+                "book_list_cached", get("/api/v1/books/", {})
+            ),
+            benchmarks.Scenario(
+                "borrowing_list", get("/api/v1/borrowings/", staff)
+            ),
+            benchmarks.Scenario(
+                "borrowing_list_active",
+                get("/api/v1/borrowings/", staff, is_active=1),
+            ),
+            benchmarks.Scenario(
+                "borrowing_list_user_id",
+                get("/api/v1/borrowings/", staff, user_id=self.reader.pk),
+            ),
+            benchmarks.Scenario(
+                "borrowing_list_reader",
+                get("/api/v1/borrowings/", reader, is_active=1),
+            ),
+            benchmarks.Scenario("borrow", borrow),
+            benchmarks.Scenario(
+                "return", return_borrowing, prepare=create_borrowing
+            ),
+            benchmarks.Scenario(
+                "overdue_task",
+                lambda _: check_overdue_borrowings(),
+                iterations=options["task_iterations"],
+            ),
+        ]
+
+    @staticmethod
+    def check_response(response, status: int):
+        if response.status_code != status:
+            raise CommandError(
+                f"{response.request['REQUEST_METHOD']} "
+                f"{response.request['PATH_INFO']} answered "
+                f"{response.status_code}: {response.content[:200]!r}"
+            )
+        return response
+
+    def check_baseline(self, report: dict, options: dict) -> None:
+        with open(options["baseline"]) as file:
+            baseline = json.load(file)
+        if baseline.get("dataset") != report["dataset"]:
+            self.stderr.write(self.style.WARNING(
+                "The baseline used a different dataset"
+            ))
+
+        regressions = []
+        for name, change in benchmarks.compare(report, baseline).items():
+            if change is None:
+                continue
+            self.stderr.write(f"{name:>24}: p95 {change:+.1%}")
+            if (
+                options["max_regression"] is not None
+                and change > options["max_regression"]
+            ):
+                regressions.append(name)
+
+        if regressions:
+            raise CommandError(
+                "p95 regressed beyond the limit in: " + ", ".join(regressions)
+            )
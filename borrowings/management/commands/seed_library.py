@@ -0,0 +1,80 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from books.models import Book
+from borrowings.counters import iter_user_batches, reconcile_loan_counters
+from borrowings.models import Borrowing
+from borrowings.seeding import seed_library
+from users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Django command to fill the database with a large synthetic library
+    for benchmarks and load tests.
+    """
+
+    help = (
+        "Bulk insert users, books and borrowings with configurable "
+        "volumes and popularity skew, then reconcile the loan counters."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--users", type=int, default=10_000)
+        parser.add_argument("--books", type=int, default=50_000)
+        parser.add_argument("--borrowings", type=int, default=1_000_000)
+        parser.add_argument(
+            "--active-share",
+            type=float,
+            default=0.05,
+            help="Share of borrowings not returned yet.",
+        )
+        parser.add_argument(
+            "--overdue-share",
+            type=float,
+            default=0.5,
+            help="Share of the active borrowings that are overdue.",
+        )
+        parser.add_argument(
+            "--skew",
+            type=float,
+            default=1.0,
+            help="Zipf exponent of book and user popularity; 0 is uniform.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+
+    def handle(self, *args, **options) -> None:
+        started = time.perf_counter()
+        with transaction.atomic():
+            library = seed_library(
+                users=options["users"],
+                books=options["books"],
+                borrowings=options["borrowings"],
+                active_share=options["active_share"],
+                overdue_share=options["overdue_share"],
+                skew=options["skew"],
+                batch_size=options["batch_size"],
+                seed=options["seed"],
+            )
+            today = timezone.now().date()
+            for users in iter_user_batches(
+                User.objects.filter(
+                    email__startswith=f"seed-{library.prefix}-"
+                ),
+                options["batch_size"],
+            ):
+                reconcile_loan_counters(users, today)
+
+        with connection.cursor() as cursor:
+            for model in (User, Book, Borrowing):
+                cursor.execute(f"ANALYZE {model._meta.db_table}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {options['users']} users, {options['books']} books "
+            f"and {options['borrowings']} borrowings with prefix "
+            f"{library.prefix} in {time.perf_counter() - started:.1f} s"
+        ))
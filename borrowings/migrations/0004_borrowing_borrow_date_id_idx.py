@@ -0,0 +1,19 @@
+# Generated by Django 5.2.10 on 2026-10-18 17:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("borrowings", "0003_alter_borrowing_id"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="borrowing",
+            index=models.Index(
+                fields=["-borrow_date", "id"], name="borrowing_borrow_date_id_idx"
+            ),
+        ),
+    ]
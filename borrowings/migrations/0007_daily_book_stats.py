@@ -0,0 +1,61 @@
+# Generated by Django 5.2.10 on 2026-10-18 17:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0005_book_search"),
+        ("borrowings", "0006_borrowing_updated_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyBookStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("borrowings", models.PositiveIntegerField(default=0)),
+                ("returns", models.PositiveIntegerField(default=0)),
+                ("loan_days", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name_plural": "daily book stats",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="borrowing",
+            index=models.Index(
+                condition=models.Q(("actual_return_date", None), _negated=True),
+                fields=["actual_return_date"],
+                name="borrowing_returned_date_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="dailybookstats",
+            name="book",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="daily_stats",
+                to="books.book",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="dailybookstats",
+            constraint=models.UniqueConstraint(
+                fields=("date", "book"), name="daily_book_stats_date_book_uniq"
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+TASK_NAME = "Aggregate daily library stats"
+
+
+def schedule_daily_stats(apps, schema_editor):
+    CrontabSchedule = apps.get_model("django_celery_beat", "CrontabSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTasks = apps.get_model("django_celery_beat", "PeriodicTasks")
+
+    schedule, _ = CrontabSchedule.objects.get_or_create(
+        minute="30",
+        hour="0",
+        day_of_week="*",
+        day_of_month="*",
+        month_of_year="*",
+        # Days end at UTC midnight, so the run for yesterday follows it.
+        timezone=settings.TIME_ZONE,
+    )
+    PeriodicTask.objects.get_or_create(
+        name=TASK_NAME,
+        defaults={
+            "task": "borrowings.tasks.aggregate_daily_stats",
+            "crontab": schedule,
+        },
+    )
+    # Historical models skip the signal that tells beat to reload.
+    PeriodicTasks.objects.update_or_create(
+        ident=1, defaults={"last_update": timezone.now()}
+    )
+
+
+def unschedule_daily_stats(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("borrowings", "0007_daily_book_stats"),
+        ("django_celery_beat", "0019_alter_periodictasks_options"),
+    ]
+
+    operations = [
+        migrations.RunPython(schedule_daily_stats, unschedule_daily_stats),
+    ]
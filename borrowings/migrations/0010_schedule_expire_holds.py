@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+TASK_NAME = "Expire unclaimed holds"
+
+
+def schedule_expire_holds(apps, schema_editor):
+    CrontabSchedule = apps.get_model("django_celery_beat", "CrontabSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTasks = apps.get_model("django_celery_beat", "PeriodicTasks")
+
+    schedule, _ = CrontabSchedule.objects.get_or_create(
+        minute="*/5",
+        hour="*",
+        day_of_week="*",
+        day_of_month="*",
+        month_of_year="*",
+        timezone=settings.CELERY_TIMEZONE,
+    )
+    PeriodicTask.objects.get_or_create(
+        name=TASK_NAME,
+        defaults={
+            "task": "borrowings.tasks.expire_holds",
+            "crontab": schedule,
+        },
+    )
+    # Historical models skip the signal that tells beat to reload.
+    PeriodicTasks.objects.update_or_create(
+        ident=1, defaults={"last_update": timezone.now()}
+    )
+
+
+def unschedule_expire_holds(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("borrowings", "0009_hold"),
+        ("django_celery_beat", "0019_alter_periodictasks_options"),
+    ]
+
+    operations = [
+        migrations.RunPython(schedule_expire_holds, unschedule_expire_holds),
+    ]
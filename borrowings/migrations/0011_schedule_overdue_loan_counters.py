@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+TASK_NAME = "Refresh overdue loan counters"
+
+
+def schedule_overdue_loan_counters(apps, schema_editor):
+    CrontabSchedule = apps.get_model("django_celery_beat", "CrontabSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTasks = apps.get_model("django_celery_beat", "PeriodicTasks")
+
+    schedule, _ = CrontabSchedule.objects.get_or_create(
+        minute="5",
+        hour="0",
+        day_of_week="*",
+        day_of_month="*",
+        month_of_year="*",
+        # The task stamps UTC dates, so it runs after UTC midnight.
+        timezone=settings.TIME_ZONE,
+    )
+    PeriodicTask.objects.get_or_create(
+        name=TASK_NAME,
+        defaults={
+            "task": "borrowings.tasks.refresh_overdue_loan_counters",
+            "crontab": schedule,
+        },
+    )
+    # Historical models skip the signal that tells beat to reload.
+    PeriodicTasks.objects.update_or_create(
+        ident=1, defaults={"last_update": timezone.now()}
+    )
+
+
+def unschedule_overdue_loan_counters(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("borrowings", "0010_schedule_expire_holds"),
+        ("django_celery_beat", "0019_alter_periodictasks_options"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            schedule_overdue_loan_counters, unschedule_overdue_loan_counters
+        ),
+    ]
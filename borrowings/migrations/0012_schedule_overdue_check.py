@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+TASK_NAME = "Report overdue borrowings"
+SINGLE_TASK = "borrowings.tasks.check_overdue_borrowings"
+SHARDED_TASK = "borrowings.tasks.check_overdue_borrowings_sharded"
+
+
+def schedule_overdue_check(apps, schema_editor):
+    CrontabSchedule = apps.get_model("django_celery_beat", "CrontabSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTasks = apps.get_model("django_celery_beat", "PeriodicTasks")
+
+    # Periodic tasks added by hand for the single task keep their
+    # schedule and run the sharded one instead.
+    switched = (
+        PeriodicTask.objects
+        .filter(task=SINGLE_TASK)
+        .update(task=SHARDED_TASK)
+    )
+    if not switched:
+        schedule, _ = CrontabSchedule.objects.get_or_create(
+            minute="15",
+            hour="0",
+            day_of_week="*",
+            day_of_month="*",
+            month_of_year="*",
+            # Loans fall due at UTC midnight; see the task's `today`.
+            timezone=settings.TIME_ZONE,
+        )
+        PeriodicTask.objects.get_or_create(
+            name=TASK_NAME,
+            defaults={"task": SHARDED_TASK, "crontab": schedule},
+        )
+    # Historical models skip the signal that tells beat to reload.
+    PeriodicTasks.objects.update_or_create(
+        ident=1, defaults={"last_update": timezone.now()}
+    )
+
+
+def unschedule_overdue_check(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=TASK_NAME).delete()
+    PeriodicTask.objects.filter(task=SHARDED_TASK).update(task=SINGLE_TASK)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("borrowings", "0011_schedule_overdue_loan_counters"),
+        ("django_celery_beat", "0019_alter_periodictasks_options"),
+    ]
+
+    operations = [
+        migrations.RunPython(schedule_overdue_check, unschedule_overdue_check),
+    ]
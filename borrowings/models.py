@@ -1,6 +1,7 @@
 from django.db import models
 
 from Library_Service_API import settings
+from borrowings.fees import BorrowingFee, calculate_fee
 
 
 class Borrowing(models.Model):
@@ -17,9 +18,134 @@ class Borrowing(models.Model):
         on_delete=models.CASCADE,
         related_name="borrowings"
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str:
         return f"{self.book.title} borrowed at {self.borrow_date}"
 
+    @property
+    def fee(self) -> BorrowingFee:
+        return calculate_fee(self)
+
     class Meta:
         ordering = ("-borrow_date",)
+        indexes = (
+            models.Index(
+                fields=("-borrow_date", "id"),
+                name="borrowing_borrow_date_id_idx",
+            ),
+            models.Index(
+                fields=("user", "-borrow_date", "id"),
+                name="borrowing_user_borrow_date_idx",
+            ),
+            models.Index(
+                fields=("-borrow_date", "id"),
+                name="borrowing_active_date_idx",
+                condition=models.Q(actual_return_date=None),
+            ),
+            models.Index(
+                fields=("user", "-borrow_date", "id"),
+                name="borrowing_active_user_idx",
+                condition=models.Q(actual_return_date=None),
+            ),
+            models.Index(
+                fields=("expected_return_date",),
+                name="borrowing_active_expected_idx",
+                condition=models.Q(actual_return_date=None),
+            ),
+            models.Index(
+                fields=("actual_return_date",),
+                name="borrowing_returned_date_idx",
+                condition=~models.Q(actual_return_date=None),
+            ),
+        )
+
+
+class Hold(models.Model):
+    """
+    A place in the queue for an out-of-stock book. Returned copies go
+    to the oldest waiting hold, which stays `READY` with the copy set
+    aside until the holder borrows it or `ready_until` passes.
+    """
+
+    class Status(models.TextChoices):
+        WAITING = "waiting"
+        READY = "ready"
+        FULFILLED = "fulfilled"
+        EXPIRED = "expired"
+        CANCELLED = "cancelled"
+
+    OPEN = (Status.WAITING, Status.READY)
+
+    book = models.ForeignKey(
+        "books.Book",
+        on_delete=models.CASCADE,
+        related_name="holds"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="holds"
+    )
+    status = models.CharField(
+        max_length=9, choices=Status, default=Status.WAITING
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    ready_until = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self) -> str:
+        return f"{self.book_id} held by {self.user_id} ({self.status})"
+
+    class Meta:
+        ordering = ("created_at", "id")
+        indexes = (
+            # The queue of a book; its head is the next holder.
+            models.Index(
+                fields=("book", "created_at", "id"),
+                name="hold_waiting_queue_idx",
+                condition=models.Q(status="waiting"),
+            ),
+            models.Index(
+                fields=("ready_until",),
+                name="hold_ready_until_idx",
+                condition=models.Q(status="ready"),
+            ),
+        )
+        constraints = (
+            models.UniqueConstraint(
+                fields=("book", "user"),
+                name="hold_open_book_user_uniq",
+                condition=models.Q(status__in=("waiting", "ready")),
+                violation_error_message="You already hold this book",
+            ),
+        )
+
+
+class DailyBookStats(models.Model):
+    """
+    Borrowings and returns of one book on one day, filled by
+    `borrowings.stats.aggregate_day`. `loan_days` is the total length
+    of the loans returned that day.
+    """
+
+    date = models.DateField()
+    book = models.ForeignKey(
+        "books.Book",
+        on_delete=models.CASCADE,
+        related_name="daily_stats"
+    )
+    borrowings = models.PositiveIntegerField(default=0)
+    returns = models.PositiveIntegerField(default=0)
+    loan_days = models.PositiveIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.book_id} on {self.date}"
+
+    class Meta:
+        verbose_name_plural = "daily book stats"
+        constraints = (
+            models.UniqueConstraint(
+                fields=("date", "book"),
+                name="daily_book_stats_date_book_uniq",
+            ),
+        )
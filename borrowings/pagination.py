@@ -0,0 +1,9 @@
+from Library_Service_API.pagination import KeysetCursorPagination
+
+
+class BorrowingPagination(KeysetCursorPagination):
+    ordering = ("-borrow_date", "id")
+
+
+class HoldPagination(KeysetCursorPagination):
+    ordering = ("-id",)
@@ -5,6 +5,11 @@ from borrowings.models import Borrowing
 
 
 class IsBorrower(BasePermission):
+    """
+    Staff or the owner of the borrowing or hold. Compares the foreign
+    key, so the check never loads `obj.user`.
+    """
+
     def has_object_permission(
         self,
         request: Request,
@@ -13,5 +18,20 @@ class IsBorrower(BasePermission):
     ) -> bool:
         return (
             bool(request.user.is_staff)
-            or bool(request.user == obj.user)
+            or obj.user_id == request.user.pk
+        )
+
+
+class AsyncIsBorrower(IsBorrower):
+    """`IsBorrower` for async views."""
+
+    async def has_object_permission(
+        self,
+        request: Request,
+        view,
+        obj: Borrowing
+    ) -> bool:
+        return (
+            bool(request.user.is_staff)
+            or obj.user_id == request.user.pk
         )
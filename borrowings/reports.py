@@ -0,0 +1,188 @@
+import csv
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager, suppress
+from datetime import date
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, NamedTuple, TextIO
+
+from django.conf import settings
+
+OverdueRow = tuple[int, str, date]
+
+BUFFER_SIZE = 1024 * 1024
+
+
+class ReportFormat(NamedTuple):
+    extension: str
+    write_header: Callable[[TextIO, date], None]
+    write_rows: Callable[[TextIO, Iterable[OverdueRow]], int]
+    empty_message: str = ""
+
+
+def _write_text_header(file: TextIO, today: date) -> None:
+    file.write(f"Date: {today}.\n")
+
+
+def _write_text_rows(file: TextIO, rows: Iterable[OverdueRow]) -> int:
+    count = 0
+    for borrowing_id, title, expected_return_date in rows:
+        file.write(
+            f"Borrowing ID is {borrowing_id}.\n"
+            f"The return of the borrowed book "
+            f"titled '{title}' is overdue.\n"
+            f"The expected return date "
+            f"was {expected_return_date}.\n\n"
+        )
+        count += 1
+    return count
+
+
+def _write_jsonl_rows(file: TextIO, rows: Iterable[OverdueRow]) -> int:
+    count = 0
+    for borrowing_id, title, expected_return_date in rows:
+        file.write(json.dumps({
+            "id": borrowing_id,
+            "book": title,
+            "expected_return_date": expected_return_date.isoformat(),
+        }) + "\n")
+        count += 1
+    return count
+
+
+def _write_csv_header(file: TextIO, today: date) -> None:
+    csv.writer(file).writerow(("id", "book", "expected_return_date"))
+
+
+def _write_csv_rows(file: TextIO, rows: Iterable[OverdueRow]) -> int:
+    writer = csv.writer(file)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+REPORT_FORMATS: dict[str, ReportFormat] = {
+    "text": ReportFormat(
+        "txt",
+        _write_text_header,
+        _write_text_rows,
+        "No borrowings overdue today!\n\n",
+    ),
+    "jsonl": ReportFormat(
+        "jsonl",
+        lambda file, today: None,
+        _write_jsonl_rows,
+    ),
+    "csv": ReportFormat("csv", _write_csv_header, _write_csv_rows),
+}
+
+
+def get_report_format(report_format: str) -> ReportFormat:
+    if report_format not in REPORT_FORMATS:
+        raise ValueError(f"Unknown report format: {report_format}")
+    return REPORT_FORMATS[report_format]
+
+
+def get_report_path(today: date, report_format: str) -> Path:
+    extension = get_report_format(report_format).extension
+    return (
+        Path(settings.OVERDUE_REPORT_DIR)
+        / f"overdue_borrowings_{today.isoformat()}.{extension}"
+    )
+
+
+@contextmanager
+def _open_temporary(path: Path, suffix: str) -> Iterator[tuple[TextIO, str]]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary_path = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=suffix
+    )
+    try:
+        with open(
+            descriptor, "w", buffering=BUFFER_SIZE, newline=""
+        ) as file:
+            yield file, temporary_path
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+def write_overdue_report(
+    rows: Iterable[OverdueRow],
+    today: date,
+    report_format: str = "text",
+) -> tuple[Path, int]:
+    """
+    Stream rows into a temporary file next to the dated report and move
+    it into place with an atomic rename.
+
+    Concurrent runs each write their own temporary file, so readers only
+    ever see a complete report. Returns the report path and row count.
+    """
+    output = get_report_format(report_format)
+    path = get_report_path(today, report_format)
+
+    with _open_temporary(path, ".tmp") as (file, temporary_path):
+        output.write_header(file, today)
+        count = output.write_rows(file, rows)
+        if not count:
+            file.write(output.empty_message)
+    os.chmod(temporary_path, 0o644)
+    os.replace(temporary_path, path)
+
+    return path, count
+
+
+def write_overdue_part(
+    rows: Iterable[OverdueRow],
+    today: date,
+    report_format: str = "text",
+) -> tuple[Path, int]:
+    """
+    Write the rows of one shard, without header, into a uniquely named
+    part file that `merge_overdue_parts` later stitches together.
+    """
+    output = get_report_format(report_format)
+    path = get_report_path(today, report_format)
+
+    with _open_temporary(path, ".part") as (file, temporary_path):
+        count = output.write_rows(file, rows)
+
+    return Path(temporary_path), count
+
+
+def merge_overdue_parts(
+    parts: Iterable[Path],
+    today: date,
+    report_format: str = "text",
+) -> Path:
+    """
+    Concatenate part files, in the given order, into the dated report
+    with the same atomic rename as `write_overdue_report`.
+    """
+    output = get_report_format(report_format)
+    path = get_report_path(today, report_format)
+    parts = list(parts)
+
+    try:
+        with _open_temporary(path, ".tmp") as (file, temporary_path):
+            output.write_header(file, today)
+            for part in parts:
+                with open(part, newline="") as part_file:
+                    shutil.copyfileobj(part_file, file, BUFFER_SIZE)
+            if not any(os.path.getsize(part) for part in parts):
+                file.write(output.empty_message)
+        os.chmod(temporary_path, 0o644)
+        os.replace(temporary_path, path)
+    finally:
+        # A failed merge is not retried, so its parts would never be
+        # cleaned up.
+        for part in parts:
+            with suppress(FileNotFoundError):
+                os.unlink(part)
+
+    return path
@@ -0,0 +1,130 @@
+import itertools
+import random
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from typing import Callable, Iterator, NamedTuple
+
+from django.utils import timezone
+
+from books.models import Book
+from books.search import add_search_words
+from borrowings.models import Borrowing
+from users.models import User
+
+
+def _batched(rows: Iterator, batch_size: int) -> Iterator[list]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class SeededLibrary(NamedTuple):
+    prefix: str
+    user_ids: list[int]
+    book_ids: list[int]
+
+
+def _skewed_choice(
+    rng: random.Random, ids: list[int], skew: float
+) -> Callable[[], int]:
+    """
+    Pick ids with Zipf-like popularity: the id at rank `r` (from 1) is
+    chosen with weight `1 / r ** skew`, so 0 is uniform and around 1
+    a few ids get most of the picks, like bestsellers and regulars.
+    """
+    if not skew:
+        return lambda: rng.choice(ids)
+    cum_weights = list(itertools.accumulate(
+        1 / rank ** skew for rank in range(1, len(ids) + 1)
+    ))
+    return lambda: rng.choices(ids, cum_weights=cum_weights)[0]
+
+
+def seed_library(
+    users: int,
+    books: int,
+    borrowings: int,
+    active_share: float = 0.05,
+    overdue_share: float = 0.5,
+    skew: float = 0.0,
+    batch_size: int = 10_000,
+    seed: int = 0,
+) -> SeededLibrary:
+    """
+    Insert synthetic users, books and borrowings with `bulk_create`.
+
+    Rows get a random prefix so seeding never collides with existing data.
+    `active_share` of the borrowings are not returned yet and
+    `overdue_share` of those are past their expected return date.
+    `skew` concentrates borrowings on the first users and books, see
+    `_skewed_choice`. Loan counters of the users are not maintained.
+    """
+    rng = random.Random(seed)
+    prefix = uuid.uuid4().hex[:8]
+    today = timezone.now().date()
+
+    user_ids = []
+    for batch in _batched(
+        (
+            User(email=f"seed-{prefix}-{number}@example.com", password="!")
+            for number in range(users)
+        ),
+        batch_size,
+    ):
+        user_ids += [user.pk for user in User.objects.bulk_create(batch)]
+
+    book_ids = []
+    for batch in _batched(
+        (
+            Book(
+                title=f"Seed book {prefix}-{number}",
+                author=f"Seed author {number % 1000}",
+                cover=rng.choice(Book.CoverChoices.values),
+                inventory=rng.randint(0, 20),
+                daily_fee=Decimal(rng.randint(10, 500)) / 100,
+            )
+            for number in range(books)
+        ),
+        batch_size,
+    ):
+        book_ids += [book.pk for book in Book.objects.bulk_create(batch)]
+    # Bulk inserts send no signals.
+    add_search_words(book_ids)
+
+    choose_book = _skewed_choice(rng, book_ids, skew)
+    choose_user = _skewed_choice(rng, user_ids, skew)
+
+    def make_borrowing() -> Borrowing:
+        is_active = rng.random() < active_share
+        if is_active and rng.random() >= overdue_share:
+            borrow_date = today - timedelta(days=rng.randint(0, 6))
+        else:
+            borrow_date = today - timedelta(days=rng.randint(7, 5 * 365))
+        expected_return_date = borrow_date + timedelta(
+            days=rng.randint(7, 30)
+        )
+        actual_return_date = None
+        if not is_active:
+            actual_return_date = min(
+                borrow_date + timedelta(days=rng.randint(0, 40)), today
+            )
+        return Borrowing(
+            borrow_date=borrow_date,
+            expected_return_date=expected_return_date,
+            actual_return_date=actual_return_date,
+            book_id=choose_book(),
+            user_id=choose_user(),
+        )
+
+    for batch in _batched(
+        (make_borrowing() for _ in range(borrowings)), batch_size
+    ):
+        Borrowing.objects.bulk_create(batch)
+
+    return SeededLibrary(prefix, user_ids, book_ids)
@@ -1,9 +1,14 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
 from books.models import Book
 from books.serializers import BookSerializer
-from borrowings.models import Borrowing
+from borrowings.models import Borrowing, Hold
 from users.serializers import UserSerializer
 
 
@@ -31,9 +36,62 @@ class BorrowingListSerializer(serializers.ModelSerializer):
         )
 
 
+class BorrowingListValuesSerializer:
+    """
+    Read-only twin of `BorrowingListSerializer` over `values()` rows.
+
+    `project` selects only the output columns, so no model instances are
+    built, and every row is mapped straight to the same JSON shape
+    without going through DRF fields. Mirrors the `many=True` serializer
+    interface that list views use.
+    """
+
+    columns = {
+        "id": "id",
+        "borrow_date": "borrow_date",
+        "expected_return_date": "expected_return_date",
+        "actual_return_date": "actual_return_date",
+        "book": "book__title",
+        "user": "user__email",
+    }
+    date_fields = ("borrow_date", "expected_return_date", "actual_return_date")
+
+    def __init__(self, instance=None, many: bool = False, **kwargs) -> None:
+        self.instance = instance
+        self.many = many
+
+    @classmethod
+    def project(cls, queryset: QuerySet[Borrowing]) -> QuerySet:
+        return queryset.values(*cls.columns.values())
+
+    def to_representation(self, row: dict) -> dict:
+        data = {name: row[column] for name, column in self.columns.items()}
+        for name in self.date_fields:
+            if data[name] is not None:
+                data[name] = data[name].isoformat()
+        return data
+
+    @property
+    def data(self) -> list[dict] | dict:
+        if self.many:
+            return [self.to_representation(row) for row in self.instance]
+        return self.to_representation(self.instance)
+
+
+class BorrowingFeeSerializer(serializers.Serializer):
+    base_fee = serializers.DecimalField(max_digits=12, decimal_places=2)
+    overdue_days = serializers.IntegerField()
+    overdue_fee = serializers.DecimalField(max_digits=12, decimal_places=2)
+    total_fee = serializers.DecimalField(max_digits=12, decimal_places=2)
+
+
 class BorrowingDetailSerializer(BorrowingListSerializer):
     user = UserSerializer(many=False, read_only=True)
     book = BookSerializer(many=False, read_only=True)
+    fee = BorrowingFeeSerializer(many=False, read_only=True)
+
+    class Meta(BorrowingListSerializer.Meta):
+        fields = BorrowingListSerializer.Meta.fields + ("fee",)
 
 
 class BorrowingCreateSerializer(BorrowingListSerializer):
@@ -53,6 +111,98 @@ class BorrowingCreateSerializer(BorrowingListSerializer):
         )
 
     def validate_book(self, value: Book) -> Book:
-        if value.inventory == 0:
+        # A copy set aside for the user's hold is not in the inventory.
+        if value.inventory == 0 and not Hold.objects.filter(
+            book=value,
+            user=self.context["request"].user,
+            status=Hold.Status.READY,
+        ).exists():
             raise ValidationError("This book is out of stock")
         return value
+
+
+class HoldSerializer(serializers.ModelSerializer):
+    book = serializers.SlugRelatedField(
+        many=False,
+        queryset=Book.objects.all(),
+        slug_field="title",
+    )
+    user = serializers.SlugRelatedField(
+        many=False,
+        read_only=True,
+        slug_field="email",
+    )
+
+    class Meta:
+        model = Hold
+        fields = (
+            "id",
+            "book",
+            "user",
+            "status",
+            "created_at",
+            "ready_until",
+        )
+        read_only_fields = ("status", "created_at", "ready_until")
+        # Placing a hold checks open holds under the book lock.
+        validators = []
+
+
+class BorrowingBulkCreateSerializer(serializers.Serializer):
+    borrow_date = serializers.DateField()
+    expected_return_date = serializers.DateField()
+    books = serializers.ListField(
+        child=serializers.CharField(max_length=255),
+        allow_empty=False,
+        max_length=settings.BULK_BORROWING_MAX_ITEMS,
+    )
+
+
+class BorrowingBulkReturnSerializer(serializers.Serializer):
+    borrowings = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.BULK_BORROWING_MAX_ITEMS,
+    )
+
+
+class StatsRangeSerializer(serializers.Serializer):
+    start = serializers.DateField(
+        required=False,
+        help_text="First day, defaults to 30 days before `end`",
+    )
+    end = serializers.DateField(
+        required=False, help_text="Last day, defaults to yesterday"
+    )
+    limit = serializers.IntegerField(
+        required=False,
+        default=10,
+        min_value=1,
+        max_value=settings.LIBRARY_STATS_MAX_BOOKS,
+    )
+
+    def validate(self, attrs: dict) -> dict:
+        end = attrs.get("end") or (
+            timezone.now().date() - timedelta(days=1)
+        )
+        start = attrs.get("start") or (
+            end - timedelta(days=settings.LIBRARY_STATS_DEFAULT_DAYS - 1)
+        )
+        if start > end:
+            raise ValidationError({"start": ["Must not be after end"]})
+        return {**attrs, "start": start, "end": end}
+
+
+class DailyStatsSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    borrowings = serializers.IntegerField(source="borrowings_total")
+    returns = serializers.IntegerField(source="returns_total")
+    average_loan_days = serializers.FloatField(allow_null=True)
+
+
+class BookStatsSerializer(serializers.Serializer):
+    book_id = serializers.IntegerField()
+    title = serializers.CharField(source="book__title")
+    borrowings = serializers.IntegerField(source="borrowings_total")
+    returns = serializers.IntegerField(source="returns_total")
+    average_loan_days = serializers.FloatField(allow_null=True)
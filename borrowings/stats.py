@@ -0,0 +1,90 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Iterator
+
+from django.db import transaction
+from django.db.models import Count, FloatField, QuerySet, Sum
+from django.db.models.functions import Cast, NullIf
+
+from borrowings.fees import DaysBetween
+from borrowings.models import Borrowing, DailyBookStats
+
+
+def iter_days(start: date, end: date) -> Iterator[date]:
+    """Every day from `start` to `end`, both included."""
+    for offset in range((end - start).days + 1):
+        yield start + timedelta(days=offset)
+
+
+def aggregate_day(day: date) -> int:
+    """
+    Recount the borrowings and returns of `day` into `DailyBookStats`.
+
+    Reads only that day's rows through the borrow and return date
+    indexes and replaces the day's stats, so it is safe to rerun.
+    Returns the number of stats rows written.
+    """
+    stats = defaultdict(lambda: DailyBookStats(date=day))
+
+    borrowed = (
+        Borrowing.objects
+        .filter(borrow_date=day)
+        .order_by()
+        .values("book_id")
+        .annotate(count=Count("pk"))
+    )
+    for row in borrowed:
+        stats[row["book_id"]].borrowings = row["count"]
+
+    returned = (
+        Borrowing.objects
+        .filter(actual_return_date=day)
+        .order_by()
+        .values("book_id")
+        .annotate(
+            count=Count("pk"),
+            loan_days=Sum(DaysBetween("actual_return_date", "borrow_date")),
+        )
+    )
+    for row in returned:
+        stats[row["book_id"]].returns = row["count"]
+        stats[row["book_id"]].loan_days = max(row["loan_days"], 0)
+
+    for book_id, row in stats.items():
+        row.book_id = book_id
+
+    with transaction.atomic():
+        DailyBookStats.objects.filter(date=day).delete()
+        DailyBookStats.objects.bulk_create(stats.values())
+
+    return len(stats)
+
+
+def summarize_stats(queryset: QuerySet[DailyBookStats]) -> QuerySet:
+    """Total the stats of each group of a `values()` queryset."""
+    return queryset.annotate(
+        borrowings_total=Sum("borrowings"),
+        returns_total=Sum("returns"),
+        average_loan_days=(
+            Cast(Sum("loan_days"), FloatField())
+            / NullIf(Sum("returns"), 0)
+        ),
+    )
+
+
+def get_daily_stats(start: date, end: date) -> QuerySet:
+    return summarize_stats(
+        DailyBookStats.objects
+        .filter(date__range=(start, end))
+        .order_by("date")
+        .values("date")
+    )
+
+
+def get_book_stats(start: date, end: date, limit: int) -> QuerySet:
+    """The most borrowed books of the range."""
+    return summarize_stats(
+        DailyBookStats.objects
+        .filter(date__range=(start, end))
+        .values("book_id", "book__title")
+    ).order_by("-borrowings_total", "book_id")[:limit]
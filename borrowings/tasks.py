@@ -1,33 +1,183 @@
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db.models import Max, Min, Q, QuerySet
 from django.utils import timezone
 
-from celery import shared_task
+from celery import chord, group, shared_task
 
+from borrowings.counters import iter_user_batches, refresh_overdue_loans
+from borrowings.holds import expire_ready_holds
 from borrowings.models import Borrowing
+from borrowings.reports import (
+    merge_overdue_parts,
+    write_overdue_part,
+    write_overdue_report,
+)
+from borrowings.stats import aggregate_day, iter_days
+from users.models import User
 
 
-@shared_task
-def check_overdue_borrowings() -> None:
-    today = timezone.now().date()
+def get_overdue_borrowings(today: date) -> QuerySet:
+    return (
+        Borrowing.objects
+        .filter(
+            actual_return_date=None,
+            expected_return_date__lte=today
+        )
+        .order_by()
+        .values_list("id", "book__title", "expected_return_date")
+    )
+
 
-    borrowings = (
+def get_overdue_shards(today: date, shard_size: int) -> list[list[int]]:
+    """Split active overdue borrowings into `[start, stop)` id ranges."""
+    bounds = (
         Borrowing.objects
         .filter(
             actual_return_date=None,
             expected_return_date__lte=today
         )
-        .select_related("book")
-    )
-
-    with open("overdue_borrowings.txt", "a") as file:
-        file.write(f"Date: {today}.\n")
-        if borrowings.exists():
-            for borrowing in borrowings:
-                file.write(
-                    f"Borrowing ID is {borrowing.id}.\n"
-                    f"The return of the borrowed book "
-                    f"titled '{borrowing.book.title}' is overdue.\n"
-                    f"The expected return date "
-                    f"was {borrowing.expected_return_date}.\n\n"
-                )
-        else:
-            file.write("No borrowings overdue today!\n\n")
+        .aggregate(first=Min("id"), last=Max("id"))
+    )
+    if bounds["first"] is None:
+        return []
+    return [
+        [start, min(start + shard_size, bounds["last"] + 1)]
+        for start in range(bounds["first"], bounds["last"] + 1, shard_size)
+    ]
+
+
+@shared_task
+def check_overdue_borrowings(report_format: str = None) -> dict:
+    today = timezone.now().date()
+
+    rows = get_overdue_borrowings(today).iterator(
+        chunk_size=settings.OVERDUE_REPORT_CHUNK_SIZE
+    )
+    path, count = write_overdue_report(
+        rows,
+        today,
+        report_format or settings.OVERDUE_REPORT_FORMAT,
+    )
+
+    return {"date": today.isoformat(), "report": str(path), "overdue": count}
+
+
+@shared_task
+def check_overdue_borrowings_sharded(
+    report_format: str = None,
+    shard_size: int = None,
+    concurrency: int = None,
+) -> str:
+    """
+    Fan the overdue check out over id-range shards.
+
+    Shards are split into at most `concurrency` contiguous lanes, one
+    task each, and a chord merges the lanes' part files into the usual
+    dated report. Returns the id of the merge task.
+    """
+    today = timezone.now().date()
+    report_format = report_format or settings.OVERDUE_REPORT_FORMAT
+    shard_size = shard_size or settings.OVERDUE_SHARD_SIZE
+    concurrency = concurrency or settings.OVERDUE_SHARD_CONCURRENCY
+
+    shards = get_overdue_shards(today, shard_size)
+    merge = merge_overdue_shards.s(today.isoformat(), report_format)
+    if not shards:
+        return merge.delay([]).id
+
+    lane_size = -(-len(shards) // concurrency)
+    lanes = group(
+        check_overdue_shard.s(
+            today.isoformat(), shards[start:start + lane_size], report_format
+        )
+        for start in range(0, len(shards), lane_size)
+    )
+    return chord(lanes)(merge).id
+
+
+@shared_task
+def check_overdue_shard(
+    today: str,
+    shards: list[list[int]],
+    report_format: str,
+) -> dict:
+    today = date.fromisoformat(today)
+
+    def rows():
+        for start, stop in shards:
+            yield from (
+                get_overdue_borrowings(today)
+                .filter(id__gte=start, id__lt=stop)
+                .order_by("id")
+                .iterator(chunk_size=settings.OVERDUE_REPORT_CHUNK_SIZE)
+            )
+
+    path, count = write_overdue_part(rows(), today, report_format)
+    return {"part": str(path), "overdue": count}
+
+
+@shared_task
+def merge_overdue_shards(
+    results: list[dict],
+    today: str,
+    report_format: str,
+) -> dict:
+    path = merge_overdue_parts(
+        [result["part"] for result in results],
+        date.fromisoformat(today),
+        report_format,
+    )
+    return {
+        "date": today,
+        "report": str(path),
+        "overdue": sum(result["overdue"] for result in results),
+        "shards": len(results),
+    }
+
+
+@shared_task
+def refresh_overdue_loan_counters(batch_size: int = 1000) -> int:
+    """
+    Recount overdue loans of every user not refreshed today, so the
+    summary endpoint never has to. Meant to run daily from celery beat,
+    shortly after UTC midnight. Returns the number of users refreshed.
+    """
+    today = timezone.now().date()
+    stale = User.objects.filter(
+        Q(overdue_checked_on__lt=today) | Q(overdue_checked_on=None)
+    )
+    return sum(
+        refresh_overdue_loans(batch, today)
+        for batch in iter_user_batches(stale, batch_size)
+    )
+
+
+@shared_task
+def aggregate_daily_stats(days: int = None) -> dict:
+    """
+    Recount the last `days` days, up to yesterday, into the daily book
+    stats. Scheduled through django_celery_beat after UTC midnight.
+    """
+    days = days or settings.LIBRARY_STATS_WINDOW_DAYS
+    end = timezone.now().date() - timedelta(days=1)
+    start = end - timedelta(days=days - 1)
+
+    rows = sum(aggregate_day(day) for day in iter_days(start, end))
+
+    return {"start": start.isoformat(), "end": end.isoformat(), "rows": rows}
+
+
+@shared_task
+def expire_holds(batch_size: int = 500) -> int:
+    """
+    Expire ready holds nobody borrowed in time, passing each copy on to
+    the next waiting hold or back to the inventory. Scheduled every few
+    minutes through django_celery_beat. Returns the number expired.
+    """
+    now = timezone.now()
+    expired = 0
+    while count := expire_ready_holds(now, batch_size):
+        expired += count
+    return expired
@@ -0,0 +1,44 @@
+from collections import Counter
+
+from django.test import SimpleTestCase, TestCase
+
+from borrowings import benchmarks
+from borrowings.models import Borrowing
+from borrowings.seeding import seed_library
+
+
+class SeedLibraryTest(TestCase):
+    def test_skew_concentrates_borrowings(self):
+        library = seed_library(users=20, books=50, borrowings=2_000, skew=1.2)
+
+        self.assertEqual(len(library.user_ids), 20)
+        self.assertEqual(len(library.book_ids), 50)
+        books = Counter(
+            Borrowing.objects.values_list("book_id", flat=True)
+        )
+        self.assertEqual(books.most_common(1)[0][0], library.book_ids[0])
+        self.assertGreater(books[library.book_ids[0]], 2_000 / 50 * 5)
+
+
+class SummarizeTest(SimpleTestCase):
+    def test_percentiles(self):
+        summary = benchmarks.summarize(
+            [float(ms) for ms in range(1, 101)], [2] * 99 + [5], [2048]
+        )
+
+        self.assertEqual(summary["iterations"], 100)
+        self.assertAlmostEqual(summary["p50_ms"], 50.5)
+        self.assertAlmostEqual(summary["p95_ms"], 95.05)
+        self.assertAlmostEqual(summary["p99_ms"], 99.01)
+        self.assertEqual(summary["queries_per_request"], 2.03)
+        self.assertEqual(summary["max_queries"], 5)
+        self.assertEqual(summary["peak_memory_kib"], 2.0)
+
+    def test_compare(self):
+        baseline = {"results": {"a": {"p95_ms": 10.0}, "b": {"p95_ms": 4.0}}}
+        results = {"results": {"a": {"p95_ms": 12.0}, "c": {"p95_ms": 1.0}}}
+
+        changes = benchmarks.compare(results, baseline)
+
+        self.assertEqual(list(changes), ["a"])
+        self.assertAlmostEqual(changes["a"], 0.2)
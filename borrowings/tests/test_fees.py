@@ -0,0 +1,121 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.fees import annotate_fees, calculate_fee, summarize_fees
+from borrowings.models import Borrowing
+from users.models import User
+
+
+@override_settings(BORROWING_FINE_MULTIPLIER=Decimal("1.5"))
+class BorrowingFeeTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@test.com", password="pass123"
+        )
+        self.book = Book.objects.create(
+            title="Django Book",
+            author="Author",
+            cover=Book.CoverChoices.HARD,
+            inventory=5,
+            daily_fee=Decimal("1.25")
+        )
+        self.today = date(2026, 3, 31)
+
+    def create_borrowing(self, borrowed: int, expected: int, returned=None):
+        return Borrowing.objects.create(
+            borrow_date=self.today - timedelta(days=borrowed),
+            expected_return_date=self.today - timedelta(days=expected),
+            actual_return_date=(
+                None if returned is None
+                else self.today - timedelta(days=returned)
+            ),
+            book=self.book,
+            user=self.user
+        )
+
+    def test_fee_within_expected_period(self):
+        borrowing = self.create_borrowing(borrowed=10, expected=-4)
+
+        fee = calculate_fee(borrowing, self.today)
+
+        self.assertEqual(fee.base_fee, Decimal("17.50"))
+        self.assertEqual(fee.overdue_days, 0)
+        self.assertEqual(fee.overdue_fee, Decimal("0.00"))
+        self.assertEqual(fee.total_fee, Decimal("17.50"))
+
+    def test_open_overdue_borrowing_counts_until_today(self):
+        borrowing = self.create_borrowing(borrowed=10, expected=3)
+
+        fee = calculate_fee(borrowing, self.today)
+
+        self.assertEqual(fee.base_fee, Decimal("8.75"))
+        self.assertEqual(fee.overdue_days, 3)
+        self.assertEqual(fee.overdue_fee, Decimal("5.63"))
+
+    def test_returned_late_borrowing_counts_until_return(self):
+        borrowing = self.create_borrowing(
+            borrowed=10, expected=5, returned=3
+        )
+
+        fee = calculate_fee(borrowing, self.today)
+
+        self.assertEqual(fee.overdue_days, 2)
+        self.assertEqual(fee.overdue_fee, Decimal("3.75"))
+
+    def test_sql_fees_match_python_fees(self):
+        borrowings = [
+            self.create_borrowing(borrowed=10, expected=-4),
+            self.create_borrowing(borrowed=10, expected=3),
+            self.create_borrowing(borrowed=10, expected=5, returned=3),
+            self.create_borrowing(borrowed=30, expected=20, returned=25),
+        ]
+
+        with self.assertNumQueries(1):
+            annotated = {
+                borrowing.id: borrowing
+                for borrowing in annotate_fees(
+                    Borrowing.objects.all(), self.today
+                )
+            }
+
+        for borrowing in borrowings:
+            expected = calculate_fee(borrowing, self.today)
+            row = annotated[borrowing.id]
+            self.assertEqual(row.base_fee, expected.base_fee)
+            self.assertEqual(row.overdue_days, expected.overdue_days)
+            self.assertEqual(row.overdue_fee, expected.overdue_fee)
+            self.assertEqual(row.total_fee, expected.total_fee)
+
+    def test_summarize_fees_in_one_query(self):
+        self.create_borrowing(borrowed=10, expected=-4)
+        self.create_borrowing(borrowed=10, expected=3)
+
+        with self.assertNumQueries(1):
+            totals = summarize_fees(Borrowing.objects.all(), self.today)
+
+        self.assertEqual(totals["base_fee"], Decimal("26.25"))
+        self.assertEqual(totals["overdue_fee"], Decimal("5.63"))
+        self.assertEqual(totals["total_fee"], Decimal("31.88"))
+
+    def test_summarize_fees_of_empty_queryset(self):
+        totals = summarize_fees(Borrowing.objects.none(), self.today)
+        self.assertEqual(totals["total_fee"], Decimal("0.00"))
+
+    def test_detail_endpoint_includes_fee(self):
+        self.today = timezone.now().date()
+        borrowing = self.create_borrowing(borrowed=2, expected=-1)
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get(
+            reverse("borrowings:borrowing-detail", args=[borrowing.id])
+        )
+
+        self.assertEqual(response.data["fee"]["base_fee"], "3.75")
+        self.assertEqual(response.data["fee"]["overdue_days"], 0)
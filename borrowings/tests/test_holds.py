@@ -0,0 +1,282 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.holds import shelve_copies
+from borrowings.models import Borrowing, Hold
+from borrowings.tasks import expire_holds
+from users.models import User
+
+
+class HoldTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.today = timezone.now().date()
+        self.book = Book.objects.create(
+            title="Popular Book",
+            author="Author",
+            cover=Book.CoverChoices.HARD,
+            inventory=0,
+            daily_fee="1.00"
+        )
+        self.reader = User.objects.create_user(
+            email="reader@test.com", password="pass123"
+        )
+        self.first, self.second = (
+            User.objects.create_user(
+                email=f"holder{number}@test.com", password="pass123"
+            )
+            for number in range(2)
+        )
+
+    def hold(self, user: User, **kwargs) -> Hold:
+        return Hold.objects.create(book=self.book, user=user, **kwargs)
+
+    def lend(self, user: User = None) -> Borrowing:
+        return Borrowing.objects.create(
+            borrow_date=self.today,
+            expected_return_date=self.today + timedelta(days=7),
+            book=self.book,
+            user=user or self.reader,
+        )
+
+    def assertInventory(self, inventory: int) -> None:
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, inventory)
+
+    def assertStatus(self, hold: Hold, expected: str) -> None:
+        hold.refresh_from_db()
+        self.assertEqual(hold.status, expected)
+
+
+class HoldViewsTest(HoldTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("borrowings:hold-list-create")
+
+    def place(self, user: User, title: str = "Popular Book"):
+        self.client.force_authenticate(user)
+        return self.client.post(self.url, {"book": title}, format="json")
+
+    def test_anonymous_cannot_hold(self):
+        response = self.client.post(self.url, {"book": "Popular Book"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_place_hold_on_out_of_stock_book(self):
+        response = self.place(self.first)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["status"], Hold.Status.WAITING)
+        self.assertEqual(response.data["user"], self.first.email)
+
+    def test_cannot_hold_book_in_stock(self):
+        Book.objects.filter(pk=self.book.pk).update(inventory=1)
+
+        response = self.place(self.first)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("This book is in stock", str(response.data))
+
+    def test_cannot_hold_book_twice(self):
+        self.place(self.first)
+
+        response = self.place(self.first)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("You already hold this book", str(response.data))
+        self.assertEqual(Hold.objects.count(), 1)
+
+    def test_can_hold_again_after_cancelling(self):
+        self.hold(self.first, status=Hold.Status.CANCELLED)
+
+        response = self.place(self.first)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_user_sees_only_own_holds(self):
+        own = self.hold(self.first)
+        self.hold(self.second)
+        self.client.force_authenticate(self.first)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(
+            [hold["id"] for hold in response.data["results"]], [own.pk]
+        )
+
+    def test_cannot_cancel_foreign_hold(self):
+        hold = self.hold(self.second)
+        self.client.force_authenticate(self.first)
+
+        response = self.client.delete(
+            reverse("borrowings:hold-detail", args=[hold.pk])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertStatus(hold, Hold.Status.WAITING)
+
+    def test_cancel_waiting_hold(self):
+        hold = self.hold(self.first)
+        self.client.force_authenticate(self.first)
+
+        response = self.client.delete(
+            reverse("borrowings:hold-detail", args=[hold.pk])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertStatus(hold, Hold.Status.CANCELLED)
+        self.assertInventory(0)
+
+    def test_cancel_ready_hold_passes_copy_on(self):
+        ready = self.hold(self.first, status=Hold.Status.READY)
+        waiting = self.hold(self.second)
+        self.client.force_authenticate(self.first)
+
+        self.client.delete(reverse("borrowings:hold-detail", args=[ready.pk]))
+
+        self.assertStatus(ready, Hold.Status.CANCELLED)
+        self.assertStatus(waiting, Hold.Status.READY)
+        self.assertInventory(0)
+
+
+class HoldAllocationTest(HoldTestCase):
+    def return_book(self, borrowing: Borrowing):
+        self.client.force_authenticate(borrowing.user)
+        return self.client.post(
+            reverse("borrowings:borrowing-return", args=[borrowing.pk])
+        )
+
+    def borrow(self, user: User):
+        self.client.force_authenticate(user)
+        return self.client.post(
+            reverse("borrowings:borrowing-list-create"),
+            {
+                "borrow_date": str(self.today),
+                "expected_return_date": str(self.today + timedelta(days=7)),
+                "book": self.book.title,
+            },
+            format="json",
+        )
+
+    def test_return_goes_to_oldest_waiting_hold(self):
+        first = self.hold(self.first)
+        second = self.hold(self.second)
+
+        response = self.return_book(self.lend())
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertStatus(first, Hold.Status.READY)
+        self.assertStatus(second, Hold.Status.WAITING)
+        self.assertGreater(first.ready_until, timezone.now())
+        self.assertInventory(0)
+
+    def test_return_without_holds_restocks(self):
+        self.hold(self.first, status=Hold.Status.CANCELLED)
+
+        self.return_book(self.lend())
+
+        self.assertInventory(1)
+
+    def test_only_ready_holder_can_borrow_set_aside_copy(self):
+        hold = self.hold(self.first)
+        self.return_book(self.lend())
+
+        response = self.borrow(self.second)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("This book is out of stock", str(response.data))
+
+        response = self.borrow(self.first)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertStatus(hold, Hold.Status.FULFILLED)
+        self.assertInventory(0)
+
+    def test_ready_holder_can_bulk_borrow_set_aside_copy(self):
+        hold = self.hold(self.first)
+        self.return_book(self.lend())
+        self.client.force_authenticate(self.first)
+
+        response = self.client.post(
+            reverse("borrowings:borrowing-bulk-create"),
+            {
+                "borrow_date": str(self.today),
+                "expected_return_date": str(self.today + timedelta(days=7)),
+                "books": [self.book.title, self.book.title],
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        results = response.data["results"]
+        self.assertIn("borrowing", results[0])
+        self.assertEqual(results[1]["error"], "This book is out of stock")
+        self.assertStatus(hold, Hold.Status.FULFILLED)
+        self.assertInventory(0)
+
+    def test_bulk_return_allocates_per_copy(self):
+        first = self.hold(self.first)
+        second = self.hold(self.second)
+        borrowings = [self.lend() for _ in range(3)]
+        self.client.force_authenticate(self.reader)
+
+        self.client.post(
+            reverse("borrowings:borrowing-bulk-return"),
+            {"borrowings": [borrowing.pk for borrowing in borrowings]},
+            format="json",
+        )
+
+        self.assertStatus(first, Hold.Status.READY)
+        self.assertStatus(second, Hold.Status.READY)
+        self.assertInventory(1)
+
+    def test_next_in_line_costs_the_same_for_any_queue(self):
+        for holders in (1, 50):
+            Hold.objects.bulk_create(
+                Hold(book=self.book, user=user)
+                for user in User.objects.bulk_create(
+                    User(email=f"queue{holders}-{number}@test.com")
+                    for number in range(holders)
+                )
+            )
+            # Lock, queue head, hold update.
+            with self.subTest(holders=holders), self.assertNumQueries(3):
+                shelve_copies({self.book.pk: 1})
+
+
+class ExpireHoldsTest(HoldTestCase):
+    def test_expired_hold_passes_copy_to_next_in_line(self):
+        now = timezone.now()
+        stale = self.hold(
+            self.first,
+            status=Hold.Status.READY,
+            ready_until=now - timedelta(minutes=1),
+        )
+        fresh = self.hold(
+            self.reader,
+            status=Hold.Status.READY,
+            ready_until=now + timedelta(hours=1),
+        )
+        waiting = self.hold(self.second)
+
+        self.assertEqual(expire_holds(), 1)
+
+        self.assertStatus(stale, Hold.Status.EXPIRED)
+        self.assertStatus(fresh, Hold.Status.READY)
+        self.assertStatus(waiting, Hold.Status.READY)
+        self.assertInventory(0)
+
+    def test_expired_hold_without_queue_restocks(self):
+        hold = self.hold(
+            self.first,
+            status=Hold.Status.READY,
+            ready_until=timezone.now() - timedelta(minutes=1),
+        )
+
+        expire_holds(batch_size=1)
+
+        self.assertStatus(hold, Hold.Status.EXPIRED)
+        self.assertInventory(1)
@@ -0,0 +1,241 @@
+from datetime import timedelta
+from itertools import count
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from Library_Service_API.explain import explain_scans, is_unbounded_scan
+from Library_Service_API.testing import ConstantQueriesMixin, query_budget
+from books.models import Book
+from borrowings.models import Borrowing, DailyBookStats
+from borrowings.pagination import BorrowingPagination
+from users.models import User
+
+numbers = count()
+
+
+class BorrowingQueryCountTest(ConstantQueriesMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            email="admin@test.com", password="pass123"
+        )
+        self.user = User.objects.create_user(
+            email="user@test.com", password="pass123"
+        )
+        self.today = timezone.now().date()
+
+    def create_books(self, rows: int) -> list[Book]:
+        return Book.objects.bulk_create(
+            Book(
+                title=f"Book {next(numbers)}",
+                author="Author",
+                cover=Book.CoverChoices.SOFT,
+                inventory=100,
+                daily_fee="1.00",
+            )
+            for _ in range(rows)
+        )
+
+    def create_borrowings(self, rows: int) -> list[Borrowing]:
+        """One new book and user per borrowing, half of them the user's."""
+        books = self.create_books(rows)
+        users = User.objects.bulk_create(
+            User(email=f"reader{next(numbers)}@test.com")
+            for _ in range(rows)
+        )
+        return Borrowing.objects.bulk_create(
+            Borrowing(
+                user=self.user if number % 2 else users[number],
+                book=book,
+                borrow_date=self.today - timedelta(days=number),
+                expected_return_date=self.today + timedelta(days=7),
+            )
+            for number, book in enumerate(books)
+        )
+
+    def get(self, url: str, user: User, **params):
+        return self.client.get(
+            url,
+            {"page_size": 100, **params},
+            HTTP_AUTHORIZE=f"Bearer {AccessToken.for_user(user)}",
+        )
+
+    def test_list(self):
+        for url in (
+            reverse("borrowings:borrowing-list-create"),
+            reverse("async-borrowings:borrowing-list"),
+        ):
+            for user in (self.admin, self.user):
+                with self.subTest(url=url, user=user.email):
+                    self.assertConstantQueries(
+                        self.create_borrowings, lambda: self.get(url, user)
+                    )
+
+    def test_filtered_list(self):
+        self.assertConstantQueries(
+            self.create_borrowings,
+            lambda: self.get(
+                reverse("borrowings:borrowing-list-create"),
+                self.admin,
+                is_active=1,
+                user_id=self.user.pk,
+            ),
+        )
+
+    def test_detail(self):
+        borrowing = self.create_borrowings(2)[1]
+        for url in (
+            reverse("borrowings:borrowing-detail", args=[borrowing.pk]),
+            reverse(
+                "async-borrowings:borrowing-detail", args=[borrowing.pk]
+            ),
+        ):
+            with self.subTest(url=url), query_budget(2):
+                response = self.get(url, self.user)
+            self.assertEqual(response.status_code, 200)
+
+    def test_bulk_borrow(self):
+        self.client.force_authenticate(self.user)
+        books = []
+
+        def seed(rows: int) -> None:
+            books.extend(self.create_books(rows))
+
+        self.assertConstantQueries(
+            seed,
+            lambda: self.client.post(
+                reverse("borrowings:borrowing-bulk-create"),
+                {
+                    "borrow_date": str(self.today),
+                    "expected_return_date": str(self.today),
+                    "books": [book.title for book in books],
+                },
+                format="json",
+            ),
+            status=201,
+        )
+
+    def test_bulk_return(self):
+        self.client.force_authenticate(self.admin)
+        borrowings = []
+
+        def seed(rows: int) -> None:
+            borrowings.extend(self.create_borrowings(rows))
+
+        self.assertConstantQueries(
+            seed,
+            lambda: self.client.post(
+                reverse("borrowings:borrowing-bulk-return"),
+                {"borrowings": [borrowing.pk for borrowing in borrowings]},
+                format="json",
+            ),
+            status=201,
+        )
+
+    def create_stats(self, rows: int) -> None:
+        """Stats of new books, spread over the default range of days."""
+        DailyBookStats.objects.bulk_create(
+            DailyBookStats(
+                date=self.today - timedelta(days=1 + number % 30),
+                book=book,
+                borrowings=number,
+                returns=1,
+                loan_days=number,
+            )
+            for number, book in enumerate(self.create_books(rows))
+        )
+
+    def test_stats(self):
+        self.client.force_authenticate(self.admin)
+        for url in (
+            reverse("borrowings:stats-daily"),
+            reverse("borrowings:stats-books"),
+        ):
+            with self.subTest(url=url):
+                self.assertConstantQueries(
+                    self.create_stats,
+                    lambda: self.client.get(url, {"limit": 100}),
+                )
+
+    def test_admin_changelists(self):
+        self.client.force_login(self.admin)
+        for url, seed in (
+            (
+                reverse("admin:borrowings_borrowing_changelist"),
+                self.create_borrowings,
+            ),
+            (
+                reverse("admin:borrowings_dailybookstats_changelist"),
+                self.create_stats,
+            ),
+        ):
+            with self.subTest(url=url):
+                self.assertConstantQueries(seed, lambda: self.client.get(url))
+
+
+class KeysetPaginationPlanTest(TestCase):
+    def setUp(self):
+        today = timezone.now().date()
+        book = Book.objects.create(
+            title="Book",
+            author="Author",
+            cover=Book.CoverChoices.SOFT,
+            inventory=1,
+            daily_fee="1.00",
+        )
+        user = User.objects.create_user(email="user@test.com")
+        self.borrowings = Borrowing.objects.bulk_create(
+            Borrowing(
+                user=user,
+                book=book,
+                borrow_date=today - timedelta(days=number),
+                expected_return_date=today,
+            )
+            for number in range(500)
+        )
+        self.paginator = BorrowingPagination()
+        self.paginator.ordering = BorrowingPagination.ordering
+        # Too few rows for the planner to prefer the index on its own.
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def explain_page(self, depth: float) -> dict:
+        position = self.paginator._get_position_from_instance(
+            self.borrowings[int(len(self.borrowings) * depth)],
+            self.paginator.ordering,
+        )
+        queryset = (
+            Borrowing.objects
+            .order_by(*self.paginator.ordering)
+            .filter(
+                self.paginator.get_keyset_filter(
+                    Borrowing.objects.all(), position, False
+                )
+            )
+            [:BorrowingPagination.page_size + 1]
+        )
+        [scan] = explain_scans(
+            queryset, Borrowing._meta.db_table, analyze=True
+        )
+        return scan
+
+    def test_deep_pages_cost_the_same(self):
+        scans = [self.explain_page(depth) for depth in (0.1, 0.5, 0.95)]
+
+        for scan in scans:
+            self.assertFalse(is_unbounded_scan(scan), scan)
+        self.assertEqual(
+            {scan.get("Rows Removed by Filter", 0) for scan in scans},
+            {scans[0].get("Rows Removed by Filter", 0)},
+        )
+        self.assertLessEqual(
+            scans[-1].get("Rows Removed by Filter", 0),
+            BorrowingPagination.page_size,
+        )
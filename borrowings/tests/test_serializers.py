@@ -0,0 +1,80 @@
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+
+from books.models import Book
+from borrowings.models import Borrowing
+from borrowings.serializers import (
+    BorrowingListSerializer,
+    BorrowingListValuesSerializer,
+)
+from users.models import User
+
+
+class BorrowingListValuesSerializerTest(TestCase):
+    def setUp(self):
+        users = [
+            User.objects.create_user(
+                email=f"user{number}@test.com", password="pass123"
+            )
+            for number in range(2)
+        ]
+        books = [
+            Book.objects.create(
+                title=f"Book é \"{number}\"",
+                author="Author",
+                cover=Book.CoverChoices.HARD,
+                inventory=5,
+                daily_fee=Decimal("1.25")
+            )
+            for number in range(3)
+        ]
+        start = date(2026, 1, 1)
+        for number in range(12):
+            Borrowing.objects.create(
+                borrow_date=start + timedelta(days=number),
+                expected_return_date=start + timedelta(days=number + 7),
+                actual_return_date=(
+                    start + timedelta(days=number + 3)
+                    if number % 2 else None
+                ),
+                book=books[number % 3],
+                user=users[number % 2]
+            )
+
+    def test_matches_list_serializer(self):
+        queryset = Borrowing.objects.select_related("user", "book")
+
+        expected = BorrowingListSerializer(queryset, many=True).data
+        actual = BorrowingListValuesSerializer(
+            BorrowingListValuesSerializer.project(queryset), many=True
+        ).data
+
+        self.assertEqual(
+            JSONRenderer().render(actual), JSONRenderer().render(expected)
+        )
+        self.assertEqual(len(json.loads(JSONRenderer().render(actual))), 12)
+
+    def test_single_row_matches_list_serializer(self):
+        borrowing = Borrowing.objects.filter(actual_return_date=None).first()
+        row = BorrowingListValuesSerializer.project(
+            Borrowing.objects.filter(pk=borrowing.pk)
+        ).get()
+
+        self.assertEqual(
+            BorrowingListValuesSerializer(row).data,
+            BorrowingListSerializer(borrowing).data,
+        )
+
+    def test_projection_selects_only_output_columns(self):
+        sql = str(
+            BorrowingListValuesSerializer.project(
+                Borrowing.objects.select_related("user", "book")
+            ).query
+        )
+
+        self.assertNotIn("daily_fee", sql)
+        self.assertNotIn("password", sql)
@@ -0,0 +1,219 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.models import Borrowing, DailyBookStats
+from borrowings.stats import aggregate_day
+from borrowings.tasks import aggregate_daily_stats
+from users.models import User
+
+
+class DailyStatsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@test.com", password="pass123"
+        )
+        self.dune, self.solaris = (
+            Book.objects.create(
+                title=title,
+                author="Author",
+                cover=Book.CoverChoices.HARD,
+                inventory=5,
+                daily_fee="1.00"
+            )
+            for title in ("Dune", "Solaris")
+        )
+        self.day = date(2026, 3, 10)
+
+    def borrow(self, book: Book, borrowed: date, returned: date = None):
+        return Borrowing.objects.create(
+            borrow_date=borrowed,
+            expected_return_date=borrowed + timedelta(days=14),
+            actual_return_date=returned,
+            book=book,
+            user=self.user
+        )
+
+    def get_stats(self, day: date) -> dict:
+        return {
+            row.book_id: (row.borrowings, row.returns, row.loan_days)
+            for row in DailyBookStats.objects.filter(date=day)
+        }
+
+    def test_aggregate_day_counts_borrowings_and_returns(self):
+        self.borrow(self.dune, self.day)
+        self.borrow(self.dune, self.day, returned=self.day)
+        self.borrow(self.solaris, self.day - timedelta(days=4), self.day)
+        self.borrow(self.solaris, self.day - timedelta(days=1))
+        self.borrow(self.solaris, self.day + timedelta(days=1))
+
+        self.assertEqual(aggregate_day(self.day), 2)
+        self.assertEqual(
+            self.get_stats(self.day),
+            {self.dune.pk: (2, 1, 0), self.solaris.pk: (0, 1, 4)},
+        )
+
+    def test_aggregate_day_is_idempotent(self):
+        self.borrow(self.dune, self.day)
+        aggregate_day(self.day)
+        self.borrow(self.solaris, self.day)
+        Borrowing.objects.filter(book=self.dune).delete()
+
+        aggregate_day(self.day)
+
+        self.assertEqual(
+            self.get_stats(self.day), {self.solaris.pk: (1, 0, 0)}
+        )
+
+    def test_task_recounts_the_window_up_to_yesterday(self):
+        today = timezone.now().date()
+        for days_ago in range(5):
+            self.borrow(self.dune, today - timedelta(days=days_ago))
+
+        result = aggregate_daily_stats(days=3)
+
+        self.assertEqual(result["rows"], 3)
+        self.assertEqual(
+            sorted(DailyBookStats.objects.values_list("date", flat=True)),
+            [today - timedelta(days=days_ago) for days_ago in (3, 2, 1)],
+        )
+
+    def test_backfill_command(self):
+        self.borrow(self.dune, self.day - timedelta(days=40), self.day)
+
+        call_command(
+            "backfill_library_stats",
+            until=self.day,
+            stdout=StringIO(),
+        )
+
+        self.assertEqual(
+            DailyBookStats.objects.filter(book=self.dune).count(), 2
+        )
+
+
+class StatsViewsTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.staff = User.objects.create_user(
+            email="staff@test.com", password="pass123", is_staff=True
+        )
+        self.client.force_authenticate(self.staff)
+        self.books = [
+            Book.objects.create(
+                title=f"Book {number}",
+                author="Author",
+                cover=Book.CoverChoices.SOFT,
+                inventory=5,
+                daily_fee="1.00"
+            )
+            for number in range(3)
+        ]
+        self.day = date(2026, 3, 10)
+        DailyBookStats.objects.bulk_create([
+            DailyBookStats(
+                date=self.day, book=self.books[0], borrowings=3
+            ),
+            DailyBookStats(
+                date=self.day,
+                book=self.books[1],
+                borrowings=1,
+                returns=2,
+                loan_days=9,
+            ),
+            DailyBookStats(
+                date=self.day + timedelta(days=1),
+                book=self.books[1],
+                borrowings=4,
+                returns=1,
+                loan_days=3,
+            ),
+            DailyBookStats(
+                date=self.day + timedelta(days=40),
+                book=self.books[2],
+                borrowings=50,
+            ),
+        ])
+        self.params = {
+            "start": self.day.isoformat(),
+            "end": (self.day + timedelta(days=1)).isoformat(),
+        }
+
+    def test_non_staff_cannot_read_stats(self):
+        self.client.force_authenticate(
+            User.objects.create_user(email="user@test.com", password="p")
+        )
+
+        for name in ("stats-daily", "stats-books"):
+            response = self.client.get(reverse(f"borrowings:{name}"))
+            self.assertEqual(
+                response.status_code, status.HTTP_403_FORBIDDEN
+            )
+
+    def test_daily_stats(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse("borrowings:stats-daily"), self.params
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [
+            {
+                "date": "2026-03-10",
+                "borrowings": 4,
+                "returns": 2,
+                "average_loan_days": 4.5,
+            },
+            {
+                "date": "2026-03-11",
+                "borrowings": 4,
+                "returns": 1,
+                "average_loan_days": 3.0,
+            },
+        ])
+
+    def test_most_borrowed_books(self):
+        response = self.client.get(
+            reverse("borrowings:stats-books"), {**self.params, "limit": 1}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [{
+            "book_id": self.books[1].pk,
+            "title": "Book 1",
+            "borrowings": 5,
+            "returns": 3,
+            "average_loan_days": 4.0,
+        }])
+
+    def test_stats_without_returns_have_no_average(self):
+        response = self.client.get(
+            reverse("borrowings:stats-books"), self.params
+        )
+
+        self.assertEqual(response.data["results"][1]["title"], "Book 0")
+        self.assertIsNone(response.data["results"][1]["average_loan_days"])
+
+    def test_default_range_ends_yesterday(self):
+        response = self.client.get(reverse("borrowings:stats-daily"))
+
+        yesterday = timezone.now().date() - timedelta(days=1)
+        self.assertEqual(response.data["end"], yesterday)
+        self.assertEqual(
+            response.data["start"], yesterday - timedelta(days=29)
+        )
+
+    def test_invalid_range(self):
+        response = self.client.get(
+            reverse("borrowings:stats-daily"),
+            {"start": "2026-03-12", "end": "2026-03-10"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,237 @@
+import csv
+import json
+import os
+import tempfile
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from django_celery_beat.models import PeriodicTask
+
+from books.models import Book
+from borrowings.models import Borrowing
+from borrowings.celery import app, close_obsolete_connections
+from borrowings.reports import get_report_path
+from borrowings.tasks import (
+    check_overdue_borrowings,
+    check_overdue_borrowings_sharded,
+    get_overdue_shards,
+)
+from users.models import User
+
+
+class CheckOverdueBorrowingsTest(TestCase):
+    def setUp(self):
+        self.report_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.report_dir.cleanup)
+
+        self.user = User.objects.create_user(
+            email="user@test.com", password="pass123"
+        )
+        self.book = Book.objects.create(
+            title="Django Book",
+            author="Author",
+            cover=Book.CoverChoices.HARD,
+            inventory=5,
+            daily_fee="1.50"
+        )
+        self.today = timezone.now().date()
+
+    def create_borrowing(self, days_overdue: int, returned: bool = False):
+        expected_return_date = self.today - timedelta(days=days_overdue)
+        return Borrowing.objects.create(
+            borrow_date=expected_return_date - timedelta(days=7),
+            expected_return_date=expected_return_date,
+            actual_return_date=self.today if returned else None,
+            book=self.book,
+            user=self.user
+        )
+
+    def run_task(self, report_format: str) -> dict:
+        with override_settings(OVERDUE_REPORT_DIR=self.report_dir.name):
+            return check_overdue_borrowings(report_format)
+
+    def test_text_report_lists_only_overdue_borrowings(self):
+        overdue = self.create_borrowing(days_overdue=3)
+        self.create_borrowing(days_overdue=3, returned=True)
+        self.create_borrowing(days_overdue=-3)
+
+        with self.assertNumQueries(1):
+            result = self.run_task("text")
+
+        self.assertEqual(result["overdue"], 1)
+        with open(result["report"]) as file:
+            report = file.read()
+        self.assertTrue(report.startswith(f"Date: {self.today}.\n"))
+        self.assertIn(f"Borrowing ID is {overdue.id}.", report)
+        self.assertIn("titled 'Django Book' is overdue", report)
+
+    def test_text_report_without_overdue_borrowings(self):
+        result = self.run_task("text")
+
+        self.assertEqual(result["overdue"], 0)
+        with open(result["report"]) as file:
+            self.assertIn("No borrowings overdue today!", file.read())
+
+    def test_jsonl_report(self):
+        overdue = self.create_borrowing(days_overdue=1)
+
+        result = self.run_task("jsonl")
+
+        self.assertTrue(result["report"].endswith(f"{self.today}.jsonl"))
+        with open(result["report"]) as file:
+            rows = [json.loads(line) for line in file]
+        self.assertEqual(rows, [{
+            "id": overdue.id,
+            "book": "Django Book",
+            "expected_return_date": overdue.expected_return_date.isoformat(),
+        }])
+
+    def test_csv_report(self):
+        overdue = self.create_borrowing(days_overdue=0)
+
+        result = self.run_task("csv")
+
+        with open(result["report"], newline="") as file:
+            rows = list(csv.reader(file))
+        self.assertEqual(rows, [
+            ["id", "book", "expected_return_date"],
+            [str(overdue.id), "Django Book",
+             overdue.expected_return_date.isoformat()],
+        ])
+
+    def test_rerun_replaces_report_atomically(self):
+        self.create_borrowing(days_overdue=1)
+        first = self.run_task("jsonl")
+        self.create_borrowing(days_overdue=2)
+
+        second = self.run_task("jsonl")
+
+        self.assertEqual(first["report"], second["report"])
+        with open(second["report"]) as file:
+            self.assertEqual(len(file.readlines()), 2)
+        self.assertEqual(
+            os.listdir(self.report_dir.name),
+            [f"overdue_borrowings_{self.today}.jsonl"],
+        )
+
+
+class CheckOverdueBorrowingsShardedTest(TestCase):
+    def setUp(self):
+        self.report_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.report_dir.cleanup)
+
+        app.conf.task_always_eager = True
+        self.addCleanup(setattr, app.conf, "task_always_eager", False)
+
+        self.user = User.objects.create_user(
+            email="user@test.com", password="pass123"
+        )
+        self.book = Book.objects.create(
+            title="Django Book",
+            author="Author",
+            cover=Book.CoverChoices.HARD,
+            inventory=5,
+            daily_fee="1.50"
+        )
+        self.today = timezone.now().date()
+        self.overdue = [
+            Borrowing.objects.create(
+                borrow_date=self.today - timedelta(days=10),
+                expected_return_date=self.today - timedelta(days=1),
+                actual_return_date=returned,
+                book=self.book,
+                user=self.user
+            )
+            for returned in (None, self.today, None, None, None)
+        ]
+
+    def run_task(self, report_format: str, **kwargs) -> str:
+        with override_settings(OVERDUE_REPORT_DIR=self.report_dir.name):
+            check_overdue_borrowings_sharded(report_format, **kwargs)
+            path = get_report_path(self.today, report_format)
+        with open(path, newline="") as file:
+            return file.read()
+
+    def test_shards_cover_active_overdue_id_range(self):
+        first, last = self.overdue[0].id, self.overdue[-1].id
+
+        shards = get_overdue_shards(self.today, shard_size=2)
+
+        self.assertEqual(shards[0][0], first)
+        self.assertEqual(shards[-1][1], last + 1)
+        self.assertTrue(all(stop - start <= 2 for start, stop in shards))
+
+    def test_merged_report_matches_single_task(self):
+        with override_settings(OVERDUE_REPORT_DIR=self.report_dir.name):
+            single = check_overdue_borrowings("csv")
+        with open(single["report"], newline="") as file:
+            expected = file.read()
+
+        report = self.run_task("csv", shard_size=1, concurrency=2)
+
+        self.assertEqual(report, expected)
+        self.assertEqual(len(report.splitlines()), 5)
+        self.assertEqual(len(os.listdir(self.report_dir.name)), 1)
+
+    def test_failed_merge_removes_parts(self):
+        with mock.patch(
+            "borrowings.reports.shutil.copyfileobj", side_effect=OSError
+        ), override_settings(OVERDUE_REPORT_DIR=self.report_dir.name):
+            check_overdue_borrowings_sharded("csv", shard_size=1)
+
+        self.assertEqual(os.listdir(self.report_dir.name), [])
+
+    def test_no_overdue_borrowings(self):
+        Borrowing.objects.update(actual_return_date=self.today)
+
+        report = self.run_task("text")
+
+        self.assertIn("No borrowings overdue today!", report)
+
+
+class BeatScheduleTest(TestCase):
+    """Daily tasks work on UTC dates and must run after UTC midnight."""
+
+    def assert_runs_after_utc_midnight(self, task: str) -> None:
+        crontab = PeriodicTask.objects.get(task=task).crontab
+        self.assertEqual(str(crontab.timezone), settings.TIME_ZONE)
+        self.assertEqual(crontab.hour, "0")
+
+    def test_daily_stats(self):
+        self.assert_runs_after_utc_midnight(
+            "borrowings.tasks.aggregate_daily_stats"
+        )
+
+    def test_overdue_check(self):
+        self.assert_runs_after_utc_midnight(
+            "borrowings.tasks.check_overdue_borrowings_sharded"
+        )
+
+    def test_overdue_loan_counters(self):
+        self.assert_runs_after_utc_midnight(
+            "borrowings.tasks.refresh_overdue_loan_counters"
+        )
+
+
+class CeleryConnectionsTest(SimpleTestCase):
+    def run_signal(self, is_eager: bool) -> mock.Mock:
+        task = SimpleNamespace(request=SimpleNamespace(is_eager=is_eager))
+        with mock.patch(
+            "borrowings.celery.close_old_connections"
+        ) as close_old_connections:
+            close_obsolete_connections(sender=task)
+        return close_old_connections
+
+    def test_worker_tasks_close_obsolete_connections(self):
+        self.run_signal(is_eager=False).assert_called_once_with()
+
+    def test_eager_tasks_keep_the_callers_connection(self):
+        self.run_signal(is_eager=True).assert_not_called()
+
+    def test_worker_reuses_connections(self):
+        self.assertGreater(app.conf.db_reuse_max, 1)
@@ -1,12 +1,24 @@
+from base64 import b64encode
+from unittest.mock import patch
+from urllib.parse import urlencode
+
 from django.test import TestCase
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
+from rest_framework.response import Response
+from rest_framework_simplejwt.tokens import AccessToken
 
 from books.models import Book
 from users.models import User
 from borrowings.models import Borrowing
+from borrowings.pagination import BorrowingPagination
+from borrowings.serializers import (
+    BorrowingCreateSerializer,
+    BorrowingListSerializer,
+)
+from borrowings.views import BorrowingReturnView
 
 
 class BorrowingListCreateViewTest(TestCase):
@@ -55,8 +67,8 @@ class BorrowingListCreateViewTest(TestCase):
         response = self.client.get(self.url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], own.id)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], own.id)
 
     def test_admin_sees_all_borrowings(self):
         Borrowing.objects.create(
@@ -76,7 +88,7 @@ class BorrowingListCreateViewTest(TestCase):
         response = self.client.get(self.url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data["results"]), 2)
 
     def test_filter_is_active(self):
         active = Borrowing.objects.create(
@@ -97,8 +109,8 @@ class BorrowingListCreateViewTest(TestCase):
         self.client.force_authenticate(self.user)
         response = self.client.get(self.url + "?is_active=1")
 
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], active.id)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], active.id)
 
     def test_filter_user_id_only_for_admin(self):
         b1 = Borrowing.objects.create(
@@ -116,13 +128,13 @@ class BorrowingListCreateViewTest(TestCase):
 
         self.client.force_authenticate(self.user)
         response = self.client.get(self.url + f"?user_id={self.admin.id}")
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], b1.id)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], b1.id)
 
         self.client.force_authenticate(self.admin)
         response = self.client.get(self.url + f"?user_id={self.user.id}")
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], b1.id)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], b1.id)
 
     # CREATE TESTS
 
@@ -176,6 +188,29 @@ class BorrowingListCreateViewTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("This book is out of stock", str(response.data))
 
+    def test_cannot_create_if_stock_runs_out_after_validation(self):
+        self.client.force_authenticate(self.user)
+
+        with patch.object(
+            BorrowingCreateSerializer,
+            "validate_book",
+            side_effect=lambda book: book
+        ):
+            self.book.inventory = 0
+            self.book.save()
+            response = self.client.post(self.url, {
+                "borrow_date": "2024-01-01",
+                "expected_return_date": "2024-01-02",
+                "book": self.book.title
+            })
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("This book is out of stock", str(response.data))
+        self.assertEqual(Borrowing.objects.count(), 0)
+
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 0)
+
 
 class BorrowingReturnViewTest(TestCase):
     def setUp(self):
@@ -260,3 +295,445 @@ class BorrowingReturnViewTest(TestCase):
 
         self.book.refresh_from_db()
         self.assertEqual(self.book.inventory, 2)
+
+    def test_stale_borrowing_is_not_returned_twice(self):
+        Borrowing.objects.filter(pk=self.borrowing.pk).update(
+            actual_return_date=timezone.now().date()
+        )
+
+        returned = BorrowingReturnView.return_one_book(self.borrowing)
+
+        self.assertFalse(returned)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 1)
+
+
+class BorrowingPaginationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.admin = User.objects.create_user(
+            email="admin@test.com", password="pass123", is_staff=True
+        )
+        self.book = Book.objects.create(
+            title="Django Book",
+            author="Author",
+            cover=Book.CoverChoices.HARD,
+            inventory=5,
+            daily_fee="1.50"
+        )
+
+        today = timezone.now().date()
+        self.borrowings = [
+            Borrowing.objects.create(
+                borrow_date=today - timezone.timedelta(days=days),
+                expected_return_date=today,
+                book=self.book,
+                user=self.admin
+            )
+            for days in (0, 0, 0, 1, 1, 2, 3)
+        ]
+
+        self.url = reverse("borrowings:borrowing-list-create")
+        self.client.force_authenticate(self.admin)
+
+    def expected_ids(self):
+        ordered = sorted(
+            self.borrowings,
+            key=lambda borrowing: (-borrowing.borrow_date.toordinal(),
+                                   borrowing.id)
+        )
+        return [borrowing.id for borrowing in ordered]
+
+    def test_next_links_walk_whole_list_in_order(self):
+        ids = []
+        url = self.url + "?page_size=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            ids += [item["id"] for item in response.data["results"]]
+            url = response.data["next"]
+
+        self.assertEqual(ids, self.expected_ids())
+
+    def test_previous_link_returns_preceding_page(self):
+        first = self.client.get(self.url + "?page_size=3")
+        second = self.client.get(first.data["next"])
+        previous = self.client.get(second.data["previous"])
+
+        self.assertIsNone(first.data["previous"])
+        self.assertEqual(previous.data["results"], first.data["results"])
+
+    @patch.object(BorrowingPagination, "max_page_size", 3)
+    def test_page_size_is_capped(self):
+        response = self.client.get(self.url + "?page_size=1000")
+
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_invalid_cursor_returns_not_found(self):
+        response = self.client.get(self.url + "?cursor=cD1vb3Bz")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_malformed_position_returns_not_found(self):
+        for position in (
+            '["notadate",1]',
+            "[[1],[2]]",
+            "[null,null]",
+            '["2024-01-01","x"]',
+        ):
+            with self.subTest(position=position):
+                cursor = b64encode(urlencode({"p": position}).encode())
+                response = self.client.get(
+                    self.url, {"cursor": cursor.decode()}
+                )
+
+                self.assertEqual(
+                    response.status_code, status.HTTP_404_NOT_FOUND
+                )
+
+
+class BorrowingConditionalGetTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            email="user@test.com", password="pass123"
+        )
+        self.book = Book.objects.create(
+            title="Django Book",
+            author="Author",
+            cover=Book.CoverChoices.HARD,
+            inventory=5,
+            daily_fee="1.50"
+        )
+        self.borrowing = Borrowing.objects.create(
+            borrow_date=timezone.now().date(),
+            expected_return_date=timezone.now().date(),
+            book=self.book,
+            user=self.user
+        )
+
+        self.list_url = reverse("borrowings:borrowing-list-create")
+        self.detail_url = reverse(
+            "borrowings:borrowing-detail", args=[self.borrowing.id]
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_list_not_modified_skips_serialization(self):
+        response = self.client.get(self.list_url)
+        self.assertIn("Last-Modified", response)
+
+        with patch.object(
+            BorrowingListSerializer, "to_representation"
+        ) as to_representation, self.assertNumQueries(1):
+            response = self.client.get(
+                self.list_url, HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        to_representation.assert_not_called()
+
+    def test_list_if_modified_since(self):
+        last_modified = self.client.get(self.list_url)["Last-Modified"]
+
+        response = self.client.get(
+            self.list_url, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_return_changes_list_validators(self):
+        etag = self.client.get(self.list_url)["ETag"]
+
+        self.client.post(
+            reverse("borrowings:borrowing-return", args=[self.borrowing.id])
+        )
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_book_change_changes_list_validators(self):
+        etag = self.client.get(self.list_url)["ETag"]
+
+        self.book.title = "Renamed Book"
+        self.book.save()
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["book"], "Renamed Book")
+
+    def test_list_validators_only_read_the_served_page(self):
+        today = timezone.now().date()
+        older = [
+            Borrowing.objects.create(
+                borrow_date=today - timezone.timedelta(days=days),
+                expected_return_date=today,
+                book=self.book,
+                user=self.user
+            )
+            for days in (1, 2)
+        ]
+        url = self.list_url + "?page_size=1"
+        etag = self.client.get(url)["ETag"]
+
+        older[1].save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # The lookahead row decides the next link.
+        older[0].delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_detail_not_modified(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_etag_is_per_user(self):
+        admin = User.objects.create_user(
+            email="admin@test.com", password="pass123", is_staff=True
+        )
+        etag = self.client.get(self.detail_url)["ETag"]
+
+        self.client.force_authenticate(admin)
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class BorrowingBulkViewsTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            email="user@test.com", password="pass123"
+        )
+        self.stranger = User.objects.create_user(
+            email="stranger@test.com", password="pass123"
+        )
+        self.dune = Book.objects.create(
+            title="Dune",
+            author="Frank Herbert",
+            cover=Book.CoverChoices.SOFT,
+            inventory=2,
+            daily_fee="1.00"
+        )
+        self.solaris = Book.objects.create(
+            title="Solaris",
+            author="Stanislaw Lem",
+            cover=Book.CoverChoices.HARD,
+            inventory=1,
+            daily_fee="1.00"
+        )
+
+        self.create_url = reverse("borrowings:borrowing-bulk-create")
+        self.return_url = reverse("borrowings:borrowing-bulk-return")
+        self.client.force_authenticate(self.user)
+
+    def borrow(self, books: list) -> Response:
+        return self.client.post(self.create_url, {
+            "borrow_date": "2024-01-01",
+            "expected_return_date": "2024-01-02",
+            "books": books
+        }, format="json")
+
+    def test_anonymous_cannot_bulk_borrow(self):
+        self.client.force_authenticate(None)
+        response = self.borrow(["Dune"])
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_bulk_borrow_reports_per_book_results(self):
+        with self.assertNumQueries(7):
+            response = self.borrow(
+                ["Dune", "Solaris", "Solaris", "Missing", "Dune", "Dune"]
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        errors = [result.get("error") for result in response.data["results"]]
+        self.assertEqual(errors, [
+            None,
+            None,
+            "This book is out of stock",
+            "This book does not exist",
+            None,
+            "This book is out of stock",
+        ])
+        self.assertEqual(
+            response.data["results"][0]["borrowing"]["user"],
+            self.user.email
+        )
+        self.assertEqual(
+            Borrowing.objects.filter(user=self.user).count(), 3
+        )
+
+        self.dune.refresh_from_db()
+        self.solaris.refresh_from_db()
+        self.assertEqual(self.dune.inventory, 0)
+        self.assertEqual(self.solaris.inventory, 0)
+
+    def test_bulk_borrow_without_any_success(self):
+        response = self.borrow(["Missing"])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Borrowing.objects.count(), 0)
+
+    def test_bulk_borrow_validates_payload(self):
+        response = self.borrow([])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_return(self):
+        self.borrow(["Dune", "Solaris"])
+        own = list(Borrowing.objects.values_list("id", flat=True))
+        foreign = Borrowing.objects.create(
+            borrow_date=timezone.now().date(),
+            expected_return_date=timezone.now().date(),
+            book=self.dune,
+            user=self.stranger
+        )
+
+        response = self.client.post(
+            self.return_url,
+            {"borrowings": own + [own[0], foreign.id]},
+            format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [result.get("error") for result in response.data["results"]],
+            [None, None, "The book was already returned", "Not found."]
+        )
+        self.assertFalse(
+            Borrowing.objects.filter(
+                pk__in=own, actual_return_date=None
+            ).exists()
+        )
+        self.dune.refresh_from_db()
+        self.solaris.refresh_from_db()
+        self.assertEqual(self.dune.inventory, 2)
+        self.assertEqual(self.solaris.inventory, 1)
+
+    def test_admin_can_bulk_return_any_borrowing(self):
+        admin = User.objects.create_user(
+            email="admin@test.com", password="pass123", is_staff=True
+        )
+        self.borrow(["Dune"])
+        borrowing = Borrowing.objects.get()
+
+        self.client.force_authenticate(admin)
+        response = self.client.post(
+            self.return_url, {"borrowings": [borrowing.id]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            response.data["results"][0]["detail"],
+            "The book has been returned"
+        )
+
+
+class AsyncBorrowingViewsTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="user@test.com", password="pass123"
+        )
+        self.other = User.objects.create_user(
+            email="other@test.com", password="pass123"
+        )
+        self.admin = User.objects.create_user(
+            email="admin@test.com", password="pass123", is_staff=True
+        )
+        book = Book.objects.create(
+            title="Async Book",
+            author="Author",
+            cover=Book.CoverChoices.SOFT,
+            inventory=5,
+            daily_fee="2.00"
+        )
+        today = timezone.now().date()
+        self.borrowing = Borrowing.objects.create(
+            user=self.user,
+            book=book,
+            borrow_date=today,
+            expected_return_date=today + timezone.timedelta(days=3),
+        )
+        Borrowing.objects.create(
+            user=self.other,
+            book=book,
+            borrow_date=today,
+            expected_return_date=today + timezone.timedelta(days=5),
+        )
+        self.list_url = reverse("async-borrowings:borrowing-list")
+        self.detail_url = reverse(
+            "async-borrowings:borrowing-detail", args=[self.borrowing.pk]
+        )
+
+    @staticmethod
+    def auth(user: User) -> dict:
+        return {"HTTP_AUTHORIZE": f"Bearer {AccessToken.for_user(user)}"}
+
+    def test_list_matches_sync_endpoint(self):
+        for user in (self.user, self.admin):
+            response = self.client.get(self.list_url, **self.auth(user))
+            expected = self.client.get(
+                reverse("borrowings:borrowing-list-create"), **self.auth(user)
+            )
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json(), expected.json())
+
+    def test_head_list(self):
+        for url in (
+            self.list_url, reverse("borrowings:borrowing-list-create")
+        ):
+            response = self.client.head(url, **self.auth(self.user))
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_user_only_lists_own_borrowings(self):
+        response = self.client.get(self.list_url, **self.auth(self.user))
+
+        self.assertEqual(
+            [row["id"] for row in response.json()["results"]],
+            [self.borrowing.pk],
+        )
+
+    def test_anonymous_is_not_authenticated(self):
+        for url in (self.list_url, self.detail_url):
+            response = self.client.get(url)
+
+            self.assertEqual(
+                response.status_code, status.HTTP_401_UNAUTHORIZED
+            )
+            self.assertIn("Bearer", response["WWW-Authenticate"])
+
+    def test_invalid_token(self):
+        response = self.client.get(
+            self.list_url, HTTP_AUTHORIZE="Bearer not-a-token"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.json()["code"], "token_not_valid")
+
+    def test_detail_matches_sync_endpoint(self):
+        for user in (self.user, self.admin):
+            response = self.client.get(self.detail_url, **self.auth(user))
+            expected = self.client.get(
+                reverse(
+                    "borrowings:borrowing-detail", args=[self.borrowing.pk]
+                ),
+                **self.auth(user)
+            )
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json(), expected.json())
+
+    def test_other_user_cannot_see_detail(self):
+        response = self.client.get(self.detail_url, **self.auth(self.other))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
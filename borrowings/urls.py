@@ -1,15 +1,35 @@
 from django.urls import path
 
 from borrowings.views import (
+    BookStatsView,
+    BorrowingBulkCreateView,
+    BorrowingBulkReturnView,
     BorrowingDetailView,
     BorrowingListCreateView,
     BorrowingReturnView,
+    DailyStatsView,
+    HoldDetailView,
+    HoldListCreateView,
 )
 
 app_name = "borrowings"
 
 urlpatterns = [
     path("", BorrowingListCreateView.as_view(), name="borrowing-list-create"),
+    path(
+        "bulk/",
+        BorrowingBulkCreateView.as_view(),
+        name="borrowing-bulk-create"
+    ),
+    path(
+        "bulk/return/",
+        BorrowingBulkReturnView.as_view(),
+        name="borrowing-bulk-return"
+    ),
+    path("holds/", HoldListCreateView.as_view(), name="hold-list-create"),
+    path("holds/<int:pk>/", HoldDetailView.as_view(), name="hold-detail"),
+    path("stats/daily/", DailyStatsView.as_view(), name="stats-daily"),
+    path("stats/books/", BookStatsView.as_view(), name="stats-books"),
     path("<int:pk>/", BorrowingDetailView.as_view(), name="borrowing-detail"),
     path(
         "<int:pk>/return/",
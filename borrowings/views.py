@@ -1,6 +1,10 @@
+from abc import ABC, abstractmethod
+from collections import Counter, defaultdict
+
 from django.utils import timezone
 
-from django.db.models import QuerySet
+from django.db import IntegrityError, transaction
+from django.db.models import F, QuerySet
 from drf_spectacular.utils import (
     extend_schema,
     OpenApiParameter,
@@ -9,39 +13,101 @@ from drf_spectacular.utils import (
     OpenApiResponse
 )
 from rest_framework import generics, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import get_object_or_404
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import Serializer
 from rest_framework.views import APIView
 
+from Library_Service_API.conditional import ConditionalGetMixin
+from books.cache import invalidate_catalogue
 from books.models import Book
-from borrowings.models import Borrowing
+from borrowings.counters import count_loans, uncount_loans
+from borrowings.events import publish_borrowings, publish_inventory
+from borrowings.holds import (
+    cancel_hold,
+    claim_hold,
+    claim_holds,
+    lock_books,
+    shelve_copies,
+)
+from borrowings.inventory import adjust_inventories
+from borrowings.models import Borrowing, Hold
+from borrowings.pagination import BorrowingPagination, HoldPagination
 from borrowings.permissions import IsBorrower
 from borrowings.serializers import (
     BorrowingListSerializer,
+    BorrowingListValuesSerializer,
     BorrowingDetailSerializer,
-    BorrowingCreateSerializer
+    BorrowingCreateSerializer,
+    BorrowingBulkCreateSerializer,
+    BorrowingBulkReturnSerializer,
+    BookStatsSerializer,
+    DailyStatsSerializer,
+    HoldSerializer,
+    StatsRangeSerializer,
 )
+from borrowings.stats import get_book_stats, get_daily_stats
+from users.models import User
 
 
-class BorrowingListCreateView(generics.ListCreateAPIView):
+class BorrowingListCreateView(
+    ConditionalGetMixin,
+    generics.ListCreateAPIView
+):
     permission_classes = (IsAuthenticated,)
+    pagination_class = BorrowingPagination
+    conditional_related = ("book", "user")
 
     @staticmethod
-    def borrow_one_book(book: Book) -> None:
-        book.inventory -= 1
-        book.save()
+    def borrow_one_book(book: Book, user: User) -> None:
+        # The copy set aside for the user's hold was never put back in
+        # the inventory.
+        if claim_hold(book.pk, user.pk):
+            return
+        borrowed = (
+            Book.objects
+            .filter(pk=book.pk, inventory__gt=0)
+            .update(
+                inventory=F("inventory") - 1,
+                updated_at=timezone.now()
+            )
+        )
+        if not borrowed:
+            raise ValidationError({"book": ["This book is out of stock"]})
+        transaction.on_commit(invalidate_catalogue)
+        publish_inventory({book.pk: -1})
 
     def get_serializer_class(self) -> Serializer:
         if self.request.method == "POST":
             return BorrowingCreateSerializer
         return BorrowingListSerializer
 
+    def get_serializer(self, *args, **kwargs):
+        # Pages are `values()` rows, see `filter_queryset`.
+        if self.request.method in ("GET", "HEAD") and kwargs.get("many"):
+            return BorrowingListValuesSerializer(*args, **kwargs)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset: QuerySet[Borrowing]) -> QuerySet:
+        queryset = super().filter_queryset(queryset)
+        # HEAD runs the list too, here and in the async twin.
+        if self.request.method in ("GET", "HEAD"):
+            return BorrowingListValuesSerializer.project(queryset)
+        return queryset
+
     def perform_create(self, serializer: BorrowingCreateSerializer) -> None:
-        borrowing = serializer.save(user=self.request.user)
-        self.borrow_one_book(borrowing.book)
+        with transaction.atomic():
+            self.borrow_one_book(
+                serializer.validated_data["book"], self.request.user
+            )
+            borrowing = serializer.save(user=self.request.user)
+            count_loans(
+                self.request.user.pk, [borrowing.expected_return_date]
+            )
+            publish_borrowings("created", [borrowing])
 
     def get_queryset(self) -> QuerySet[Borrowing]:
         queryset = Borrowing.objects.select_related("user", "book")
@@ -93,10 +159,15 @@ class BorrowingListCreateView(generics.ListCreateAPIView):
         return super().get(request, *args, **kwargs)
 
 
-class BorrowingDetailView(generics.RetrieveAPIView):
+class BorrowingDetailView(ConditionalGetMixin, generics.RetrieveAPIView):
     queryset = Borrowing.objects.select_related("user", "book")
     serializer_class = BorrowingDetailSerializer
     permission_classes = (IsBorrower,)
+    conditional_related = ("book", "user")
+
+    def get_etag_salt(self, request: Request) -> str:
+        # The nested fee grows with every overdue day.
+        return timezone.now().date().isoformat()
 
 
 @extend_schema_view(
@@ -123,18 +194,30 @@ class BorrowingDetailView(generics.RetrieveAPIView):
 class BorrowingReturnView(APIView):
     permission_classes = (IsBorrower,)
 
+    @staticmethod
+    def return_one_book(borrowing: Borrowing) -> bool:
+        with transaction.atomic():
+            returned = (
+                Borrowing.objects
+                .filter(pk=borrowing.pk, actual_return_date=None)
+                .update(
+                    actual_return_date=timezone.now().date(),
+                    updated_at=timezone.now()
+                )
+            )
+            if returned:
+                shelve_copies({borrowing.book_id: 1})
+                uncount_loans(
+                    {borrowing.user_id: [borrowing.expected_return_date]}
+                )
+                publish_borrowings("returned", [borrowing])
+        return bool(returned)
+
     def post(self, request: Request, pk: int, *args, **kwargs) -> Response:
         borrowing = get_object_or_404(Borrowing, pk=pk)
         self.check_object_permissions(request, borrowing)
 
-        if not borrowing.actual_return_date:
-            borrowing.actual_return_date = timezone.now().date()
-            borrowing.save()
-
-            book = borrowing.book
-            book.inventory += 1
-            book.save()
-
+        if self.return_one_book(borrowing):
             return Response(
                 {"detail": "The book has been returned"},
                 status=status.HTTP_201_CREATED
@@ -144,3 +227,258 @@ class BorrowingReturnView(APIView):
             {"detail": "The book was already returned"},
             status=status.HTTP_200_OK
         )
+
+
+@extend_schema(
+    responses={
+        201: OpenApiResponse(
+            description="At least one book was borrowed; "
+                        "per-book results in `results`"
+        ),
+        400: OpenApiResponse(description="No book could be borrowed"),
+    }
+)
+class BorrowingBulkCreateView(generics.GenericAPIView):
+    serializer_class = BorrowingBulkCreateSerializer
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        titles = data["books"]
+
+        results = []
+        borrowings = []
+        with transaction.atomic():
+            books = {
+                book.title: book
+                for book in (
+                    Book.objects
+                    .select_for_update()
+                    .filter(title__in=titles)
+                    .order_by("pk")
+                )
+            }
+            # Copies set aside for the user's holds are not in the
+            # inventory; they are borrowed before any copy from it.
+            claimed = claim_holds(
+                [book.pk for book in books.values()], request.user.pk
+            )
+            requested = Counter()
+
+            for title in titles:
+                book = books.get(title)
+                if book is None:
+                    results.append(
+                        {"book": title, "error": "This book does not exist"}
+                    )
+                elif (
+                    not claimed[book.pk]
+                    and book.inventory <= requested[book.pk]
+                ):
+                    results.append(
+                        {"book": title, "error": "This book is out of stock"}
+                    )
+                else:
+                    if claimed[book.pk]:
+                        claimed[book.pk] -= 1
+                    else:
+                        requested[book.pk] += 1
+                    borrowing = Borrowing(
+                        borrow_date=data["borrow_date"],
+                        expected_return_date=data["expected_return_date"],
+                        book=book,
+                        user=request.user,
+                    )
+                    borrowings.append(borrowing)
+                    results.append({"book": title, "borrowing": borrowing})
+
+            Borrowing.objects.bulk_create(borrowings)
+            adjust_inventories(
+                {book_id: -count for book_id, count in requested.items()}
+            )
+            count_loans(
+                request.user.pk,
+                [borrowing.expected_return_date for borrowing in borrowings]
+            )
+            publish_borrowings("created", borrowings)
+
+        for result in results:
+            if "borrowing" in result:
+                result["borrowing"] = BorrowingListSerializer(
+                    result["borrowing"]
+                ).data
+
+        return Response(
+            {"results": results},
+            status=(
+                status.HTTP_201_CREATED if borrowings
+                else status.HTTP_400_BAD_REQUEST
+            )
+        )
+
+
+@extend_schema(
+    responses={
+        201: OpenApiResponse(
+            description="At least one book was returned; "
+                        "per-borrowing results in `results`"
+        ),
+        200: OpenApiResponse(description="Nothing was returned"),
+    }
+)
+class BorrowingBulkReturnView(generics.GenericAPIView):
+    serializer_class = BorrowingBulkReturnSerializer
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["borrowings"]
+
+        results = []
+        returned = []
+        with transaction.atomic():
+            queryset = (
+                Borrowing.objects
+                .select_for_update()
+                .filter(pk__in=ids)
+                .only(
+                    "id",
+                    "book_id",
+                    "user_id",
+                    "expected_return_date",
+                    "actual_return_date",
+                )
+            )
+            if not request.user.is_staff:
+                queryset = queryset.filter(user=request.user)
+            borrowings = {borrowing.pk: borrowing for borrowing in queryset}
+            increments = Counter()
+            returned_due = defaultdict(list)
+
+            for pk in ids:
+                borrowing = borrowings.get(pk)
+                if borrowing is None:
+                    results.append({"borrowing": pk, "error": "Not found."})
+                elif borrowing.actual_return_date or pk in returned:
+                    results.append({
+                        "borrowing": pk,
+                        "error": "The book was already returned"
+                    })
+                else:
+                    returned.append(pk)
+                    increments[borrowing.book_id] += 1
+                    returned_due[borrowing.user_id].append(
+                        borrowing.expected_return_date
+                    )
+                    results.append({
+                        "borrowing": pk,
+                        "detail": "The book has been returned"
+                    })
+
+            if returned:
+                Borrowing.objects.filter(pk__in=returned).update(
+                    actual_return_date=timezone.now().date(),
+                    updated_at=timezone.now()
+                )
+                shelve_copies(increments)
+                uncount_loans(returned_due)
+                publish_borrowings(
+                    "returned", [borrowings[pk] for pk in returned]
+                )
+
+        return Response(
+            {"results": results},
+            status=(
+                status.HTTP_201_CREATED if returned
+                else status.HTTP_200_OK
+            )
+        )
+
+
+class HoldListCreateView(generics.ListCreateAPIView):
+    """
+    Queue for a copy of an out-of-stock book. When one is returned it is
+    set aside for the oldest waiting hold, which becomes `ready` until
+    `ready_until`; borrowing the book then takes that copy.
+    """
+
+    serializer_class = HoldSerializer
+    permission_classes = (IsAuthenticated,)
+    pagination_class = HoldPagination
+
+    def get_queryset(self) -> QuerySet[Hold]:
+        queryset = Hold.objects.select_related("book", "user")
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(user=self.request.user)
+        return queryset
+
+    def perform_create(self, serializer: HoldSerializer) -> None:
+        book = serializer.validated_data["book"]
+        user = self.request.user
+        try:
+            with transaction.atomic():
+                # A copy returned meanwhile is either in the inventory
+                # read here or given to this hold.
+                lock_books([book.pk])
+                if Book.objects.filter(pk=book.pk, inventory__gt=0).exists():
+                    raise ValidationError(
+                        {"book": ["This book is in stock"]}
+                    )
+                serializer.save(user=user)
+        except IntegrityError:
+            raise ValidationError({"book": ["You already hold this book"]})
+
+
+class HoldDetailView(generics.RetrieveDestroyAPIView):
+    queryset = Hold.objects.select_related("book", "user")
+    serializer_class = HoldSerializer
+    permission_classes = (IsBorrower,)
+
+    def perform_destroy(self, instance: Hold) -> None:
+        # Cancelled holds are kept, like returned borrowings.
+        cancel_hold(instance)
+
+
+class StatsView(generics.GenericAPIView, ABC):
+    """
+    Staff-only reads of the pre-aggregated daily book stats, so ranges
+    over years of history cost a scan of the stats table only.
+    """
+
+    permission_classes = (IsAdminUser,)
+
+    @abstractmethod
+    def get_rows(self, params: dict) -> QuerySet:
+        """The stats rows for the validated range parameters."""
+
+    @extend_schema(parameters=[StatsRangeSerializer])
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        params = StatsRangeSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        params = params.validated_data
+
+        serializer = self.get_serializer(self.get_rows(params), many=True)
+        return Response({
+            "start": params["start"],
+            "end": params["end"],
+            "results": serializer.data,
+        })
+
+
+class DailyStatsView(StatsView):
+    serializer_class = DailyStatsSerializer
+
+    def get_rows(self, params: dict) -> QuerySet:
+        return get_daily_stats(params["start"], params["end"])
+
+
+class BookStatsView(StatsView):
+    serializer_class = BookStatsSerializer
+
+    def get_rows(self, params: dict) -> QuerySet:
+        return get_book_stats(
+            params["start"], params["end"], params["limit"]
+        )
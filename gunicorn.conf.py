@@ -0,0 +1,74 @@
+"""
+Gunicorn settings for the production serving profile.
+
+    gunicorn Library_Service_API.wsgi
+
+serves the WSGI app with threaded workers. GUNICORN_WORKER_CLASS=asgi
+runs Library_Service_API.asgi under uvicorn workers instead:
+
+    GUNICORN_WORKER_CLASS=asgi gunicorn Library_Service_API.asgi
+"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+WORKER_CLASSES = {
+    "wsgi": "gthread",
+    "asgi": "uvicorn.workers.UvicornWorker",
+}
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+
+workers = int(
+    os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1)
+)
+
+interface = os.environ.get("GUNICORN_WORKER_CLASS", "wsgi")
+
+worker_class = WORKER_CLASSES[interface]
+
+# Per worker. Each thread keeps its own persistent DB connection, so
+# workers * threads must fit into Postgres' max_connections.
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+
+graceful_timeout = 30
+
+keepalive = 5
+
+# Recycle workers now and then to contain slow memory growth.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 10_000))
+
+max_requests_jitter = max_requests // 10
+
+accesslog = "-"
+
+errorlog = "-"
+
+raw_env = ["DJANGO_ENV=production"]
+
+# Under ASGI persistent connections are not reused across requests and
+# pile up, so default to the connection pool there.
+if interface == "asgi" and "DB_POOL" not in os.environ:
+    raw_env.append("DB_POOL=1")
+
+# Every worker writes its Prometheus samples here, so a /metrics scrape
+# served by any one of them reports the sum over all workers.
+metrics_dir = None
+
+if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+    metrics_dir = tempfile.mkdtemp(prefix="prometheus-")
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = metrics_dir
+
+
+def child_exit(server, worker) -> None:
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def on_exit(server) -> None:
+    if metrics_dir is not None:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
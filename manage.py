@@ -10,6 +10,8 @@ def main():
     os.environ.setdefault(
         "DJANGO_SETTINGS_MODULE", "Library_Service_API.settings"
     )
+    if sys.argv[1:2] == ["test"]:
+        os.environ.setdefault("DJANGO_ENV", "test")
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
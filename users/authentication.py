@@ -0,0 +1,178 @@
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from users.models import User
+
+# All an authenticated request needs from the user row: permission
+# checks read `is_staff`, views filter by the id.
+PRINCIPAL_FIELDS = ("id", "email", "is_staff", "is_active")
+
+
+def get_principal_cache_key(user_id) -> str:
+    return f"users:principal:{user_id}"
+
+
+def invalidate_principal(user_id) -> None:
+    cache.delete(get_principal_cache_key(user_id))
+
+
+def complete_principal(user: User, fields: Iterable[str] = None) -> User:
+    """
+    Load `fields`, by default all of them, of a user built from the
+    cached principal in one query. Users loaded in full are returned
+    as they are.
+    """
+    if user.get_deferred_fields():
+        user.refresh_from_db(fields=fields or [
+            field.attname for field in user._meta.concrete_fields
+        ])
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    `JWTAuthentication` that keeps the principal of every token subject
+    in the cache for AUTH_PRINCIPAL_CACHE_TTL seconds instead of loading
+    the user row on every request.
+
+    `request.user` is a `User` with only PRINCIPAL_FIELDS loaded; any
+    other field is loaded on first access. `users.signals` drops the
+    entry whenever the user is saved or deleted, and the TTL bounds
+    staleness after bulk updates, which send no signals. With
+    CHECK_REVOKE_TOKEN the password hash is needed, so users are loaded
+    from the database as usual.
+    """
+
+    def get_user(self, validated_token: Token) -> User:
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+
+        user_id = self.get_user_id(validated_token)
+        key = get_principal_cache_key(user_id)
+        values = cache.get(key)
+        if values is None:
+            values = self.get_principal(user_id)
+            cache.set(key, values, settings.AUTH_PRINCIPAL_CACHE_TTL)
+        return self.check_user(self.build_user(values))
+
+    def get_principal(self, user_id) -> tuple:
+        values = (
+            self.user_model.objects
+            .filter(**{api_settings.USER_ID_FIELD: user_id})
+            .values_list(*PRINCIPAL_FIELDS)
+            .first()
+        )
+        if values is None:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            )
+        return values
+
+    @staticmethod
+    def get_user_id(validated_token: Token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+    def build_user(self, values: tuple) -> User:
+        # `from_db` expects values in field order, not in the order of
+        # the names it is given.
+        loaded = dict(zip(PRINCIPAL_FIELDS, values))
+        return self.user_model.from_db(
+            router.db_for_read(self.user_model),
+            PRINCIPAL_FIELDS,
+            [
+                loaded[field.attname]
+                for field in self.user_model._meta.concrete_fields
+                if field.attname in loaded
+            ],
+        )
+
+    @staticmethod
+    def check_user(user: User) -> User:
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+        return user
+
+
+class AsyncJWTAuthentication(CachedJWTAuthentication):
+    """
+    `CachedJWTAuthentication` for async views. Token validation is pure
+    CPU work; only the principal lookup awaits the cache and, on a
+    miss, the database.
+    """
+
+    async def aauthenticate(self, request: Request) -> tuple | None:
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token: Token) -> User:
+        user_id = self.get_user_id(validated_token)
+        if not api_settings.CHECK_REVOKE_TOKEN:
+            key = get_principal_cache_key(user_id)
+            values = await cache.aget(key)
+            if values is None:
+                values = await self.aget_principal(user_id)
+                await cache.aset(
+                    key, values, settings.AUTH_PRINCIPAL_CACHE_TTL
+                )
+            return self.check_user(self.build_user(values))
+
+        try:
+            user = await self.user_model.objects.aget(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            ) from e
+
+        self.check_user(user)
+
+        if validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."),
+                code="password_changed",
+            )
+
+        return user
+
+    async def aget_principal(self, user_id) -> tuple:
+        values = await (
+            self.user_model.objects
+            .filter(**{api_settings.USER_ID_FIELD: user_id})
+            .values_list(*PRINCIPAL_FIELDS)
+            .afirst()
+        )
+        if values is None:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            )
+        return values
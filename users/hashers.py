@@ -0,0 +1,17 @@
+"""
+Password hashing at a cost operators choose.
+
+Hashing a password takes hundreds of milliseconds of CPU by design, so
+signups cost more than any other request. PASSWORD_HASH_ITERATIONS
+sets what a new hash costs; see `manage.py benchmark_password_hashing`.
+"""
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """Django's PBKDF2 hasher at PASSWORD_HASH_ITERATIONS rounds."""
+
+    @property
+    def iterations(self) -> int:
+        return settings.PASSWORD_HASH_ITERATIONS
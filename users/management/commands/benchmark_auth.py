@@ -0,0 +1,72 @@
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from borrowings import benchmarks
+from users.authentication import (
+    CachedJWTAuthentication,
+    invalidate_principal,
+)
+from users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Django command to compare authenticating a request with
+    `JWTAuthentication` and with `CachedJWTAuthentication`, on a cache
+    hit and on a miss.
+    """
+
+    help = (
+        "Time JWT authentication of one request per iteration and count "
+        "its queries, with and without the cached user principal."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--iterations", type=int, default=2_000)
+        parser.add_argument("--warmup", type=int, default=50)
+
+    def handle(self, *args, **options) -> None:
+        with transaction.atomic():
+            user = User.objects.create_user(
+                email=f"benchmark-{uuid.uuid4().hex[:8]}@example.com"
+            )
+            request = Request(RequestFactory().get(
+                "/api/v1/borrowings/",
+                **{
+                    settings.SIMPLE_JWT["AUTH_HEADER_NAME"]:
+                        f"Bearer {AccessToken.for_user(user)}"
+                },
+            ))
+            cached = CachedJWTAuthentication()
+            scenarios = [
+                benchmarks.Scenario(
+                    "jwt", lambda _: JWTAuthentication().authenticate(request)
+                ),
+                benchmarks.Scenario(
+                    "cached_miss",
+                    lambda _: cached.authenticate(request),
+                    prepare=lambda: invalidate_principal(user.pk),
+                ),
+                benchmarks.Scenario(
+                    "cached_hit", lambda _: cached.authenticate(request)
+                ),
+            ]
+            for scenario in scenarios:
+                result = benchmarks.measure(
+                    scenario, options["iterations"], options["warmup"], 0
+                )
+                self.stdout.write(
+                    f"{scenario.name:>12}: "
+                    f"p50 {result['p50_ms'] * 1000:7.1f} us, "
+                    f"p99 {result['p99_ms'] * 1000:7.1f} us, "
+                    f"{result['queries_per_request']:4.1f} queries"
+                )
+            invalidate_principal(user.pk)
+            transaction.set_rollback(True)
@@ -0,0 +1,108 @@
+import json
+import os
+import statistics
+import time
+import uuid
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from borrowings.management.commands.benchmark_serving import (
+    SERVERS,
+    Command as ServingBenchmark,
+    RunningServer,
+    get_free_port,
+)
+from users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Django command to show what PASSWORD_HASH_ITERATIONS costs: the
+    time of one hash and the signups per second a server sustains.
+    """
+
+    help = (
+        "For each PBKDF2 iteration count, time one password hash in "
+        "process and load the registration endpoint of a server with it."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            nargs="+",
+            default=[100_000, 300_000, 600_000, 1_000_000],
+        )
+        parser.add_argument(
+            "--server",
+            choices=SERVERS,
+            default="gunicorn",
+        )
+        parser.add_argument("--seconds", type=float, default=10)
+        parser.add_argument("--concurrency", type=int, default=16)
+
+    def handle(self, *args, **options) -> None:
+        prefix = f"signup-{uuid.uuid4().hex[:8]}-"
+        self.stdout.write(
+            f"{options['concurrency']} clients, {options['seconds']} s "
+            f"per cost, {options['server']}, {os.cpu_count()} CPUs"
+        )
+        try:
+            for iterations in options["iterations"]:
+                hash_ms = self.time_hash(iterations)
+                result = self.load(iterations, prefix, options)
+                self.stdout.write(
+                    f"{iterations:>10,} iterations: "
+                    f"{hash_ms:6.1f} ms per hash, "
+                    f"{result['throughput']:7.1f} signups/s, "
+                    f"p50 {result['p50']:7.1f} ms, "
+                    f"p99 {result['p99']:7.1f} ms, "
+                    f"{result['errors']} errors"
+                )
+        finally:
+            User.objects.filter(email__startswith=prefix).delete()
+
+    @staticmethod
+    def time_hash(iterations: int, repeat: int = 5) -> float:
+        """Median time of hashing one password in milliseconds."""
+        timings = []
+        with override_settings(PASSWORD_HASH_ITERATIONS=iterations):
+            for _ in range(repeat):
+                started = time.perf_counter()
+                make_password("correct-horse-battery")
+                timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    @staticmethod
+    def load(iterations: int, prefix: str, options: dict) -> dict:
+        # Taken emails fail validation, so every request gets its own.
+        bodies = [
+            json.dumps({
+                "email": f"{prefix}{iterations}-{number}@example.com",
+                "password": "correct-horse-battery",
+            })
+            for number in range(100_000)
+        ]
+        port = get_free_port()
+        command, env = SERVERS[options["server"]]
+        env = {
+            **os.environ,
+            **env,
+            "PASSWORD_HASH_ITERATIONS": str(iterations),
+        }
+        with RunningServer(
+            [part.format(bind=f"127.0.0.1:{port}") for part in command],
+            env,
+            port,
+        ):
+            return ServingBenchmark.load(
+                port,
+                {"Content-Type": "application/json"},
+                "POST",
+                "/api/v1/users/",
+                bodies,
+                201,
+                options,
+            )
@@ -1,21 +1,65 @@
-import time
-from django.db import connections
-from django.db.utils import OperationalError
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+
+from Library_Service_API.readiness import (
+    PROBES,
+    ProbeResult,
+    wait_until_ready,
+)
 
 
 class Command(BaseCommand):
-    """Django command to wait for the database to be available."""
-
-    def handle(self, *args, **options):
-        self.stdout.write("Waiting for database...")
-        db_ready = False
-        while not db_ready:
-            try:
-                connection = connections["default"]
-                connection.cursor()
-                db_ready = True
-            except OperationalError:
-                self.stdout.write("Database unavailable, waiting 1 second...")
-                time.sleep(1)
-        self.stdout.write(self.style.SUCCESS("Database available!"))
+    """
+    Django command to wait for the database, and optionally the broker
+    and the Celery workers, to be available.
+    """
+
+    help = (
+        "Probe the dependencies in parallel with a sub-second exponential "
+        "backoff and fail once the timeout runs out."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--probes",
+            nargs="+",
+            choices=PROBES,
+            default=["database"],
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=60,
+            help="Seconds to wait for all probes before giving up.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        self.verbosity = options["verbosity"]
+        self.stdout.write(f"Waiting for {', '.join(options['probes'])}...")
+        results = wait_until_ready(
+            options["probes"], options["timeout"], on_retry=self.on_retry
+        )
+
+        failed = {
+            name: result for name, result in results.items() if not result.ok
+        }
+        if failed:
+            raise CommandError(
+                "Unavailable after {} s: {}".format(
+                    options["timeout"],
+                    "; ".join(
+                        f"{name} ({result.error})"
+                        for name, result in failed.items()
+                    ),
+                )
+            )
+        for name, result in results.items():
+            self.stdout.write(self.style.SUCCESS(
+                f"{name} available ({result.latency_ms:.0f} ms)"
+            ))
+
+    def on_retry(self, name: str, result: ProbeResult, delay: float) -> None:
+        if self.verbosity > 1:
+            self.stdout.write(
+                f"{name} unavailable, retrying in {delay * 1000:.0f} ms: "
+                f"{result.error}"
+            )
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.10 on 2026-10-18 17:51
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def fill_loan_counters(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    Borrowing = apps.get_model("borrowings", "Borrowing")
+    today = timezone.now().date()
+
+    def count(**filters):
+        return Coalesce(
+            Subquery(
+                Borrowing.objects.filter(user=OuterRef("pk"), **filters)
+                .order_by()
+                .values("user")
+                .annotate(count=Count("pk"))
+                .values("count"),
+                output_field=IntegerField(),
+            ),
+            Value(0),
+        )
+
+    User.objects.update(
+        active_loans=count(actual_return_date=None),
+        overdue_loans=count(actual_return_date=None, expected_return_date__lte=today),
+        lifetime_loans=count(),
+        overdue_checked_on=today,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0003_user_updated_at"),
+        ("borrowings", "0006_borrowing_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="active_loans",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="lifetime_loans",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="overdue_checked_on",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="overdue_loans",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_loan_counters, migrations.RunPython.noop),
+    ]
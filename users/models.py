@@ -47,6 +47,14 @@ class UserManager(BaseUserManager):
 class User(AbstractUser):
     username = None
     email = models.EmailField("email address", unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Maintained by `borrowings.counters`. `overdue_loans` counts active
+    # loans due on or before `overdue_checked_on`.
+    active_loans = models.PositiveIntegerField(default=0)
+    overdue_loans = models.PositiveIntegerField(default=0)
+    lifetime_loans = models.PositiveIntegerField(default=0)
+    overdue_checked_on = models.DateField(null=True, blank=True)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
@@ -35,3 +35,10 @@ class UserSerializer(serializers.ModelSerializer):
             user.set_password(password)
             user.save()
         return user
+
+
+class UserLoanSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = get_user_model()
+        fields = ("active_loans", "overdue_loans", "lifetime_loans")
+        read_only_fields = fields
@@ -0,0 +1,17 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.authentication import invalidate_principal
+from users.models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_principal_on_change(sender, instance: User, **kwargs) -> None:
+    # After commit, so a request running meanwhile cannot cache the old
+    # row again; right away too, so this transaction reads the change.
+    # Deleting clears `instance.pk` before the transaction commits.
+    user_id = instance.pk
+    invalidate_principal(user_id)
+    transaction.on_commit(lambda: invalidate_principal(user_id))
@@ -0,0 +1,123 @@
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.authentication import (
+    AsyncJWTAuthentication,
+    CachedJWTAuthentication,
+    complete_principal,
+    get_principal_cache_key,
+)
+from users.models import User
+
+
+class CachedJWTAuthenticationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="user@test.com", password="pass123"
+        )
+        self.authentication = CachedJWTAuthentication()
+
+    def request(self, user: User = None):
+        return APIRequestFactory().get(
+            "/",
+            HTTP_AUTHORIZE=f"Bearer {AccessToken.for_user(user or self.user)}",
+        )
+
+    def authenticate(self, user: User = None) -> User:
+        return self.authentication.authenticate(self.request(user))[0]
+
+    def test_second_request_is_served_from_cache(self):
+        with self.assertNumQueries(1):
+            self.authenticate()
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(user.email, self.user.email)
+        self.assertFalse(user.is_staff)
+
+    def test_other_fields_are_deferred(self):
+        user = self.authenticate()
+
+        self.assertIn("first_name", user.get_deferred_fields())
+        self.assertNotIn("is_staff", user.get_deferred_fields())
+
+    def test_saving_the_user_drops_the_principal(self):
+        self.authenticate()
+
+        self.user.is_staff = True
+        self.user.save()
+
+        self.assertIsNone(cache.get(get_principal_cache_key(self.user.pk)))
+        self.assertTrue(self.authenticate().is_staff)
+
+    def test_deactivated_user_is_rejected(self):
+        self.authenticate()
+
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_deleted_user_is_rejected(self):
+        request = self.request()
+        self.authentication.authenticate(request)
+
+        self.user.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate(request)
+
+    @override_settings(AUTH_PRINCIPAL_CACHE_TTL=0)
+    def test_ttl_bounds_bulk_updates(self):
+        self.authenticate()
+
+        User.objects.filter(pk=self.user.pk).update(is_staff=True)
+
+        self.assertTrue(self.authenticate().is_staff)
+
+    def test_async_authentication_shares_the_cache(self):
+        async_to_sync(AsyncJWTAuthentication().aauthenticate)(self.request())
+
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+
+        self.assertEqual(user.pk, self.user.pk)
+
+    def test_complete_principal_loads_in_one_query(self):
+        user = self.authenticate()
+
+        with self.assertNumQueries(1):
+            complete_principal(user)
+            self.assertEqual(user.first_name, "")
+            self.assertTrue(user.check_password("pass123"))
+        with self.assertNumQueries(0):
+            self.assertIs(complete_principal(self.user), self.user)
+
+
+class CachedPrincipalViewsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="user@test.com", password="pass123"
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZE=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def test_update_me_is_seen_by_the_next_request(self):
+        url = reverse("users:me")
+        self.client.get(url)
+
+        self.client.patch(url, {"first_name": "Ada"}, format="json")
+        response = self.client.get(url)
+
+        self.assertEqual(response.data["first_name"], "Ada")
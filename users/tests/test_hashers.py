@@ -0,0 +1,29 @@
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.test import SimpleTestCase, override_settings
+
+from users.hashers import PBKDF2PasswordHasher
+
+PBKDF2 = ["users.hashers.PBKDF2PasswordHasher"]
+
+
+class PBKDF2PasswordHasherTest(SimpleTestCase):
+    @override_settings(PASSWORD_HASHERS=PBKDF2, PASSWORD_HASH_ITERATIONS=1000)
+    def test_iterations_follow_settings(self):
+        encoded = make_password("secret")
+
+        self.assertTrue(encoded.startswith("pbkdf2_sha256$1000$"))
+
+    @override_settings(PASSWORD_HASHERS=PBKDF2, PASSWORD_HASH_ITERATIONS=1000)
+    def test_changed_cost_keeps_hashes_valid(self):
+        encoded = make_password("secret")
+
+        with override_settings(PASSWORD_HASH_ITERATIONS=2000):
+            hasher = identify_hasher(encoded)
+            self.assertIsInstance(hasher, PBKDF2PasswordHasher)
+            self.assertTrue(hasher.verify("secret", encoded))
+            self.assertTrue(hasher.must_update(encoded))
+
+    def test_tests_hash_fast(self):
+        encoded = make_password("secret")
+
+        self.assertEqual(identify_hasher(encoded).algorithm, "md5")
@@ -0,0 +1,46 @@
+from itertools import count
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from Library_Service_API.testing import ConstantQueriesMixin, query_budget
+from users.models import User
+
+numbers = count()
+
+
+def create_users(rows: int) -> list[User]:
+    return User.objects.bulk_create(
+        User(email=f"reader{next(numbers)}@test.com") for _ in range(rows)
+    )
+
+
+class UserQueryCountTest(ConstantQueriesMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            email="admin@test.com", password="pass123"
+        )
+
+    def test_admin_changelist(self):
+        self.client.force_login(self.admin)
+        self.assertConstantQueries(
+            create_users,
+            lambda: self.client.get(reverse("admin:users_user_changelist")),
+        )
+
+    def test_me(self):
+        self.client.force_authenticate(self.admin)
+        with query_budget(1):
+            response = self.client.get(reverse("users:me"))
+        self.assertEqual(response.status_code, 200)
+
+    def test_summary(self):
+        self.client.force_authenticate(self.admin)
+        # The first summary of the day recounts overdue loans.
+        with query_budget(5):
+            self.client.get(reverse("users:me-summary"))
+        with query_budget(1):
+            response = self.client.get(reverse("users:me-summary"))
+        self.assertEqual(response.status_code, 200)
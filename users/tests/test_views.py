@@ -1,8 +1,15 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
 from django.urls import reverse
 from django.test import TestCase
+from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from books.models import Book
+from borrowings.tasks import refresh_overdue_loan_counters
 from users.models import User
 
 
@@ -79,3 +86,171 @@ class UserViewsTest(TestCase):
         self.user.refresh_from_db()
         self.assertEqual(self.user.first_name, "NewName")
         self.assertTrue(self.user.check_password("newpass123"))
+
+    def test_me_supports_conditional_get(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(self.me_url)
+
+        with self.assertNumQueries(0):
+            not_modified = self.client.get(
+                self.me_url, HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+
+        self.assertEqual(
+            not_modified.status_code, status.HTTP_304_NOT_MODIFIED
+        )
+
+    def test_me_update_changes_last_modified(self):
+        User.objects.filter(pk=self.user.pk).update(
+            updated_at=timezone.now() - timedelta(days=1)
+        )
+        self.user.refresh_from_db()
+        self.client.force_authenticate(self.user)
+        last_modified = self.client.get(self.me_url)["Last-Modified"]
+
+        self.client.patch(self.me_url, {"first_name": "Jane"})
+        response = self.client.get(
+            self.me_url, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["first_name"], "Jane")
+
+
+class UserSummaryTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.summary_url = reverse("users:me-summary")
+        self.user = User.objects.create_user(
+            email="user@test.com", password="pass123"
+        )
+        self.client.force_authenticate(self.user)
+        self.book = Book.objects.create(
+            title="Django Book",
+            author="Author",
+            cover=Book.CoverChoices.HARD,
+            inventory=10,
+            daily_fee="1.00"
+        )
+        self.today = timezone.now().date()
+
+    def borrow(self, expected_in_days: int) -> int:
+        response = self.client.post(
+            reverse("borrowings:borrowing-list-create"),
+            {
+                "borrow_date": self.today - timedelta(days=20),
+                "expected_return_date": (
+                    self.today + timedelta(days=expected_in_days)
+                ),
+                "book": self.book.title,
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data["id"]
+
+    def get_summary(self) -> dict:
+        self.user.refresh_from_db()
+        response = self.client.get(self.summary_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_anonymous_cannot_access_summary(self):
+        self.client.force_authenticate(None)
+
+        response = self.client.get(self.summary_url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_borrow_and_return_update_counters(self):
+        self.borrow(expected_in_days=7)
+        overdue_id = self.borrow(expected_in_days=-3)
+
+        self.assertEqual(
+            self.get_summary(),
+            {"active_loans": 2, "overdue_loans": 1, "lifetime_loans": 2},
+        )
+
+        self.client.post(
+            reverse("borrowings:borrowing-return", args=[overdue_id])
+        )
+        self.client.post(
+            reverse("borrowings:borrowing-return", args=[overdue_id])
+        )
+
+        self.assertEqual(
+            self.get_summary(),
+            {"active_loans": 1, "overdue_loans": 0, "lifetime_loans": 2},
+        )
+
+    def test_bulk_borrow_and_return_update_counters(self):
+        response = self.client.post(
+            reverse("borrowings:borrowing-bulk-create"),
+            {
+                "borrow_date": self.today - timedelta(days=20),
+                "expected_return_date": self.today - timedelta(days=1),
+                "books": [self.book.title] * 3,
+            },
+            format="json",
+        )
+        ids = [
+            result["borrowing"]["id"] for result in response.data["results"]
+        ]
+        self.assertEqual(
+            self.get_summary(),
+            {"active_loans": 3, "overdue_loans": 3, "lifetime_loans": 3},
+        )
+
+        self.client.post(
+            reverse("borrowings:borrowing-bulk-return"),
+            {"borrowings": ids[:2]},
+            format="json",
+        )
+
+        self.assertEqual(
+            self.get_summary(),
+            {"active_loans": 1, "overdue_loans": 1, "lifetime_loans": 3},
+        )
+
+    def test_overdue_count_is_refreshed_once_a_day(self):
+        self.borrow(expected_in_days=0)
+        self.borrow(expected_in_days=1)
+        User.objects.filter(pk=self.user.pk).update(
+            overdue_loans=0,
+            overdue_checked_on=self.today - timedelta(days=1),
+        )
+
+        self.assertEqual(self.get_summary()["overdue_loans"], 1)
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.overdue_checked_on, self.today)
+        with self.assertNumQueries(0):
+            self.client.get(self.summary_url)
+
+    def test_reconcile_command_fixes_drift(self):
+        self.borrow(expected_in_days=-1)
+        returned_id = self.borrow(expected_in_days=5)
+        self.client.post(
+            reverse("borrowings:borrowing-return", args=[returned_id])
+        )
+        User.objects.update(
+            active_loans=9, overdue_loans=9, lifetime_loans=9
+        )
+
+        call_command(
+            "reconcile_loan_counters", batch_size=1, stdout=StringIO()
+        )
+
+        self.assertEqual(
+            self.get_summary(),
+            {"active_loans": 1, "overdue_loans": 1, "lifetime_loans": 2},
+        )
+
+    def test_daily_task_refreshes_stale_users(self):
+        self.borrow(expected_in_days=0)
+        User.objects.update(overdue_loans=0, overdue_checked_on=None)
+
+        self.assertEqual(refresh_overdue_loan_counters(), 1)
+        self.assertEqual(refresh_overdue_loan_counters(), 0)
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.overdue_loans, 1)
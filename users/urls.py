@@ -4,13 +4,14 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
 
-from users.views import UserCreateView, UserManageView
+from users.views import UserCreateView, UserManageView, UserSummaryView
 
 app_name = "users"
 
 urlpatterns = [
     path("", UserCreateView.as_view(), name="register"),
     path("me", UserManageView.as_view(), name="me"),
+    path("me/summary/", UserSummaryView.as_view(), name="me-summary"),
     path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
 ]
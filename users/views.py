@@ -1,8 +1,12 @@
+from django.utils import timezone
 from rest_framework import generics
 from rest_framework.permissions import AllowAny, IsAuthenticated
 
+from Library_Service_API.conditional import ConditionalGetMixin
+from borrowings.counters import refresh_overdue_loans
+from users.authentication import complete_principal
 from users.models import User
-from users.serializers import UserSerializer
+from users.serializers import UserLoanSummarySerializer, UserSerializer
 
 
 class UserCreateView(generics.CreateAPIView):
@@ -11,9 +15,32 @@ class UserCreateView(generics.CreateAPIView):
     permission_classes = (AllowAny,)
 
 
-class UserManageView(generics.RetrieveUpdateAPIView):
+class UserManageView(ConditionalGetMixin, generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
     permission_classes = (IsAuthenticated,)
 
     def get_object(self) -> User:
-        return self.request.user
+        return complete_principal(self.request.user)
+
+
+class UserSummaryView(generics.RetrieveAPIView):
+    """
+    Loan counters of the current user, read straight from the user row.
+
+    The overdue count is recounted at most once a day per user, when the
+    daily celery task has not refreshed it yet.
+    """
+
+    serializer_class = UserLoanSummarySerializer
+    permission_classes = (IsAuthenticated,)
+
+    def get_object(self) -> User:
+        fields = UserLoanSummarySerializer.Meta.fields + (
+            "overdue_checked_on",
+        )
+        user = complete_principal(self.request.user, fields)
+        today = timezone.now().date()
+        if user.overdue_checked_on != today:
+            refresh_overdue_loans(User.objects.filter(pk=user.pk), today)
+            user.refresh_from_db(fields=fields)
+        return user